@@ -0,0 +1,126 @@
+"""Benchmark of host-side accumulation against on-chip accumulation.
+
+With on-chip accumulation the camera sums the scans during readout and the
+host only transfers the final frame. With host accumulation every scan is
+transferred (GetImages) and summed with NumPy into an int64 accumulator.
+The host path keeps up with the camera as long as its time per scan stays
+below the accumulation cycle time. A stand-in library replaces
+``libandor.so`` so no camera is required.
+
+    python benchmarks/bench_accumulation.py --scans 2000 --width 1024 --height 256
+"""
+
+import argparse
+import ctypes
+import logging
+import time
+from unittest import mock
+
+import numpy as np
+
+from lumed_andor.accumulation import HostAccumulator
+from lumed_andor.andor_control import SUCCESS_CODE, AndorCamera
+
+
+class FakeLibAndor:
+    """Stand-in for libandor exposing GetAcquiredData and GetImages.
+
+    Every scan of the series holds the same driver-side frame.
+    """
+
+    def __init__(self, frame_size: int):
+        rng = np.random.default_rng(0)
+        self.frame = rng.integers(0, 60000, frame_size, dtype=np.int32)
+
+    def GetAcquiredData(self, array, size):
+        n_values = getattr(size, "value", size)
+        ctypes.memmove(array, self.frame.ctypes.data, 4 * n_values)
+        return SUCCESS_CODE
+
+    def GetImages(self, first, last, array, size, valid_first, valid_last):
+        n_frames = last.value - first.value + 1
+        address = ctypes.cast(array, ctypes.c_void_p).value
+        for i in range(n_frames):
+            ctypes.memmove(
+                address + i * self.frame.nbytes,
+                self.frame.ctypes.data,
+                self.frame.nbytes,
+            )
+        valid_first._obj.value = first.value
+        valid_last._obj.value = last.value
+        return SUCCESS_CODE
+
+
+def on_chip(camera: AndorCamera, n_scans: int, width: int, height: int):
+    data = np.empty((1, height, width), dtype=np.int32)
+    camera.GetAcquiredData(size=data.size, out=data)
+    return data
+
+
+def host(camera: AndorCamera, n_scans, width, height, batch, track_variance):
+    accumulator = HostAccumulator((height, width), track_variance=track_variance)
+    scratch = np.empty((batch, height, width), dtype=np.int32)
+    for first in range(0, n_scans, batch):
+        n_batch = min(batch, n_scans - first)
+        camera.GetImages(first + 1, first + n_batch, scratch[:n_batch])
+        accumulator.add(scratch[:n_batch])
+    return accumulator
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scans", type=int, default=2000)
+    parser.add_argument("--width", type=int, default=1024)
+    parser.add_argument("--height", type=int, default=256)
+    parser.add_argument("--batch", type=int, default=16)
+    parser.add_argument("--no-variance", action="store_true")
+    args = parser.parse_args()
+
+    # The stand-in only implements the data retrieval functions
+    logging.getLogger().setLevel(logging.ERROR)
+
+    lib = FakeLibAndor(args.width * args.height)
+    with mock.patch("ctypes.cdll.LoadLibrary", return_value=lib):
+        camera = AndorCamera()
+
+    frame_mb = lib.frame.nbytes / 1e6
+    print(
+        f"{args.scans} scans of {args.height}x{args.width} ({frame_mb:.2f} MB each), "
+        f"batches of {args.batch}"
+    )
+
+    _, chip_time = timed(on_chip, camera, args.scans, args.width, args.height)
+    accumulator, host_time = timed(
+        host,
+        camera,
+        args.scans,
+        args.width,
+        args.height,
+        args.batch,
+        not args.no_variance,
+    )
+    assert np.array_equal(
+        accumulator.sum, args.scans * lib.frame.reshape(-1, args.width)
+    )
+
+    per_scan = host_time / args.scans
+    print(f"on-chip : {chip_time * 1e3:10.3f} ms host time (1 frame transfer)")
+    print(
+        f"host    : {host_time * 1e3:10.3f} ms host time, "
+        f"{per_scan * 1e6:8.1f} us/scan, {args.scans / host_time:10.0f} scans/s, "
+        f"{frame_mb * args.scans / host_time:8.0f} MB/s"
+    )
+    print(
+        f"host accumulation keeps up with accumulation cycles above "
+        f"{per_scan * 1e3:.3f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Benchmark of the kinetic series data retrieval (GetAcquiredData + reshape).
+
+Compares the former retrieval path (ctypes array, ``np.array`` copy, reshape)
+with the zero-copy path where the SDK writes into a preallocated NumPy array.
+A stand-in library replaces ``libandor.so`` so no camera is required.
+
+    python benchmarks/bench_acquired_data.py --frames 1000 --width 1024 --height 256
+"""
+
+import argparse
+import ctypes
+import logging
+import time
+import tracemalloc
+from unittest import mock
+
+import numpy as np
+
+from lumed_andor.andor_control import SUCCESS_CODE, AndorCamera
+
+
+class FakeLibAndor:
+    """Stand-in for libandor exposing only GetAcquiredData.
+
+    Like the SDK, the acquired series lives in a driver-side buffer which is
+    copied into the array handed by the caller.
+    """
+
+    def __init__(self, size: int):
+        self.frames = np.arange(size, dtype=np.int32)
+
+    def GetAcquiredData(self, array, size):
+        n_values = getattr(size, "value", size)
+        ctypes.memmove(array, self.frames.ctypes.data, 4 * n_values)
+        return SUCCESS_CODE
+
+
+def legacy_get_data(lib: FakeLibAndor, n_kinetic: int, width: int, height: int):
+    size = n_kinetic * width * height
+    in_array = (ctypes.c_int * size)()
+    lib.GetAcquiredData(in_array, ctypes.c_int(size))
+    data = np.array(in_array)
+    return data.reshape((n_kinetic, height, width))
+
+
+def zero_copy_get_data(camera: AndorCamera, n_kinetic: int, width: int, height: int):
+    data = np.empty((n_kinetic, height, width), dtype=np.int32)
+    camera.GetAcquiredData(size=data.size, out=data)
+    return data
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    data = fn(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return data, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=1000)
+    parser.add_argument("--width", type=int, default=1024)
+    parser.add_argument("--height", type=int, default=256)
+    args = parser.parse_args()
+
+    # The stand-in only implements GetAcquiredData
+    logging.getLogger().setLevel(logging.ERROR)
+
+    n_values = args.frames * args.width * args.height
+    lib = FakeLibAndor(n_values)
+    with mock.patch("ctypes.cdll.LoadLibrary", return_value=lib):
+        camera = AndorCamera()
+
+    shape = (args.frames, args.width, args.height)
+    print(f"Kinetic series {shape}, {4 * n_values / 1e6:.1f} MB of int32 data")
+
+    legacy, legacy_time, legacy_peak = measure(legacy_get_data, lib, *shape)
+    del legacy
+    data, new_time, new_peak = measure(zero_copy_get_data, camera, *shape)
+    assert np.array_equal(data.ravel(), lib.frames)
+
+    print(f"legacy    : {legacy_time:8.3f} s, peak {legacy_peak / 1e6:9.1f} MB")
+    print(f"zero-copy : {new_time:8.3f} s, peak {new_peak / 1e6:9.1f} MB")
+    print(f"speedup   : {legacy_time / new_time:8.1f} x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Benchmark of the frame transport between a camera process and its client.
+
+A child process produces frames of the requested size and hands them to the
+parent either pickled through a multiprocessing Pipe (as AndorCameraManager
+does) or written into a SharedFrameRing slot with only the slot number sent
+through the Pipe (as CameraServer does). The time per frame, measured in the
+parent from the request to a usable NumPy array, is reported per MB.
+
+    python benchmarks/bench_frame_transport.py --frames 200 --width 1024 --height 1024
+"""
+
+import argparse
+import multiprocessing
+import time
+
+import numpy as np
+
+from lumed_andor.camera_server import SharedFrameRing
+
+
+def pipe_producer(connection, shape):
+    frame = np.random.default_rng(0).integers(0, 60000, shape, dtype=np.int32)
+    while connection.recv() is not None:
+        connection.send(frame)
+
+
+def shm_producer(connection, shape, ring_name, n_slots, slot_bytes):
+    frame = np.random.default_rng(0).integers(0, 60000, shape, dtype=np.int32)
+    ring = SharedFrameRing(n_slots, slot_bytes, ring_name)
+    while (slot := connection.recv()) is not None:
+        # Stands for the SDK writing into the slot (GetAcquiredData)
+        np.copyto(ring.view(slot, shape), frame)
+        connection.send(slot)
+    ring.close()
+
+
+def run(context, target, args, request, n_frames):
+    connection, child_connection = context.Pipe()
+    process = context.Process(target=target, args=(child_connection, *args))
+    process.start()
+
+    times = np.empty(n_frames)
+    for i in range(n_frames):
+        start = time.perf_counter()
+        connection.send(request())
+        frame = request.receive(connection.recv())
+        frame.sum()  # touch the data
+        times[i] = time.perf_counter() - start
+
+    connection.send(None)
+    process.join()
+    return times
+
+
+class PipeRequest:
+    def __call__(self):
+        return 0
+
+    @staticmethod
+    def receive(frame):
+        return frame
+
+
+class SlotRequest:
+    def __init__(self, ring: SharedFrameRing, shape):
+        self.ring = ring
+        self.shape = shape
+        self.frame = None
+
+    def __call__(self):
+        if self.frame is not None:
+            self.ring.release(self.frame)
+        return self.ring.reserve()
+
+    def receive(self, slot):
+        self.frame = self.ring.view(slot, self.shape)
+        return self.frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--width", type=int, default=1024)
+    parser.add_argument("--height", type=int, default=1024)
+    parser.add_argument("--slots", type=int, default=4)
+    args = parser.parse_args()
+
+    shape = (args.height, args.width)
+    frame_mb = args.width * args.height * 4 / 1e6
+    # Reference: a plain copy of the frame within the process
+    frame = np.zeros(shape, dtype=np.int32)
+    start = time.perf_counter()
+    for _ in range(args.frames):
+        frame.copy()
+    memcpy_time = (time.perf_counter() - start) / args.frames
+
+    context = multiprocessing.get_context("spawn")
+    ring = SharedFrameRing(args.slots, frame.nbytes)
+    try:
+        pipe_times = run(context, pipe_producer, (shape,), PipeRequest(), args.frames)
+        shm_times = run(
+            context,
+            shm_producer,
+            (shape, ring.name, args.slots, frame.nbytes),
+            SlotRequest(ring, shape),
+            args.frames,
+        )
+    finally:
+        ring.close()
+
+    print(f"{args.frames} frames of {args.height}x{args.width} ({frame_mb:.2f} MB)")
+    print(f"in-process copy : {memcpy_time / frame_mb * 1e6:10.1f} us/MB")
+    for name, times in (("pickled pipe", pipe_times), ("shared memory", shm_times)):
+        # The first frames include process and page warm-up
+        median = np.median(times[len(times) // 10 :])
+        print(
+            f"{name:16}: {median / frame_mb * 1e6:10.1f} us/MB, "
+            f"{median * 1e3:8.3f} ms/frame, {frame_mb / median:8.0f} MB/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
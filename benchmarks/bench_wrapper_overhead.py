@@ -0,0 +1,92 @@
+"""Micro-benchmark of the AndorCamera wrapper overhead per SDK call.
+
+The stand-in library answers instantly, so the timings are the cost of the
+Python wrappers themselves (function lookup, ctypes argument handling, error
+bookkeeping and locking). The former wrapper style, with a fresh attribute
+lookup on the library for every call, is reproduced for comparison.
+
+    python benchmarks/bench_wrapper_overhead.py --calls 200000
+"""
+
+import argparse
+import ctypes
+import logging
+import timeit
+from unittest import mock
+
+from lumed_andor.andor_control import (
+    SDK_PROTOTYPES,
+    SUCCESS_CODE,
+    AndorCamera,
+    AndorError,
+)
+
+IDLE_CODE = 20073
+
+
+class StandInLibAndor:
+    """Stand-in for libandor answering every SDK call with DRV_SUCCESS."""
+
+    def __init__(self):
+        for name in SDK_PROTOTYPES:
+            setattr(self, name, self._success)
+
+        self.GetStatus = self._get_status
+        self.GetTemperature = self._get_temperature
+        self.GetAcquisitionProgress = self._get_acquisition_progress
+
+    @staticmethod
+    def _success(*args):
+        return SUCCESS_CODE
+
+    @staticmethod
+    def _get_status(status):
+        status._obj.value = IDLE_CODE
+        return SUCCESS_CODE
+
+    @staticmethod
+    def _get_temperature(temperature):
+        temperature._obj.value = -60
+        return SUCCESS_CODE
+
+    @staticmethod
+    def _get_acquisition_progress(acc, series):
+        acc._obj.value = 0
+        series._obj.value = 1
+        return SUCCESS_CODE
+
+
+def legacy_get_status(camera: AndorCamera) -> AndorError:
+    # Wrapper as written before the SDK function table was introduced
+    status = ctypes.c_int()
+    err_code = camera._safelibcall(camera.__libandor__.GetStatus, ctypes.byref(status))
+    camera.last_error = AndorError(err_code)
+    logging.debug("%i, %s", camera.last_error.code, camera.last_error.message)
+    return AndorError(status.value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200_000)
+    args = parser.parse_args()
+
+    lib = StandInLibAndor()
+    with mock.patch("ctypes.cdll.LoadLibrary", return_value=lib):
+        camera = AndorCamera()
+
+    status = ctypes.c_int()
+    cases = {
+        "stand-in GetStatus (raw)": lambda: lib.GetStatus(ctypes.byref(status)),
+        "legacy GetStatus": lambda: legacy_get_status(camera),
+        "GetStatus": camera.GetStatus,
+        "GetAcquisitionProgress": camera.GetAcquisitionProgress,
+        "GetTemperature": camera.GetTemperature,
+    }
+
+    for name, fn in cases.items():
+        seconds = min(timeit.repeat(fn, number=args.calls, repeat=3))
+        print(f"{name:26s}: {1e6 * seconds / args.calls:6.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
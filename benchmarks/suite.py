@@ -0,0 +1,378 @@
+"""Benchmark suite of the acquisition, plotting and settings I/O hot paths.
+
+Every case runs against the simulated camera library (or the instant
+stand-in library for the SDK wrappers), no camera nor driver is required.
+Results are written as JSON and can be compared against a baseline, the
+comparison exits with status 1 when a case got slower than the threshold::
+
+    python benchmarks/suite.py run --output baseline.json
+    python benchmarks/suite.py run --output current.json --filter plot
+    python benchmarks/suite.py compare baseline.json current.json --threshold 0.2
+
+Timings are the median time per call over ``--repeat`` rounds, each round
+looping the case for at least ``--min-time`` seconds.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from datetime import datetime
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import matplotlib  # noqa: E402
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+
+from lumed_andor.acquisition import AndorAcquisition  # noqa: E402
+from lumed_andor.andor_control import (  # noqa: E402
+    AndorCamera,
+    AndorSettings,
+    MultiTrack,
+    RandomTrack,
+    SingleTrack,
+)
+from lumed_andor.fileio import export_setting, import_setting  # noqa: E402
+from lumed_andor.plotting import AndorPlot  # noqa: E402
+from lumed_andor.simulation import (  # noqa: E402
+    SimulatedCameraConfig,
+    SimulatedLibAndor,
+)
+
+# isort: split
+# Local benchmark modules, importable as the script directory is on sys.path
+from bench_wrapper_overhead import StandInLibAndor  # noqa: E402
+
+CASES = {}
+
+
+def case(name: str):
+    """Registers a case: a function returning the callable to time.
+
+    The callable may return a cleanup function, run outside the timing.
+    """
+
+    def register(setup):
+        CASES[name] = setup
+        return setup
+
+    return register
+
+
+def stand_in_camera() -> AndorCamera:
+    camera = AndorCamera(lib=StandInLibAndor())
+    camera.is_connected = True
+    return camera
+
+
+def simulated_camera(**config) -> AndorCamera:
+    # Fast enough for the camera timings to be negligible
+    config.setdefault("speed", 1e9)
+    config.setdefault("initialize_time", 0.0)
+    camera = AndorCamera(lib=SimulatedLibAndor(SimulatedCameraConfig(**config)))
+    camera.connect()
+    return camera
+
+
+## SDK wrappers
+
+
+@case("wrapper.GetStatus")
+def wrapper_get_status():
+    return stand_in_camera().GetStatus
+
+
+@case("wrapper.GetTemperature")
+def wrapper_get_temperature():
+    return stand_in_camera().GetTemperature
+
+
+@case("wrapper.GetAcquisitionTimings")
+def wrapper_get_acquisition_timings():
+    return stand_in_camera().GetAcquisitionTimings
+
+
+@case("camera.get_info")
+def camera_get_info():
+    return stand_in_camera().get_info
+
+
+## Acquisition data retrieval
+
+
+def acquisition_case(n_kinetic: int, height: int, width: int):
+    camera = simulated_camera(xpixels=width, ypixels=max(height, 2))
+    settings = camera.get_settings()
+    settings.acquisition_mode = 3
+    settings.number_kinetic = n_kinetic
+    settings.read_mode = 0 if height == 1 else 4
+    settings.target_exposure_time = 1
+    camera.apply_settings(settings)
+
+    def acquire():
+        acquisition = AndorAcquisition(camera)
+        acquisition.run()
+        return acquisition.result.release
+
+    return acquire
+
+
+for _shape in ((1, 1, 1024), (100, 1, 1024), (1, 256, 1024), (20, 256, 1024)):
+    case("acquisition.run[{}x{}x{}]".format(*_shape))(
+        lambda shape=_shape: acquisition_case(*shape)
+    )
+
+
+@case("acquisition.run[overwritten 12 of buffer 4]")
+def acquisition_overwritten():
+    # The whole series is acquired before the first read: frames 1-8 are
+    # overwritten in the circular buffer, 9-12 must land in their own slots
+    camera = simulated_camera(circular_buffer_size=4)
+    settings = camera.get_settings()
+    settings.acquisition_mode = 3
+    settings.number_kinetic = 12
+    settings.read_mode = 0
+    settings.target_exposure_time = 1
+    camera.apply_settings(settings)
+
+    def acquire():
+        acquisition = AndorAcquisition(camera)
+        indices = [index for index, _ in acquisition.frames()]
+        data = acquisition.result.data
+        assert indices == list(range(8, 12))
+        assert acquisition.result.integrity.gaps == [(1, 8)]
+        assert not data[:8].any() and data[8:].all(axis=(1, 2)).all()
+        return acquisition.result.release
+
+    return acquire
+
+
+## Widget
+
+
+@case("widget.update_ui")
+def widget_update_ui():
+    from PyQt5.QtWidgets import QApplication
+
+    from lumed_andor.andor_widget import AndorCameraWidget
+
+    global _qt_app  # kept alive as long as the widget
+    _qt_app = QApplication.instance() or QApplication([])
+    widget = AndorCameraWidget(camera=simulated_camera())
+    widget.update_timer.stop()
+    widget.device_actor.stop()
+    return widget.update_ui
+
+
+## Plotting
+
+
+def plot_data_case(shape):
+    data = np.random.default_rng(0).integers(0, 60000, shape, dtype=np.int32)
+
+    def plot():
+        andor_plot = AndorPlot(data)
+        andor_plot.plot_data()
+        for figure in andor_plot.figures:
+            figure.canvas.draw()
+        return lambda: plt.close("all")
+
+    return plot
+
+
+case("plot.plot_data[spectra 10x1x1024]")(lambda: plot_data_case((10, 1, 1024)))
+case("plot.plot_data[image 1x256x1024]")(lambda: plot_data_case((1, 256, 1024)))
+
+
+def bounds_case(method: str, *args):
+    data = np.random.default_rng(0).integers(0, 60000, (1, 256, 1024), dtype=np.int32)
+    andor_plot = AndorPlot(data)
+    andor_plot.plot_data()
+    return lambda: getattr(andor_plot, method)(*args)
+
+
+case("plot.bounds[single track]")(
+    lambda: bounds_case("plot_singletrack_bounds", SingleTrack(center=128, height=20))
+)
+case("plot.bounds[multi track]")(
+    lambda: bounds_case(
+        "plot_multitrack_bounds", MultiTrack(number=4, height=20, bottom=20, gap=40)
+    )
+)
+case("plot.bounds[random track]")(
+    lambda: bounds_case(
+        "plot_randomtrack_bounds", RandomTrack(tracks=[10, 30, 70, 90, 150, 200])
+    )
+)
+
+
+## Settings I/O
+
+
+@case("fileio.export_import")
+def fileio_round_trip():
+    directory = tempfile.TemporaryDirectory()
+    path = Path(directory.name) / "settings.toml"
+    settings = AndorSettings()
+    settings.random_track.tracks = [1, 10, 20, 30]
+
+    def round_trip():
+        export_setting(settings, path)
+        assert import_setting(path) == settings
+
+    round_trip.directory = directory  # removed with the case
+    return round_trip
+
+
+## Runner
+
+
+def time_case(fn, min_time: float, repeat: int) -> dict:
+    # Warm-up, also sizes the number of loops per round
+    start = time.perf_counter()
+    cleanup = fn()
+    elapsed = time.perf_counter() - start
+    if callable(cleanup):
+        cleanup()
+    loops = max(1, int(min_time / max(elapsed, 1e-9)))
+
+    timings = []
+    for _ in range(repeat):
+        total = 0.0
+        for _ in range(loops):
+            start = time.perf_counter()
+            cleanup = fn()
+            total += time.perf_counter() - start
+            if callable(cleanup):
+                cleanup()
+        timings.append(total / loops)
+
+    return {
+        "median": float(np.median(timings)),
+        "min": float(np.min(timings)),
+        "max": float(np.max(timings)),
+        "loops": loops,
+        "repeat": repeat,
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.3f} {unit}"
+    return f"{seconds / 1e-9:8.1f} ns"
+
+
+def run(args) -> int:
+    results = {}
+    for name, setup in CASES.items():
+        if args.filter and not re.search(args.filter, name):
+            continue
+
+        fn = setup()
+        results[name] = time_case(fn, args.min_time, args.repeat)
+        print(f"{name:40s} {format_time(results[name]['median'])}")
+
+    report = {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as fp:
+        json.dump(report, fp, indent=2)
+    print(f"Results written to {args.output}")
+    return 0
+
+
+def compare(args) -> int:
+    with open(args.baseline) as fp:
+        baseline = json.load(fp)["results"]
+    with open(args.current) as fp:
+        current = json.load(fp)["results"]
+
+    regressions = []
+    print(f"{'case':40s} {'baseline':>11s} {'current':>11s} {'ratio':>7s}")
+    for name in sorted(baseline.keys() & current.keys()):
+        before = baseline[name]["median"]
+        after = current[name]["median"]
+        ratio = after / before
+        flag = ""
+        if ratio > 1 + args.threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 / (1 + args.threshold):
+            flag = "  improved"
+        print(
+            f"{name:40s} {format_time(before)} {format_time(after)} "
+            f"{ratio:6.2f}x{flag}"
+        )
+
+    for name in sorted(baseline.keys() ^ current.keys()):
+        print(f"{name:40s} only in {'baseline' if name in baseline else 'current'}")
+
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--output", default="benchmark_results.json")
+    run_parser.add_argument("--filter", help="regular expression on case names")
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--min-time", type=float, default=0.2)
+    run_parser.set_defaults(func=run)
+
+    compare_parser = subparsers.add_parser("compare", help="compare two runs")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument(
+        "--threshold", type=float, default=0.1, help="tolerated slowdown ratio"
+    )
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args()
+
+    # The stand-in and simulated libraries answer some calls with errors
+    logging.getLogger().setLevel(logging.CRITICAL)
+    warnings.filterwarnings("ignore", "FigureCanvasAgg is non-interactive")
+
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,12 @@
+import argparse
 import logging
 import sys
 
 from PyQt5.QtWidgets import QApplication, QMainWindow
 
+from lumed_andor.andor_control import AndorCamera
 from lumed_andor.andor_widget import AndorCameraWidget
+from lumed_andor.simulation import SimulatedCameraConfig, SimulatedLibAndor
 
 logger = logging.getLogger()
 
@@ -17,16 +20,33 @@ LOG_FORMAT = (
 
 if __name__ == "__main__":
 
+    parser = argparse.ArgumentParser(prog="lumed_andor")
+    parser.add_argument(
+        "--simulate", action="store_true", help="use a simulated camera"
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="simulated seconds per real second (with --simulate)",
+    )
+    args, qt_args = parser.parse_known_args()
+
     formatter = logging.Formatter(LOG_FORMAT)
     terminal_handler = logging.StreamHandler()
     terminal_handler.setFormatter(formatter)
     logger.addHandler(terminal_handler)
     logger.setLevel(logging.INFO)
 
-    app = QApplication(sys.argv)
+    camera = None
+    if args.simulate:
+        config = SimulatedCameraConfig(speed=args.speed)
+        camera = AndorCamera(lib=SimulatedLibAndor(config))
+
+    app = QApplication(sys.argv[:1] + qt_args)
     window = QMainWindow()
     window.show()
 
-    window.setCentralWidget(AndorCameraWidget())
+    window.setCentralWidget(AndorCameraWidget(camera=camera))
 
     app.exec_()
@@ -0,0 +1,70 @@
+import numpy as np
+
+
+class HostAccumulator:
+    """Sums single scans on the host as they arrive.
+
+    The sum is kept in a wide integer accumulator (int64 by default), so the
+    number of scans is not limited by the 32-bit on-chip accumulation. The
+    per-pixel sum of squares and per-scan totals and maxima are kept along,
+    which gives the pixel noise and allows spotting outlier scans (cosmic
+    rays, saturation, source drift) that on-chip accumulation hides. The sum
+    of squares costs about as much as the sum itself, it can be turned off
+    with ``track_variance=False``.
+    """
+
+    def __init__(
+        self, frame_shape: tuple[int, ...], dtype=np.int64, track_variance=True
+    ):
+        self.sum: np.ndarray = np.zeros(frame_shape, dtype=dtype)
+        self.sum_squares: np.ndarray | None = (
+            np.zeros(frame_shape, dtype=np.float64) if track_variance else None
+        )
+        self.n_scans: int = 0
+
+        self._scan_totals: list[np.ndarray] = []
+        self._scan_maxima: list[np.ndarray] = []
+
+    def add(self, frames: np.ndarray) -> None:
+        """Adds a single frame or a (n, *frame_shape) batch of frames."""
+        frames = np.asarray(frames)
+        if frames.shape == self.sum.shape:
+            frames = frames[np.newaxis]
+
+        # In place, frame by frame: no wide temporary of the whole batch
+        for frame in frames:
+            np.add(self.sum, frame, out=self.sum)
+        if self.sum_squares is not None:
+            axes = "i...,i...->..."
+            self.sum_squares += np.einsum(axes, frames, frames, dtype=np.float64)
+        self.n_scans += len(frames)
+
+        flat = frames.reshape(len(frames), -1)
+        self._scan_totals.append(flat.sum(axis=1, dtype=np.int64))
+        self._scan_maxima.append(flat.max(axis=1))
+
+    @property
+    def mean(self) -> np.ndarray:
+        return self.sum / max(self.n_scans, 1)
+
+    @property
+    def variance(self) -> np.ndarray:
+        """Per-pixel variance over the scans."""
+        if self.sum_squares is None:
+            raise ValueError("variance is not tracked")
+        if self.n_scans < 2:
+            return np.zeros(self.sum.shape)
+
+        mean = self.mean
+        variance = (self.sum_squares - self.n_scans * mean**2) / (self.n_scans - 1)
+        return np.maximum(variance, 0)
+
+    @property
+    def scan_totals(self) -> np.ndarray:
+        """Total counts of every scan, in acquisition order."""
+        return np.concatenate(self._scan_totals or [np.zeros(0, np.int64)])
+
+    @property
+    def scan_maxima(self) -> np.ndarray:
+        """Highest pixel value of every scan, in acquisition order."""
+        return np.concatenate(self._scan_maxima or [np.zeros(0, np.int32)])
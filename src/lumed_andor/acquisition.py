@@ -1,31 +1,122 @@
 import logging
 import time
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 
 import numpy as np
 from PyQt5.QtCore import QObject, QRunnable, pyqtSignal, pyqtSlot
 
+from lumed_andor.accumulation import HostAccumulator
 from lumed_andor.andor_control import (
     ACQUIRING_CODE,
+    ANDOR_CODES,
+    NO_NEW_DATA_CODE,
+    SUCCESS_CODE,
     AndorCamera,
     AndorInfo,
     AndorSettings,
+    acquisition_shape,
+    settings_changes,
 )
+from lumed_andor.buffer_pool import FrameBufferPool
+from lumed_andor.streaming import FrameRingBuffer, OverflowPolicy
+from lumed_andor.validation import validate_settings
 
 logger = logging.getLogger()
 
 
+def is_acquisition_error(code: int) -> bool:
+    """DRV_ACQUISITION_ERRORS (DRV_ACQ_BUFFER, DRV_KINETIC_TIME_NOT_MET...)."""
+    return 20017 <= code <= 20032 and code != NO_NEW_DATA_CODE
+
+
+@dataclass
+class IntegrityReport:
+    """Completeness of the data of an acquisition.
+
+    Frame indices are 1-based, as in the SDK. ``gaps`` are the inclusive
+    ranges of expected frames missing from the data, either never acquired
+    (abort) or overwritten in the SDK circular buffer before being read, their
+    slots of the data are zeroed. With host accumulation, the scans are read
+    into a smaller reused buffer: the gaps then list the scans missing from
+    the sum, the buffer slots are not cleared.
+    ``buffer_high_water`` is the largest number of acquired but not yet read
+    frames seen, to compare with ``buffer_size``. ``failed_calls`` are the
+    setup and start SDK calls that failed, no data is acquired then.
+    """
+
+    expected_frames: int = 0
+    acquired_frames: int = 0
+    retrieved_frames: int = 0
+    gaps: list[tuple[int, int]] = field(default_factory=list)
+    error_codes: dict[int, int] = field(default_factory=dict)  # code: count
+    failed_calls: list[str] = field(default_factory=list)
+    buffer_high_water: int = 0
+    buffer_size: int = 0
+
+    @property
+    def missing_frames(self) -> int:
+        return sum(last - first + 1 for first, last in self.gaps)
+
+    @property
+    def is_complete(self) -> bool:
+        return not self.gaps and not self.error_codes and not self.failed_calls
+
+    def add_gap(self, first: int, last: int) -> None:
+        if last >= first:
+            self.gaps.append((first, last))
+
+    def record_error(self, code: int) -> None:
+        if is_acquisition_error(code):
+            self.error_codes[code] = self.error_codes.get(code, 0) + 1
+
+    def record_failure(self, call: str, code: int = SUCCESS_CODE) -> None:
+        """Records a setup or start call that failed, with its code if known."""
+        self.failed_calls.append(call)
+        if code != SUCCESS_CODE:
+            self.error_codes[code] = self.error_codes.get(code, 0) + 1
+
+    def summary(self) -> str:
+        errors = ", ".join(
+            f"{ANDOR_CODES.get(code, code)} x{count}"
+            for code, count in self.error_codes.items()
+        )
+        failed = ", ".join(self.failed_calls)
+        return (
+            f"{self.expected_frames - self.missing_frames} of "
+            f"{self.expected_frames} frames, gaps {self.gaps}, "
+            f"errors [{errors}], failed calls [{failed}], buffer high water "
+            f"{self.buffer_high_water}/{self.buffer_size}"
+        )
+
+
 @dataclass
 class AcquisitionResult:
-    data = np.ndarray
+    data: np.ndarray | None = field(default=None)
     camera_info: AndorInfo = field(default_factory=AndorInfo)
     camera_settings: AndorSettings = field(default_factory=AndorSettings)
+    buffer_pool: FrameBufferPool | None = field(default=None, repr=False)
+    accumulator: HostAccumulator | None = field(default=None, repr=False)
+    integrity: IntegrityReport = field(default_factory=IntegrityReport)
+
+    def release(self) -> None:
+        """Gives the data buffer back to the pool it was taken from.
+
+        The data must not be used after the result is released, the buffer is
+        overwritten by the next acquisition with the same geometry.
+        """
+        if self.buffer_pool is None:
+            return
+
+        self.buffer_pool.release(self.data)
+        self.buffer_pool = None
+        self.data = None
 
 
 class AcquisitionSignals(QObject):
     progress = pyqtSignal(float)
     started = pyqtSignal(bool)
     finished = pyqtSignal(bool)
+    frames = pyqtSignal(int, object)  # index of the first frame, frames batch
 
 
 class AndorAcquisition(QRunnable):
@@ -37,102 +128,448 @@ class AndorAcquisition(QRunnable):
         self.result.camera_settings = camera.get_settings()
         self.signals: AcquisitionSignals = AcquisitionSignals()
         self.in_progress: bool = False
+        # Provides result.data: anything with acquire(shape, dtype) and
+        # release(buffer), e.g. shared memory slots
+        self.buffer_pool: FrameBufferPool = camera.buffer_pool
         self.acquisition_progress: int = 0
         self.n_scans: int = 1
 
+        # Accumulate mode: sum single scans on the host instead of on-chip
+        self.host_accumulation: bool = False
+        self.host_batch_size: int = 16  # [frames] read buffer
+
+        # Run till abort
+        self.stream_capacity: int = 64  # [frames]
+        self.overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST
+        self.stream_buffer: FrameRingBuffer | None = None
+
+        # Optional barrier (threading or multiprocessing) waited on right
+        # before StartAcquisition, to start several cameras together
+        self.start_barrier = None
+        self.start_time_ns: int = 0
+
     def apply_settings(self, settings: AndorSettings):
+        violations = validate_settings(settings, self.camera.info)
+        if violations:
+            for violation in violations:
+                logger.error("Invalid camera setting - %s", violation)
+            return
+
         logger.info("Applying camera settings %s", settings)
-        self.camera.apply_settings(settings)
+        skipped = self.camera.apply_settings(settings)
+        logger.info("%i unchanged settings skipped", skipped)
+        self.check_settings(settings)
         # logger.info("")
         self.result.camera_settings = self.camera.get_settings()
 
+    def check_settings(self, settings: AndorSettings) -> bool:
+        """Whether settings were applied, the failed setters are recorded.
+
+        The camera only caches the inputs of successful setter calls, the
+        setters whose cached inputs still differ from settings failed.
+        """
+        failed = settings_changes(self.camera.get_settings(), settings)
+        for name in failed:
+            self.result.integrity.record_failure(name)
+        if failed:
+            logger.error("Camera settings not applied - %s", ", ".join(failed))
+        return not failed
+
     @pyqtSlot()
     def run(self):
+        if self.result.camera_settings.acquisition_mode == 5:  # Run till abort
+            self.stream()
+        else:
+            for _ in self.frames():
+                pass
+        self.signals.finished.emit(True)
+
+    def frames(self):
+        """Runs the acquisition and yields (index, frame) as frames complete.
+
+        Frames are read from the SDK circular buffer as soon as they are
+        acquired, straight into their slot of ``result.data``. Each batch is
+        also emitted through ``signals.frames``. The yielded frames are views
+        of ``result.data``. Stopping the generator early aborts the
+        acquisition. The frames missing from the data (see
+        ``result.integrity``) are zeroed.
+
+        With ``host_accumulation`` in Accumulate mode, the scans are read
+        into a small reused buffer and summed into ``result.accumulator``,
+        ``result.data`` then holds the sum. The scans yielded and emitted
+        are then copies, the buffer being overwritten by the next scans.
+        """
+        settings = self.result.camera_settings
+        if settings.acquisition_mode == 2 and self.host_accumulation:
+            yield from self.host_accumulate(settings)
+            return
+        if settings.acquisition_mode == 4:
+            yield from self.fast_kinetics(settings)
+            return
+
         logger.info("Starting acquisition")
-        if self.result.camera_settings.acquisition_mode == 3:  # Kinetic Series
+        if settings.acquisition_mode == 3:  # Kinetic Series
             self.n_scans = self.camera.number_kinetics
         else:
             self.n_scans = 1
 
         self.acquisition_progress = 0
-        self.camera.StartAcquisition()
-        self.in_progress = True
-        self.wait_for_acquisition()
-        self.in_progress = False
         self.get_camera_info()
         n_kinetic, width, height = self.get_data_size()
-        self.get_data(n_kinetic, width, height)
-        self.signals.finished.emit(True)
+        data = self.allocate_data(n_kinetic, width, height)
+
+        yield from self.acquire_frames(n_kinetic, data)
+
+        self.get_camera_info()
+
+    def host_accumulate(self, settings: AndorSettings):
+        """Accumulate mode run as a kinetic series of single scans."""
+        logger.info(
+            "Starting host accumulation of %i scans", settings.number_accumulation
+        )
+        n_scans = settings.number_accumulation
+        self.n_scans = n_scans
+        self.acquisition_progress = 0
+        self.get_camera_info()
+        _, width, height = self.get_data_size()
+
+        accumulator = HostAccumulator((height, width))
+        self.result.accumulator = accumulator
+        buffer_pool = self.camera.buffer_pool
+        scratch = buffer_pool.acquire(
+            (min(n_scans, self.host_batch_size), height, width), dtype=np.int32
+        )
+
+        scan_settings = replace(
+            settings,
+            acquisition_mode=3,
+            number_kinetic=n_scans,
+            target_kinetic_time=settings.target_accumulation_time,
+            number_accumulation=1,
+        )
+        try:
+            self.camera.apply_settings(scan_settings)
+            if not self.check_settings(scan_settings):
+                self.result.integrity.expected_frames = n_scans
+                self.result.integrity.add_gap(1, n_scans)
+                return
+            for index, frame in self.acquire_frames(n_scans, scratch, copy=True):
+                accumulator.add(frame)
+                yield index, frame
+        finally:
+            self.camera.apply_settings(settings)
+            buffer_pool.release(scratch)
+            # The sum so far, zeros if no scan was read
+            self.result.data = accumulator.sum[np.newaxis]
+            self.result.buffer_pool = None
+
+        self.get_camera_info()
+
+    def fast_kinetics(self, settings: AndorSettings):
+        """Fast Kinetics: the sub-frames are read at once after the series.
 
-    def wait_for_acquisition(self):
+        The SDK writes the whole series into a (n_frames, sub_height, width)
+        array, each sub-frame is a view of it.
+        """
+        config = settings.fast_kinetics
+        logger.info(
+            "Starting fast kinetics of %i frames of %i rows",
+            config.series_length,
+            config.exposed_rows,
+        )
+        self.n_scans = 1
+        self.acquisition_progress = 0
+        self.get_camera_info()
+        n_frames, width, sub_height = self.get_data_size()
+        data = self.allocate_data(n_frames, width, sub_height)
+
+        # The SDK rounds the exposure to the sub-area shift timings
+        exposure_time = self.camera.GetFKExposureTime()
+        if not np.isclose(exposure_time, config.exposure_time, rtol=0.01):
+            logger.warning(
+                "Fast kinetics exposure set to %.4f ms instead of %.4f ms",
+                exposure_time,
+                config.exposure_time,
+            )
+
+        integrity = self.result.integrity
+        integrity.expected_frames = n_frames
+
+        if not self.start_acquisition():
+            integrity.add_gap(1, n_frames)
+            self.clear_missing_frames(data)
+            return
+        try:
+            while self.check_status():
+                self.camera.WaitForAcquisition()
+                integrity.record_error(self.camera.last_error.code)
+        finally:
+            self.in_progress = False
+
+        if self.camera.GetTotalNumberImagesAcquired() < 1:
+            integrity.add_gap(1, n_frames)
+            self.clear_missing_frames(data)
+            logger.warning("ACQUISITION ABORTED - fast kinetics")
+            return
+
+        self.camera.GetAcquiredData(size=data.size, out=data)
+        integrity.record_error(self.camera.last_error.code)
+        integrity.acquired_frames = integrity.retrieved_frames = n_frames
+        self.acquisition_progress = 1
+        self.signals.frames.emit(0, data)
+        self.signals.progress.emit(1.0)
+        self.get_camera_info()
+
+        for index, frame in enumerate(data):
+            yield index, frame
+
+    def acquire_frames(self, n_frames: int, data: np.ndarray, copy: bool = False):
+        if not self.start_acquisition():
+            integrity = self.result.integrity
+            integrity.expected_frames = n_frames
+            integrity.add_gap(1, n_frames)
+            self.clear_missing_frames(data)
+            logger.warning("Incomplete acquisition - %s", integrity.summary())
+            return
+        try:
+            yield from self.retrieve_frames(n_frames, data, copy)
+        finally:
+            if self.in_progress and self.camera.GetStatus().code == ACQUIRING_CODE:
+                self.camera.AbortAcquisition()
+            self.in_progress = False
+
+    def retrieve_frames(self, n_frames: int, data: np.ndarray, copy: bool = False):
+        """Reads n_frames into data as they are acquired.
+
+        Frame i lands in ``data[i % len(data)]``, data smaller than the
+        series is reused as a ring (frames are yielded before being
+        overwritten). With ``copy``, copies of the batches are emitted and
+        yielded instead of views of data. Frames overwritten in the SDK
+        circular buffer before being read are recorded as gaps, their slots
+        zeroed, and are neither emitted nor yielded.
+        """
         logger.info("Waiting for acquisition")
 
-        n_scans = self.n_scans
+        capacity = len(data)
+        on_chip_accumulation = self.camera.acquisition_mode == 2
+        integrity = self.result.integrity
+        integrity.expected_frames = n_frames
+        integrity.buffer_size = self.camera.GetSizeOfCircularBuffer()
+        n_retrieved = 0
 
-        for _ in range(n_scans):
-            _, n_completed = self.camera.GetAcquisitionProgress()
-            self.signals.progress.emit(n_completed / n_scans)
+        try:
+            while n_retrieved < n_frames:
+                # Status first: once idle, the number of acquired images is final
+                acquiring = self.check_status()
+                n_total = self.camera.GetTotalNumberImagesAcquired()
+                integrity.acquired_frames = n_total
+                integrity.buffer_high_water = max(
+                    integrity.buffer_high_water, n_total - n_retrieved
+                )
+                n_acquired = min(n_total, n_frames)
 
-            last_error = self.camera.last_error
-            if not last_error.is_success:
-                msg = "ACQUISITION ABORTED"
-            else:
-                msg = last_error.message
+                if n_acquired <= n_retrieved:
+                    if not acquiring:
+                        logger.warning(
+                            "ACQUISITION ABORTED - %i of %i frames",
+                            n_retrieved,
+                            n_frames,
+                        )
+                        return
+                    if on_chip_accumulation:
+                        n_accumulated, _ = self.camera.GetAcquisitionProgress()
+                        self.signals.progress.emit(
+                            n_accumulated / max(self.camera.number_accumulation, 1)
+                        )
+                    self.camera.WaitForAcquisition()
+                    integrity.record_error(self.camera.last_error.code)
+                    continue
+
+                start = n_retrieved % capacity
+                n_batch = min(n_acquired - n_retrieved, capacity - start)
+                batch = data[start : start + n_batch]
+                first = n_retrieved
+                valid_first, _ = self.camera.GetImages(
+                    first + 1, first + n_batch, batch
+                )
+                error = self.camera.last_error
+                integrity.record_error(error.code)
+                if not error.is_success:  # e.g. all overwritten, nothing read
+                    valid_first = first + n_batch + 1
+
+                # The SDK writes the valid frames at the start of the batch,
+                # they are moved to their own slots and the others zeroed
+                n_missing = valid_first - first - 1
+                if n_missing > 0:
+                    logger.warning(
+                        "Frames %i to %i overwritten in the circular buffer",
+                        first + 1,
+                        valid_first - 1,
+                    )
+                    integrity.add_gap(first + 1, valid_first - 1)
+                    batch[n_missing:] = batch[: n_batch - n_missing].copy()
+                    batch[:n_missing] = 0
+                    first += n_missing
+                    batch = batch[n_missing:]
+                if copy:
+                    batch = batch.copy()
 
-            if self.camera.GetStatus().code != ACQUIRING_CODE:
-                continue
+                n_retrieved += n_batch
+                integrity.retrieved_frames += len(batch)
+                self.acquisition_progress = n_retrieved
+                if len(batch):
+                    self.signals.frames.emit(first, batch)
+                self.signals.progress.emit(n_retrieved / n_frames)
+                logger.info(
+                    "Completed scan %i of %i - %s",
+                    n_retrieved,
+                    n_frames,
+                    self.camera.last_error.message,
+                )
+
+                for index, frame in enumerate(batch, start=first):
+                    yield index, frame
+        finally:
+            integrity.add_gap(n_retrieved + 1, n_frames)
+            self.clear_missing_frames(data)
+            if integrity.is_complete:
+                logger.info("Acquisition integrity - %s", integrity.summary())
             else:
-                self.camera.WaitForAcquisition()
+                logger.warning("Incomplete acquisition - %s", integrity.summary())
 
-            logger.info(
-                "Completed accumulation %i of %i - %s", n_completed + 1, n_scans, msg
-            )
+    def clear_missing_frames(self, data: np.ndarray) -> None:
+        """Zeroes the slots of the missing frames, left stale in pooled data.
+
+        Data smaller than the series is a reused ring whose slots do not map
+        to frame indices, it is left untouched: the gaps then describe the
+        frames yielded, not the content of data (see retrieve_frames).
+        """
+        if len(data) < self.result.integrity.expected_frames:
+            return
+        for first, last in self.result.integrity.gaps:
+            data[first - 1 : last] = 0
+
+    def start_acquisition(self) -> bool:
+        """Starts the acquisition, False (failure recorded) if it did not."""
+        if self.start_barrier is not None:
+            self.start_barrier.wait()
+
+        self.start_time_ns = time.time_ns()
+        try:
+            self.camera.StartAcquisition()
+        finally:
+            # Also recorded when raised in raise_on_error mode
+            error = self.camera.last_error
+            if not error.is_success:
+                self.result.integrity.record_failure("StartAcquisition", error.code)
+
+        if not error.is_success:
+            logger.error("Acquisition not started - %s", error.message)
+            return False
+        self.in_progress = True
+        return True
+
+    def check_status(self) -> bool:
+        """Whether the camera is acquiring, acquisition errors are recorded."""
+        status = self.camera.GetStatus().code
+        self.result.integrity.record_error(status)
+        return status == ACQUIRING_CODE
+
+    def stream(self):
+        """Run till abort: drains the SDK circular buffer into ``stream_buffer``.
+
+        ``stream_buffer`` is created before the acquisition starts and
+        ``signals.started`` is emitted once it can be read, with False when
+        the acquisition failed to start. Streaming stops on abort,
+        ``result.data`` then holds the last frame, zeros if none was acquired.
+        """
+        logger.info("Starting continuous acquisition")
+
+        self.get_camera_info()
+        _, width, height = self.get_data_size()
+        stream_buffer = FrameRingBuffer(
+            self.stream_capacity, (height, width), self.overflow_policy
+        )
+        self.stream_buffer = stream_buffer
+        stats = stream_buffer.stats
+        integrity = self.result.integrity
+        integrity.buffer_size = self.camera.GetSizeOfCircularBuffer()
+
+        started = self.start_acquisition()
+        self.signals.started.emit(started)
+        try:
+            next_index = 1
+            while started:
+                # Status first: once idle, no new image can appear
+                acquiring = self.check_status()
+                first, last = self.camera.GetNumberNewImages()
+
+                if last < first:
+                    if not acquiring:
+                        break
+                    self.camera.WaitForAcquisition()
+                    integrity.record_error(self.camera.last_error.code)
+                    continue
+
+                integrity.expected_frames = integrity.acquired_frames = last
+                integrity.buffer_high_water = max(
+                    integrity.buffer_high_water, last - next_index + 1
+                )
+                if first > next_index:
+                    stats.overrun += first - next_index
+                    integrity.add_gap(next_index, first - 1)
+
+                for index in range(first, last + 1):
+                    slot = stream_buffer.reserve()
+                    if slot is None:  # closed by abort_acquisition
+                        break
+                    self.camera.GetImages(index, index, slot)
+                    integrity.record_error(self.camera.last_error.code)
+                    stream_buffer.commit(index)
+                    integrity.retrieved_frames += 1
+                    next_index = index + 1
+
+                if stream_buffer.closed:
+                    break
+        finally:
+            if self.camera.GetStatus().code == ACQUIRING_CODE:
+                self.camera.AbortAcquisition()
+            stream_buffer.close()
+            self.in_progress = False
+
+        logger.info("Continuous acquisition stopped - %s", stats)
+        logger.info("Acquisition integrity - %s", integrity.summary())
+
+        self.get_camera_info()
+        data = self.allocate_data(1, width, height)
+        if stream_buffer.latest(out=data[0]) is None:
+            data[0] = 0  # no frame acquired, the pooled buffer is stale
 
     def get_camera_info(self):
         self.camera.get_info()
         self.result.camera_info = self.camera.info
 
     def abort_acquisition(self):
+        if self.stream_buffer is not None:
+            self.stream_buffer.close()
+
         while self.in_progress:
             self.camera.AbortAcquisition()
             self.camera.CancelWait()
 
     def get_data_size(self):
-        camera_settings = self.result.camera_settings
-        camera_info = self.result.camera_info
-        read_mode = camera_settings.read_mode
-        acquisition_mode = camera_settings.acquisition_mode
-
-        if acquisition_mode == 3:  # kinetic series
-            n_kinetic = camera_settings.number_kinetic
-        else:
-            n_kinetic = 1
-
-        if read_mode == 0:  # FVB
-            width = camera_info.xpixels
-            height = 1
-        elif read_mode == 1:  # Multi-Track
-            width = camera_info.xpixels
-            height = camera_settings.multi_track.number
-        elif read_mode == 2:  # Random-Track
-            width = camera_info.xpixels
-            height = len(camera_settings.random_track.tracks) // 2
-        elif read_mode == 3:  # Single-Track
-            width = camera_info.xpixels
-            height = 1
-        elif read_mode == 4:  # image mode
-            image_config = camera_settings.image_config
-            width = (image_config.hend - image_config.hstart + 1) // image_config.hbin
-            height = (image_config.vend - image_config.vstart + 1) // image_config.vbin
-
+        n_kinetic, height, width = acquisition_shape(
+            self.result.camera_settings, self.result.camera_info.xpixels
+        )
         return n_kinetic, width, height
 
-    def get_data(self, n_kinetic, width, height):
+    def allocate_data(self, n_kinetic, width, height) -> np.ndarray:
 
-        data: np.ndarray = np.array(
-            self.camera.GetAcquiredData(size=n_kinetic * width * height)
-        )
+        # The SDK writes straight into the final (n_kinetic, height, width)
+        # array, no intermediate buffer nor reshape copy
+        buffer_pool = self.buffer_pool
+        data = buffer_pool.acquire((n_kinetic, height, width), dtype=np.int32)
 
-        # Reshaping data
-        data = data.reshape((n_kinetic, height, width))
         self.result.data = data
+        self.result.buffer_pool = buffer_pool
+        return data
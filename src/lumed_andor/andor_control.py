@@ -1,9 +1,17 @@
 import ctypes
+import functools
 import importlib.metadata
 import logging
+import time
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 from pathlib import Path
-from threading import Lock
+from threading import RLock
+
+import numpy as np
+
+from lumed_andor.buffer_pool import FrameBufferPool
+from lumed_andor.tracing import SDKCallTracer
 
 logger = logging.getLogger()
 
@@ -151,6 +159,94 @@ ANDOR_CODES = {
 
 SUCCESS_CODE = 20002
 ACQUIRING_CODE = 20072
+TEMPERATURE_STABILIZED_CODE = 20036
+NOT_SUPPORTED_CODE = 20991
+NO_NEW_DATA_CODE = 20024
+
+# Codes returned by GetTemperature to report the cooling status
+TEMPERATURE_STATUS_CODES = (20034, 20035, 20036, 20037, 20040)
+
+_INT = ctypes.c_int
+_FLOAT = ctypes.c_float
+_P_INT = ctypes.POINTER(ctypes.c_int)
+_P_LONG = ctypes.POINTER(ctypes.c_long)
+_P_FLOAT = ctypes.POINTER(ctypes.c_float)
+
+# argtypes of every SDK entry point wrapped by AndorCamera. All of them
+# return an unsigned int error code.
+SDK_PROTOTYPES = {
+    # Getters
+    "GetAvailableCameras": (_P_LONG,),
+    "GetCameraHandle": (ctypes.c_long, _P_LONG),
+    "GetCurrentCamera": (_P_LONG,),
+    "GetCameraSerialNumber": (_P_INT,),
+    "GetTemperature": (_P_INT,),
+    "GetNumberHSSpeeds": (_INT, _INT, _P_INT),
+    "GetNumberVSSpeeds": (_P_INT,),
+    "GetHSSpeed": (_INT, _INT, _INT, _P_FLOAT),
+    "GetVSSpeed": (_INT, _P_FLOAT),
+    "GetFastestRecommendedVSSpeed": (_P_INT, _P_FLOAT),
+    "GetNumberVSAmplitudes": (_P_INT,),
+    "GetAcquisitionTimings": (_P_FLOAT, _P_FLOAT, _P_FLOAT),
+    "GetFKExposureTime": (_P_FLOAT,),
+    "GetReadOutTime": (_P_FLOAT,),
+    "GetKeepCleanTime": (_P_FLOAT,),
+    "GetDetector": (_P_INT, _P_INT),
+    "GetTemperatureRange": (_P_INT, _P_INT),
+    "GetStatus": (_P_INT,),
+    "IsCoolerOn": (_P_INT,),
+    "GetAcquisitionProgress": (_P_INT, _P_INT),
+    "GetHeadModel": (ctypes.c_char_p,),
+    "GetAcquiredData": (_P_INT, ctypes.c_ulong),
+    "GetTotalNumberImagesAcquired": (_P_LONG,),
+    "GetNumberNewImages": (_P_LONG, _P_LONG),
+    "GetImages": (
+        ctypes.c_long,
+        ctypes.c_long,
+        _P_INT,
+        ctypes.c_ulong,
+        _P_LONG,
+        _P_LONG,
+    ),
+    "GetOldestImage": (_P_INT, ctypes.c_ulong),
+    "GetSizeOfCircularBuffer": (_P_LONG,),
+    "GetNumberPreAmpGains": (_P_INT,),
+    "GetCurrentPreAmpGain": (_P_INT, ctypes.c_char_p, _INT),
+    "GetPreAmpGain": (_INT, _P_FLOAT),
+    "IsPreAmpGainAvailable": (_INT, _INT, _INT, _INT, _P_INT),
+    "GetSoftwareVersion": (_P_INT,) * 6,
+    "GetHardwareVersion": (_P_INT,) * 6,
+    # Setters
+    "SetAcquisitionMode": (_INT,),
+    "SetReadMode": (_INT,),
+    "SetShutter": (_INT, _INT, _INT, _INT),
+    "SetExposureTime": (_FLOAT,),
+    "SetTriggerMode": (_INT,),
+    "SetAccumulationCycleTime": (_FLOAT,),
+    "SetNumberAccumulations": (_INT,),
+    "SetNumberKinetics": (_INT,),
+    "SetKineticCycleTime": (_FLOAT,),
+    "SetFastKineticsEx": (_INT, _INT, _FLOAT, _INT, _INT, _INT, _INT),
+    "SetHSSpeed": (_INT, _INT),
+    "SetVSSpeed": (_INT,),
+    "SetVSAmplitude": (_INT,),
+    "SetImage": (_INT,) * 6,
+    "SetTemperature": (_INT,),
+    "SetMultiTrack": (_INT, _INT, _INT, _P_INT, _P_INT),
+    "SetRandomTracks": (_INT, _P_INT),
+    "SetSingleTrack": (_INT, _INT),
+    "SetPreAmpGain": (_INT,),
+    "SetCurrentCamera": (ctypes.c_long,),
+    # Camera actions
+    "AbortAcquisition": (),
+    "CancelWait": (),
+    "CoolerON": (),
+    "CoolerOFF": (),
+    "Initialize": (ctypes.c_char_p,),
+    "StartAcquisition": (),
+    "WaitForAcquisition": (),
+    "ShutDown": (),
+}
 
 
 @dataclass
@@ -174,17 +270,64 @@ class HardwareVersion:
     firmware_build: int = 0
 
 
-@dataclass
+@dataclass(frozen=True)
 class AndorError:
     code: int = SUCCESS_CODE
 
+    @staticmethod
+    @functools.cache
+    def from_code(code: int) -> "AndorError":
+        """Returns the shared (interned) instance for an Andor code."""
+        return AndorError(code)
+
     @property
     def is_success(self) -> bool:
         return self.code == SUCCESS_CODE
 
     @property
     def message(self) -> str:
-        return ANDOR_CODES[self.code]
+        return ANDOR_CODES.get(self.code, "DRV_UNKNOWN_CODE")
+
+    def __str__(self) -> str:
+        return f"{self.code}, {self.message}"
+
+
+class AndorSDKError(Exception):
+    """Raised by AndorCamera in raise_on_error mode for unsuccessful SDK calls."""
+
+    def __init__(self, error: AndorError):
+        super().__init__(str(error))
+        self.error: AndorError = error
+
+    @property
+    def code(self) -> int:
+        return self.error.code
+
+
+class AndorHardwareError(AndorSDKError):
+    """Communication and hardware errors (DRV_ERROR_CODES, 20001-20016)."""
+
+
+class AndorAcquisitionError(AndorSDKError):
+    """Acquisition errors (DRV_ACQUISITION_ERRORS, 20017-20032)."""
+
+
+class AndorTemperatureError(AndorSDKError):
+    """Temperature errors (DRV_TEMPERATURE_CODES, 20033-20048)."""
+
+
+class AndorGeneralError(AndorSDKError):
+    """Every other driver error (DRV_GENERAL_ERRORS and above)."""
+
+
+def sdk_exception_type(code: int) -> type[AndorSDKError]:
+    if code < 20017:
+        return AndorHardwareError
+    if code < 20033:
+        return AndorAcquisitionError
+    if code < 20049:
+        return AndorTemperatureError
+    return AndorGeneralError
 
 
 @dataclass(kw_only=True)
@@ -226,6 +369,86 @@ class RandomTrack:
     tracks: list = field(default_factory=list)
 
 
+@dataclass(kw_only=True)
+class FastKineticsConfig:
+    """Fast Kinetics: an exposed sub-area is shifted under the masked rows.
+
+    ``series_length`` sub-frames of ``exposed_rows`` rows, starting
+    ``offset`` rows from the bottom of the sensor, are stored before the
+    readout. ``read_mode`` is 0 (FVB, one row per sub-frame) or 4 (Image).
+    """
+
+    exposed_rows: int = 1
+    series_length: int = 1
+    exposure_time: float = 1.0  # [ms]
+    read_mode: int = 4
+    hbin: int = 1
+    vbin: int = 1
+    offset: int = 0
+
+
+def fast_kinetics_shape(
+    config: FastKineticsConfig, xpixels: int
+) -> tuple[int, int, int]:
+    """(n_frames, sub_height, width) of a Fast Kinetics acquisition."""
+    width = xpixels // config.hbin
+    if config.read_mode == 0:  # FVB
+        sub_height = 1
+    else:
+        sub_height = config.exposed_rows // config.vbin
+
+    return config.series_length, sub_height, width
+
+
+@dataclass(kw_only=True)
+class ReadoutSpeeds:
+    """Readout speeds and pre-amp gains of a head, in setting index order."""
+
+    hs_speeds: list = field(default_factory=list)  # [MHz]
+    vs_speeds: list = field(default_factory=list)  # row shift time [us]
+    preamp_gains: list = field(default_factory=list)
+    # [hs_speed_index][preamp_gain_index], empty when unknown
+    preamp_gain_available: list = field(default_factory=list)
+    recommended_vs_speed_index: int = 0  # set by the driver at initialization
+    n_vs_amplitudes: int = 0  # VS clock voltages, index 0 is Normal
+
+    def is_gain_available(self, hs_speed_index: int, preamp_gain_index: int) -> bool:
+        """Whether the pre-amp gain can be used at the HS speed."""
+        if not self.preamp_gain_available:
+            return True
+        return bool(self.preamp_gain_available[hs_speed_index][preamp_gain_index])
+
+
+@dataclass(kw_only=True)
+class AndorCapabilities:
+    """Fixed properties of the connected head, read once per connection."""
+
+    model: str = ""
+    serial_number: int = 0
+    max_temperature: int = 0
+    min_temperature: int = 0
+    xpixels: int = 0
+    ypixels: int = 0
+    readout_speeds: ReadoutSpeeds = field(default_factory=ReadoutSpeeds)
+
+    software_version: SoftwareVersion = field(default_factory=SoftwareVersion)
+    hardware_version: HardwareVersion = field(default_factory=HardwareVersion)
+
+
+@dataclass(kw_only=True)
+class AndorLiveStatus:
+    """Camera state that changes while connected, polled periodically."""
+
+    status: AndorError = field(default_factory=AndorError)
+    temperature: int = 0
+    is_cooler_on: int = False
+    cooling_status: str = ""
+
+    exposure_time: float = float("nan")  # [ms]
+    accumulate_cycle: float = float("nan")  # [ms]
+    kinetic_cycle: float = float("nan")  # [ms]
+
+
 @dataclass(kw_only=True)
 class AndorInfo:
     # Basic confing
@@ -246,6 +469,7 @@ class AndorInfo:
     min_temperature: int = 0
     xpixels: int = 0
     ypixels: int = 0
+    readout_speeds: ReadoutSpeeds = field(default_factory=ReadoutSpeeds)
 
     software_version: SoftwareVersion = field(default_factory=SoftwareVersion)
     hardware_version: HardwareVersion = field(default_factory=HardwareVersion)
@@ -268,22 +492,145 @@ class AndorSettings:
     random_track: RandomTrack = field(default_factory=RandomTrack)
     single_track: SingleTrack = field(default_factory=SingleTrack)
     image_config: ImageConfig = field(default_factory=ImageConfig)
+    fast_kinetics: FastKineticsConfig = field(default_factory=FastKineticsConfig)
 
     # Advanced settings
     shutter_profile: ShutterSettings = field(default_factory=ShutterSettings)
     trigger_mode: int = 0
+    hs_speed_index: int = 0
+    vs_speed_index: int = 0
+    vs_amplitude: int = 0  # VS clock voltage index, 0 is Normal
+    preamp_gain_index: int = 0
+
+
+# Setters called by AndorCamera.apply_settings with their positional inputs
+# taken from AndorSettings, None when the setter does not apply to the
+# settings. Modes come first since the SDK checks geometries and timings
+# against them, timings come after the geometry and readout speeds they
+# depend on.
+SETTINGS_SETTERS = (
+    ("SetAcquisitionMode", lambda s: (s.acquisition_mode,)),
+    ("SetReadMode", lambda s: (s.read_mode,)),
+    ("SetTriggerMode", lambda s: (s.trigger_mode,)),
+    ("SetTemperature", lambda s: (s.target_temperature,)),
+    (
+        "SetImage",
+        lambda s: (
+            s.image_config.hbin,
+            s.image_config.vbin,
+            s.image_config.hstart,
+            s.image_config.hend,
+            s.image_config.vstart,
+            s.image_config.vend,
+        ),
+    ),
+    ("SetSingleTrack", lambda s: (s.single_track.center, s.single_track.height)),
+    (
+        "SetMultiTrack",
+        lambda s: (s.multi_track.number, s.multi_track.height, s.multi_track.offset),
+    ),
+    (
+        "SetRandomTracks",
+        lambda s: (len(s.random_track.tracks) // 2, list(s.random_track.tracks)),
+    ),
+    ("SetHSSpeed", lambda s: (0, s.hs_speed_index)),
+    ("SetVSSpeed", lambda s: (s.vs_speed_index,)),
+    ("SetVSAmplitude", lambda s: (s.vs_amplitude,)),
+    ("SetPreAmpGain", lambda s: (s.preamp_gain_index,)),
+    ("SetExposureTime", lambda s: (s.target_exposure_time,)),
+    ("SetNumberAccumulations", lambda s: (s.number_accumulation,)),
+    ("SetAccumulationCycleTime", lambda s: (s.target_accumulation_time,)),
+    ("SetNumberKinetics", lambda s: (s.number_kinetic,)),
+    ("SetKineticCycleTime", lambda s: (s.target_kinetic_time,)),
+    (
+        # Only in Fast Kinetics, heads without it reject the call
+        "SetFastKineticsEx",
+        lambda s: (
+            (
+                s.fast_kinetics.exposed_rows,
+                s.fast_kinetics.series_length,
+                s.fast_kinetics.exposure_time,
+                s.fast_kinetics.read_mode,
+                s.fast_kinetics.hbin,
+                s.fast_kinetics.vbin,
+                s.fast_kinetics.offset,
+            )
+            if s.acquisition_mode == 4
+            else None
+        ),
+    ),
+    (
+        "SetShutter",
+        lambda s: (
+            s.shutter_profile.ttl_type,
+            s.shutter_profile.mode,
+            s.shutter_profile.closing_time,
+            s.shutter_profile.opening_time,
+        ),
+    ),
+)
+
+
+def settings_changes(current: AndorSettings, target: AndorSettings) -> list[str]:
+    """Names of the setters apply_settings calls to go from current to target."""
+    return [
+        name
+        for name, inputs in SETTINGS_SETTERS
+        if inputs(target) is not None and inputs(target) != inputs(current)
+    ]
+
+
+def acquisition_shape(settings: AndorSettings, xpixels: int) -> tuple[int, int, int]:
+    """(n_frames, height, width) of the data acquired with settings."""
+    if settings.acquisition_mode == 4:  # fast kinetics
+        return fast_kinetics_shape(settings.fast_kinetics, xpixels)
+
+    if settings.acquisition_mode == 3:  # kinetic series
+        n_kinetic = settings.number_kinetic
+    else:
+        n_kinetic = 1
+
+    read_mode = settings.read_mode
+    width = xpixels
+    if read_mode in (0, 3):  # FVB, Single-Track
+        height = 1
+    elif read_mode == 1:  # Multi-Track
+        height = settings.multi_track.number
+    elif read_mode == 2:  # Random-Track
+        height = len(settings.random_track.tracks) // 2
+    else:  # image mode
+        image_config = settings.image_config
+        width = (image_config.hend - image_config.hstart + 1) // image_config.hbin
+        height = (image_config.vend - image_config.vstart + 1) // image_config.vbin
+
+    return n_kinetic, height, width
 
 
 class AndorCamera:
-    def __init__(self):
-        lib_dir = Path("/usr/local/lib/")
-        lib_path = lib_dir / "libandor.so"
-        self.__libandor__ = ctypes.cdll.LoadLibrary(lib_path)
+    """Wrapper of the Andor SDK for the camera selected in the driver.
+
+    The outcome of every SDK call is stored in ``last_error``. With
+    ``raise_on_error=True``, an AndorSDKError subclass is also raised for
+    unsuccessful calls.
+
+    ``lib`` replaces libandor.so, e.g. a SimulatedLibAndor to run without
+    camera nor driver.
+    """
+
+    def __init__(self, raise_on_error: bool = False, lib=None):
+        if lib is None:
+            lib_dir = Path("/usr/local/lib/")
+            lib_path = lib_dir / "libandor.so"
+            lib = ctypes.cdll.LoadLibrary(lib_path)
+        self.__libandor__ = lib
+        self._sdk: dict = self._bind_sdk_functions(self.__libandor__)
 
         # Internal parameter references
-        self._mutex: Lock = Lock()
+        # Reentrant so compound reads can hold it across several SDK calls
+        self._mutex: RLock = RLock()
         self.is_connected: bool = False
-        self.last_error: AndorError = AndorError()
+        self.last_error: AndorError = AndorError.from_code(SUCCESS_CODE)
+        self.raise_on_error: bool = raise_on_error
 
         self.acquisition_mode: int = 0
         self.read_mode: int = 0
@@ -299,12 +646,56 @@ class AndorCamera:
         self.single_track: SingleTrack = SingleTrack()
         self.multi_track: MultiTrack = MultiTrack()
         self.random_track: RandomTrack = RandomTrack()
+        self.fast_kinetics: FastKineticsConfig = FastKineticsConfig()
+        self.hs_speed_index: int = 0
+        self.vs_speed_index: int = 0
+        self.vs_amplitude: int = 0
+        self.preamp_gain_index: int = 0
+
+        # False until every setter has been applied once on this connection,
+        # the cached state above does not reflect the driver defaults
+        self._settings_synced: bool = False
 
         self.info: AndorInfo = AndorInfo()
+        self.capabilities: AndorCapabilities | None = None
+
+        # Frame buffers reused across acquisitions with the same geometry
+        self.buffer_pool: FrameBufferPool = FrameBufferPool()
+
+        # SDK call tracing, disabled by default (see enable_tracing)
+        self.tracer: SDKCallTracer | None = None
+
+    @staticmethod
+    def _bind_sdk_functions(lib) -> dict:
+        """Looks up every SDK function once and declares its prototype.
+
+        Prototypes are only declared on ctypes libraries, stand-in libraries
+        are used as is. Functions missing from the library are replaced by a
+        stub returning DRV_NOT_SUPPORTED.
+        """
+        is_ctypes_lib = isinstance(lib, ctypes.CDLL)
+        functions = {}
+        for name, argtypes in SDK_PROTOTYPES.items():
+            try:
+                fn = getattr(lib, name)
+            except AttributeError:
+                logger.warning("%s is not available in the Andor library", name)
+                fn = lambda *args: NOT_SUPPORTED_CODE  # noqa: E731
+
+            if is_ctypes_lib:
+                fn.argtypes = argtypes
+                fn.restype = ctypes.c_uint
+
+            functions[name] = fn
+
+        return functions
 
     ## Safe library call (for not threadsafe processes)
     def _safelibcall(self, fn, *args, **kwargs):
 
+        if self.tracer is not None:
+            return self._tracedlibcall(fn, *args, **kwargs)
+
         with self._mutex:
             try:
                 results = fn(*args, **kwargs)
@@ -313,6 +704,66 @@ class AndorCamera:
 
         return results
 
+    ## Blocking call, not locked so that CancelWait can interrupt it
+    def _unlockedlibcall(self, fn, *args):
+        if self.tracer is not None:
+            return self._tracedlibcall(fn, *args, mutex=nullcontext())
+
+        return fn(*args)
+
+    def _tracedlibcall(self, fn, *args, mutex=None, **kwargs):
+        code = -1
+        request_ns = time.monotonic_ns()
+        with self._mutex if mutex is None else mutex:
+            start_ns = time.monotonic_ns()
+            try:
+                code = results = fn(*args, **kwargs)
+            finally:
+                end_ns = time.monotonic_ns()
+
+        # Recorded outside the lock, a dump on error writes a file
+        lock_wait_ns = start_ns - request_ns
+        self.tracer.record(fn, args, code, start_ns, end_ns, lock_wait_ns)
+
+        return results
+
+    def enable_tracing(self, **kwargs) -> SDKCallTracer:
+        """Starts recording every SDK call in a ring buffer.
+
+        Keyword arguments are passed to SDKCallTracer. By default, the trace
+        is dumped whenever a call returns something else than DRV_SUCCESS,
+        DRV_NO_NEW_DATA or a GetTemperature cooling status.
+        """
+        kwargs.setdefault(
+            "ignored_codes",
+            (SUCCESS_CODE, NO_NEW_DATA_CODE, *TEMPERATURE_STATUS_CODES),
+        )
+        self.tracer = SDKCallTracer(**kwargs)
+        return self.tracer
+
+    def disable_tracing(self) -> None:
+        self.tracer = None
+
+    def _handle_error(self, err_code: int, expected_codes=()) -> AndorError:
+        """Records (or raises) the outcome of an SDK call.
+
+        ``expected_codes`` are non-success codes that are part of the normal
+        answer of the function and never raise.
+        """
+        error = AndorError.from_code(err_code)
+        logger.debug("%s", error, stacklevel=2)
+
+        # Set in both modes, the acquisition reads it to record errors
+        self.last_error = error
+        if (
+            self.raise_on_error
+            and not error.is_success
+            and err_code not in expected_codes
+        ):
+            raise sdk_exception_type(err_code)(error)
+
+        return error
+
     ## Wrapping methods from SDK
 
     ## Getters
@@ -324,22 +775,43 @@ class AndorCamera:
         """
         totalCameras = ctypes.c_long()
         err_code = self._safelibcall(
-            self.__libandor__.GetAvailableCameras, ctypes.byref(totalCameras)
+            self._sdk["GetAvailableCameras"], ctypes.byref(totalCameras)
         )
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
         return int(totalCameras.value)
 
+    def GetCameraHandle(self, camera_index: int) -> int:
+        """Handle of the camera_index-th installed camera (0-based)."""
+        handle = ctypes.c_long()
+        err_code = self._safelibcall(
+            self._sdk["GetCameraHandle"],
+            ctypes.c_long(camera_index),
+            ctypes.byref(handle),
+        )
+
+        self._handle_error(err_code)
+
+        return int(handle.value)
+
+    def GetCurrentCamera(self) -> int:
+        handle = ctypes.c_long()
+        err_code = self._safelibcall(
+            self._sdk["GetCurrentCamera"], ctypes.byref(handle)
+        )
+
+        self._handle_error(err_code)
+
+        return int(handle.value)
+
     def GetCameraSerialNumber(self) -> int:
         serial_number = ctypes.c_int()
         err_code = self._safelibcall(
-            self.__libandor__.GetCameraSerialNumber, ctypes.byref(serial_number)
+            self._sdk["GetCameraSerialNumber"], ctypes.byref(serial_number)
         )
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
         return int(serial_number.value)
 
@@ -364,72 +836,99 @@ class AndorCamera:
                 DRV_TEMP_DRIFT : Temperature had stabilized but has since drifted
                 DRV_TEMP_NOT_STABILIZED : Temperature reached but not stabilized
         """
+        temperature, _ = self.get_temperature_status()
+        return temperature
+
+    def get_temperature_status(self) -> tuple[int, AndorError]:
+        """GetTemperature returning the cooling status code along the temperature."""
         temp = ctypes.c_int()
-        err_code = self._safelibcall(
-            self.__libandor__.GetTemperature, ctypes.byref(temp)
-        )
+        err_code = self._safelibcall(self._sdk["GetTemperature"], ctypes.byref(temp))
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        cooling_status = self._handle_error(err_code, TEMPERATURE_STATUS_CODES)
 
-        return int(temp.value)
+        return int(temp.value), cooling_status
 
-    def GetNumberHSSpeeds(self) -> int:
-        channel = ctypes.c_int(0)
-        _type = ctypes.c_int()
+    def GetNumberHSSpeeds(self, channel: int = 0, typ: int = 0) -> int:
+        channel = ctypes.c_int(channel)
+        _type = ctypes.c_int(typ)
         speeds = ctypes.c_int()
         err_code = self._safelibcall(
-            self.__libandor__.GetNumberHSSpeeds,
+            self._sdk["GetNumberHSSpeeds"],
             channel,
-            ctypes.byref(_type),
+            _type,
             ctypes.byref(speeds),
         )
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
         return int(speeds.value)
 
     def GetNumberVSSpeeds(self) -> int:
         speeds = ctypes.c_int()
         err_code = self._safelibcall(
-            self.__libandor__.GetNumberVSSpeeds, ctypes.byref(speeds)
+            self._sdk["GetNumberVSSpeeds"], ctypes.byref(speeds)
         )
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
         return int(speeds.value)
 
-    def GetHSSpeed(self) -> float:
+    def GetHSSpeed(self, index: int = 0, channel: int = 0, typ: int = 0) -> float:
+        """Horizontal shift speed [MHz] of the given index."""
         speed = ctypes.c_float()
         err_code = self._safelibcall(
-            self.__libandor__.GetHSSpeed, 0, 0, 0, ctypes.byref(speed)
+            self._sdk["GetHSSpeed"], channel, typ, index, ctypes.byref(speed)
         )
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
         return float(speed.value)
 
-    def GetVSSpeed(self) -> float:
+    def GetVSSpeed(self, index: int = 0) -> float:
+        """Vertical shift speed (time per row shift [us]) of the given index."""
         speed = ctypes.c_float()
         err_code = self._safelibcall(
-            self.__libandor__.GetVSSpeed, 0, ctypes.byref(speed)
+            self._sdk["GetVSSpeed"], index, ctypes.byref(speed)
         )
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
         return float(speed.value)
 
+    def GetFastestRecommendedVSSpeed(self) -> tuple[int, float]:
+        """Index and speed [us] of the fastest VS speed not needing more voltage.
+
+        The driver selects it at initialization.
+        """
+        index = ctypes.c_int()
+        speed = ctypes.c_float()
+        err_code = self._safelibcall(
+            self._sdk["GetFastestRecommendedVSSpeed"],
+            ctypes.byref(index),
+            ctypes.byref(speed),
+        )
+
+        self._handle_error(err_code)
+
+        return int(index.value), float(speed.value)
+
+    def GetNumberVSAmplitudes(self) -> int:
+        number = ctypes.c_int()
+        err_code = self._safelibcall(
+            self._sdk["GetNumberVSAmplitudes"], ctypes.byref(number)
+        )
+
+        self._handle_error(err_code)
+
+        return int(number.value)
+
     def GetAcquisitionTimings(self) -> tuple[float, float, float]:
         exposure_time = ctypes.c_float()
         accumulate_cycle = ctypes.c_float()
         kinetic_cycle = ctypes.c_float()
 
         err_code = self._safelibcall(
-            self.__libandor__.GetAcquisitionTimings,
+            self._sdk["GetAcquisitionTimings"],
             ctypes.byref(exposure_time),
             ctypes.byref(accumulate_cycle),
             ctypes.byref(kinetic_cycle),
@@ -439,11 +938,43 @@ class AndorCamera:
         accumulate_cycle = 1000 * float(accumulate_cycle.value)
         kinetic_cycle = 1000 * float(kinetic_cycle.value)
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
         return exposure_time, accumulate_cycle, kinetic_cycle
 
+    def GetFKExposureTime(self) -> float:
+        """Exposure time [ms] actually used by Fast Kinetics."""
+        exposure_time = ctypes.c_float()
+        err_code = self._safelibcall(
+            self._sdk["GetFKExposureTime"], ctypes.byref(exposure_time)
+        )
+
+        self._handle_error(err_code)
+
+        return 1000 * float(exposure_time.value)
+
+    def GetReadOutTime(self) -> float:
+        """Time [ms] to read out the sensor with the current settings."""
+        readout_time = ctypes.c_float()
+        err_code = self._safelibcall(
+            self._sdk["GetReadOutTime"], ctypes.byref(readout_time)
+        )
+
+        self._handle_error(err_code)
+
+        return 1000 * float(readout_time.value)
+
+    def GetKeepCleanTime(self) -> float:
+        """Time [ms] of a keep clean cycle, run before each exposure."""
+        keep_clean_time = ctypes.c_float()
+        err_code = self._safelibcall(
+            self._sdk["GetKeepCleanTime"], ctypes.byref(keep_clean_time)
+        )
+
+        self._handle_error(err_code)
+
+        return 1000 * float(keep_clean_time.value)
+
     def GetDetector(self) -> tuple[int, int]:
         """Returns Detector Size of the camera in a tuple
 
@@ -452,11 +983,10 @@ class AndorCamera:
         xpixel = ctypes.c_int()
         ypixel = ctypes.c_int()
         err_code = self._safelibcall(
-            self.__libandor__.GetDetector, ctypes.byref(xpixel), ctypes.byref(ypixel)
+            self._sdk["GetDetector"], ctypes.byref(xpixel), ctypes.byref(ypixel)
         )
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
         return int(xpixel.value), int(ypixel.value)
 
@@ -464,36 +994,31 @@ class AndorCamera:
         minTemp = ctypes.c_int()
         maxTemp = ctypes.c_int()
         err_code = self._safelibcall(
-            self.__libandor__.GetTemperatureRange,
+            self._sdk["GetTemperatureRange"],
             ctypes.byref(minTemp),
             ctypes.byref(maxTemp),
         )
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
         return int(minTemp.value), int(maxTemp.value)
 
     def GetStatus(self) -> AndorError:
         status = ctypes.c_int()
-        err_code = self._safelibcall(self.__libandor__.GetStatus, ctypes.byref(status))
+        err_code = self._safelibcall(self._sdk["GetStatus"], ctypes.byref(status))
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        error = self._handle_error(err_code)
 
         if err_code == 20075:  # DRV_NOT_INITIALIZED
-            return AndorError(err_code)
+            return error
 
-        return AndorError(status.value)
+        return AndorError.from_code(status.value)
 
     def IsCoolerOn(self) -> bool:
         cooler_on = ctypes.c_int()
-        err_code = self._safelibcall(
-            self.__libandor__.IsCoolerOn, ctypes.byref(cooler_on)
-        )
+        err_code = self._safelibcall(self._sdk["IsCoolerOn"], ctypes.byref(cooler_on))
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
         return cooler_on.value == 1
 
@@ -501,43 +1026,142 @@ class AndorCamera:
         acc = ctypes.c_int()
         series = ctypes.c_int()
         err_code = self._safelibcall(
-            self.__libandor__.GetAcquisitionProgress,
+            self._sdk["GetAcquisitionProgress"],
             ctypes.byref(acc),
             ctypes.byref(series),
         )
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
         return int(acc.value), int(series.value)
 
     def GetHeadModel(self) -> str:
         name = ctypes.create_string_buffer(260)
-        err_code = self._safelibcall(self.__libandor__.GetHeadModel, name)
+        err_code = self._safelibcall(self._sdk["GetHeadModel"], name)
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
         return str(name.value.decode())
 
-    def GetAcquiredData(self, size):
-        InArray = (ctypes.c_int * size)()
-        size = ctypes.c_int(size)
-        err_code = self._safelibcall(self.__libandor__.GetAcquiredData, (InArray), size)
+    def GetAcquiredData(self, size: int, out: np.ndarray | None = None) -> np.ndarray:
+        """Copies the data of the last acquisition into a 32-bit integer array.
+
+        The SDK writes directly into the memory of ``out`` (no intermediate
+        ctypes array nor copy). ``out`` must be a C-contiguous ``int32`` array
+        holding at least ``size`` elements; its shape is left untouched so it
+        can already be allocated as ``(n_kinetic, height, width)``. A new flat
+        array is allocated when ``out`` is not given.
+        """
+        if out is None:
+            out = np.empty(size, dtype=np.int32)
+        else:
+            self._check_out(out, size)
+
+        c_array = out.ctypes.data_as(ctypes.POINTER(ctypes.c_int))
+        c_size = ctypes.c_ulong(size)
+        err_code = self._safelibcall(self._sdk["GetAcquiredData"], c_array, c_size)
+
+        self._handle_error(err_code)
+
+        return out
+
+    @staticmethod
+    def _check_out(out: np.ndarray, size: int) -> None:
+        if out.dtype != np.int32 or not out.flags.c_contiguous:
+            raise ValueError("out must be a C-contiguous int32 array")
+        if out.size < size:
+            raise ValueError(f"out holds {out.size} values, {size} are required")
+
+    def GetTotalNumberImagesAcquired(self) -> int:
+        """Number of images acquired since the start of the acquisition."""
+        index = ctypes.c_long()
+        err_code = self._safelibcall(
+            self._sdk["GetTotalNumberImagesAcquired"], ctypes.byref(index)
+        )
+
+        self._handle_error(err_code)
+
+        return int(index.value)
+
+    def GetNumberNewImages(self) -> tuple[int, int]:
+        """Range (1-based, inclusive) of the images not yet retrieved.
+
+        Returns (0, -1) when there is no new image (DRV_NO_NEW_DATA).
+        """
+        first = ctypes.c_long()
+        last = ctypes.c_long()
+        err_code = self._safelibcall(
+            self._sdk["GetNumberNewImages"], ctypes.byref(first), ctypes.byref(last)
+        )
+
+        error = self._handle_error(err_code, (NO_NEW_DATA_CODE,))
+        if not error.is_success:
+            return 0, -1
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        return int(first.value), int(last.value)
 
-        return InArray
+    def GetImages(self, first: int, last: int, out: np.ndarray) -> tuple[int, int]:
+        """Copies the images first to last (1-based, inclusive) into ``out``.
+
+        ``out`` follows the rules of GetAcquiredData, it is typically a
+        ``(last - first + 1, height, width)`` view of the series array. Returns
+        the range of images actually valid in the circular buffer.
+        """
+        size = out.size
+        self._check_out(out, size)
+
+        valid_first = ctypes.c_long()
+        valid_last = ctypes.c_long()
+        err_code = self._safelibcall(
+            self._sdk["GetImages"],
+            ctypes.c_long(first),
+            ctypes.c_long(last),
+            out.ctypes.data_as(ctypes.POINTER(ctypes.c_int)),
+            ctypes.c_ulong(size),
+            ctypes.byref(valid_first),
+            ctypes.byref(valid_last),
+        )
+
+        self._handle_error(err_code, (NO_NEW_DATA_CODE,))
+
+        return int(valid_first.value), int(valid_last.value)
+
+    def GetOldestImage(self, out: np.ndarray) -> bool:
+        """Copies the oldest image not yet retrieved into ``out``.
+
+        Returns False when there was no new image.
+        """
+        size = out.size
+        self._check_out(out, size)
+
+        err_code = self._safelibcall(
+            self._sdk["GetOldestImage"],
+            out.ctypes.data_as(ctypes.POINTER(ctypes.c_int)),
+            ctypes.c_ulong(size),
+        )
+
+        error = self._handle_error(err_code, (NO_NEW_DATA_CODE,))
+
+        return error.is_success
+
+    def GetSizeOfCircularBuffer(self) -> int:
+        """Maximum number of images the SDK circular buffer can hold."""
+        index = ctypes.c_long()
+        err_code = self._safelibcall(
+            self._sdk["GetSizeOfCircularBuffer"], ctypes.byref(index)
+        )
+
+        self._handle_error(err_code)
+
+        return int(index.value)
 
     def GetNumberPreAmpGains(self) -> int:
         nGain = ctypes.c_int()
         err_code = self._safelibcall(
-            self.__libandor__.GetNumberPreAmpGains, ctypes.byref(nGain)
+            self._sdk["GetNumberPreAmpGains"], ctypes.byref(nGain)
         )
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
         return int(nGain.value)
 
@@ -545,11 +1169,13 @@ class AndorCamera:
         gainIndex = ctypes.c_int()
         gainstr = ctypes.create_string_buffer(30)
         err_code = self._safelibcall(
-            self.__libandor__.GetCurrentPreAmpGain, gainIndex, ctypes.byref(gainstr)
+            self._sdk["GetCurrentPreAmpGain"],
+            ctypes.byref(gainIndex),
+            gainstr,
+            len(gainstr),
         )
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
         return int(gainIndex.value), str(gainstr.value.decode("utf-8"))
 
@@ -557,14 +1183,31 @@ class AndorCamera:
         gain_index = ctypes.c_int(gain_index)
         gain_factor = ctypes.c_float()
         err_code = self._safelibcall(
-            self.__libandor__.GetPreAmpGain, gain_index, ctypes.byref(gain_factor)
+            self._sdk["GetPreAmpGain"], gain_index, ctypes.byref(gain_factor)
         )
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
         return float(gain_factor.value)
 
+    def IsPreAmpGainAvailable(
+        self, channel: int, amplifier: int, hs_index: int, gain_index: int
+    ) -> bool:
+        """Whether the pre-amp gain is available with the HS speed (and channel)."""
+        status = ctypes.c_int()
+        err_code = self._safelibcall(
+            self._sdk["IsPreAmpGainAvailable"],
+            channel,
+            amplifier,
+            hs_index,
+            gain_index,
+            ctypes.byref(status),
+        )
+
+        self._handle_error(err_code)
+
+        return status.value == 1
+
     def GetSoftwareVersion(self) -> list[int, int, int, int, int, int]:
         eprom = ctypes.c_int()
         cofFile = ctypes.c_int()
@@ -574,7 +1217,7 @@ class AndorCamera:
         dllVer = ctypes.c_int()
 
         err_code = self._safelibcall(
-            self.__libandor__.GetSoftwareVersion,
+            self._sdk["GetSoftwareVersion"],
             ctypes.byref(eprom),
             ctypes.byref(cofFile),
             ctypes.byref(vxdRev),
@@ -583,8 +1226,7 @@ class AndorCamera:
             ctypes.byref(dllVer),
         )
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
         return (
             eprom.value,
@@ -605,7 +1247,7 @@ class AndorCamera:
         camFirmBuild = ctypes.c_int()
 
         err_code = self._safelibcall(
-            self.__libandor__.GetHardwareVersion,
+            self._sdk["GetHardwareVersion"],
             ctypes.byref(pcbVer),
             ctypes.byref(decodeVer),
             ctypes.byref(dummy1),
@@ -614,8 +1256,7 @@ class AndorCamera:
             ctypes.byref(camFirmBuild),
         )
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
         return (
             pcbVer.value,
@@ -629,22 +1270,20 @@ class AndorCamera:
     ## Setters
 
     def SetAcquisitionMode(self, mode: int) -> None:
-        err_code = self._safelibcall(self.__libandor__.SetAcquisitionMode, mode)
+        err_code = self._safelibcall(self._sdk["SetAcquisitionMode"], mode)
 
         if err_code == SUCCESS_CODE:
             self.acquisition_mode = mode
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
     def SetReadMode(self, mode: int) -> None:
-        err_code = self._safelibcall(self.__libandor__.SetReadMode, mode)
+        err_code = self._safelibcall(self._sdk["SetReadMode"], mode)
 
         if err_code == SUCCESS_CODE:
             self.read_mode = mode
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
     def SetShutter(
         self,
@@ -654,7 +1293,7 @@ class AndorCamera:
         opening_time: int,
     ) -> None:
         err_code = self._safelibcall(
-            self.__libandor__.SetShutter, TTLtype, mode, closing_time, opening_time
+            self._sdk["SetShutter"], TTLtype, mode, closing_time, opening_time
         )
 
         if err_code == SUCCESS_CODE:
@@ -665,82 +1304,123 @@ class AndorCamera:
                 opening_time=opening_time,
             )
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
     def SetExposureTime(self, time_ms: int) -> None:
         time_s = ctypes.c_float(time_ms / 1000)
-        err_code = self._safelibcall(self.__libandor__.SetExposureTime, time_s)
+        err_code = self._safelibcall(self._sdk["SetExposureTime"], time_s)
 
         if err_code == SUCCESS_CODE:
             self.target_exposure_time = time_ms
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
     def SetTriggerMode(self, mode: int) -> None:
-        err_code = self._safelibcall(self.__libandor__.SetTriggerMode, mode)
+        err_code = self._safelibcall(self._sdk["SetTriggerMode"], mode)
 
         if err_code == SUCCESS_CODE:
             self.trigger_mode = mode
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
     def SetAccumulationCycleTime(self, time_ms: int) -> None:
         time_s = ctypes.c_float(time_ms / 1000)
-        err_code = self._safelibcall(self.__libandor__.SetAccumulationCycleTime, time_s)
+        err_code = self._safelibcall(self._sdk["SetAccumulationCycleTime"], time_s)
 
         if err_code == SUCCESS_CODE:
             self.target_accumulation_time = time_ms
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
     def SetNumberAccumulations(self, n_accumulations: int) -> None:
         n = ctypes.c_int(n_accumulations)
-        err_code = self._safelibcall(self.__libandor__.SetNumberAccumulations, n)
+        err_code = self._safelibcall(self._sdk["SetNumberAccumulations"], n)
 
         if err_code == SUCCESS_CODE:
             self.number_accumulation = n_accumulations
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
     def SetNumberKinetics(self, n_kinetics: int) -> None:
         n = ctypes.c_int(n_kinetics)
-        err_code = self._safelibcall(self.__libandor__.SetNumberKinetics, n)
+        err_code = self._safelibcall(self._sdk["SetNumberKinetics"], n)
 
         if err_code == SUCCESS_CODE:
             self.number_kinetics = n_kinetics
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
     def SetKineticCycleTime(self, time_ms: int) -> None:
         time_s = ctypes.c_float(time_ms / 1000)
-        err_code = self._safelibcall(self.__libandor__.SetKineticCycleTime, time_s)
+        err_code = self._safelibcall(self._sdk["SetKineticCycleTime"], time_s)
 
         if err_code == SUCCESS_CODE:
             self.target_kinetic_time = time_ms
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
+
+    def SetFastKineticsEx(
+        self,
+        exposed_rows: int,
+        series_length: int,
+        time_ms: float,
+        mode: int,
+        hbin: int,
+        vbin: int,
+        offset: int,
+    ) -> None:
+        err_code = self._safelibcall(
+            self._sdk["SetFastKineticsEx"],
+            ctypes.c_int(exposed_rows),
+            ctypes.c_int(series_length),
+            ctypes.c_float(time_ms / 1000),
+            ctypes.c_int(mode),
+            ctypes.c_int(hbin),
+            ctypes.c_int(vbin),
+            ctypes.c_int(offset),
+        )
+
+        if err_code == SUCCESS_CODE:
+            self.fast_kinetics = FastKineticsConfig(
+                exposed_rows=exposed_rows,
+                series_length=series_length,
+                exposure_time=time_ms,
+                read_mode=mode,
+                hbin=hbin,
+                vbin=vbin,
+                offset=offset,
+            )
+
+        self._handle_error(err_code)
 
     def SetHSSpeed(self, typ: int, index: int) -> None:
         amp = ctypes.c_int(typ)
         index = ctypes.c_int(index)
-        err_code = self._safelibcall(self.__libandor__.SetHSSpeed, amp, index)
+        err_code = self._safelibcall(self._sdk["SetHSSpeed"], amp, index)
+
+        if err_code == SUCCESS_CODE:
+            self.hs_speed_index = index.value
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
     def SetVSSpeed(self, index: int) -> None:
         index = ctypes.c_int(index)
-        err_code = self._safelibcall(self.__libandor__.SetVSSpeed, index)
+        err_code = self._safelibcall(self._sdk["SetVSSpeed"], index)
+
+        if err_code == SUCCESS_CODE:
+            self.vs_speed_index = index.value
+
+        self._handle_error(err_code)
+
+    def SetVSAmplitude(self, index: int) -> None:
+        """VS clock voltage, raised for the VS speeds faster than recommended."""
+        index = ctypes.c_int(index)
+        err_code = self._safelibcall(self._sdk["SetVSAmplitude"], index)
+
+        if err_code == SUCCESS_CODE:
+            self.vs_amplitude = index.value
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
     def SetImage(
         self, hbin: int, vbin: int, hstart: int, hend: int, vstart: int, vend: int
@@ -752,7 +1432,7 @@ class AndorCamera:
         vstart = ctypes.c_int(vstart)
         vend = ctypes.c_int(vend)
         err_code = self._safelibcall(
-            self.__libandor__.SetImage, hbin, vbin, hstart, hend, vstart, vend
+            self._sdk["SetImage"], hbin, vbin, hstart, hend, vstart, vend
         )
 
         if err_code == SUCCESS_CODE:
@@ -765,18 +1445,16 @@ class AndorCamera:
                 vend=vend.value,
             )
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
     def SetTemperature(self, temperature: int) -> None:
         t = ctypes.c_int(temperature)
-        err_code = self._safelibcall(self.__libandor__.SetTemperature, t)
+        err_code = self._safelibcall(self._sdk["SetTemperature"], t)
 
         if err_code == SUCCESS_CODE:
             self.target_temperature = temperature
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
     def SetMultiTrack(self, number: int, height: int, offset: int) -> None:
         number = ctypes.c_int(number)
@@ -784,15 +1462,15 @@ class AndorCamera:
         offset = ctypes.c_int(offset)
         bottom = ctypes.c_int()
         gap = ctypes.c_int()
-        err_core = self._safelibcall(
-            self.__libandor__.SetMultiTrack,
+        err_code = self._safelibcall(
+            self._sdk["SetMultiTrack"],
             number,
             height,
             offset,
             ctypes.byref(bottom),
             ctypes.byref(gap),
         )
-        if err_core == SUCCESS_CODE:
+        if err_code == SUCCESS_CODE:
             self.multi_track = MultiTrack(
                 number=number.value,
                 height=height.value,
@@ -801,115 +1479,125 @@ class AndorCamera:
                 gap=gap.value,
             )
 
-        self.last_error = AndorError(err_core)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
     def SetRandomTracks(self, numTracks: int, areas: int) -> None:
         numTracks = ctypes.c_int(numTracks)
         c_areas = ctypes.c_int * len(areas)
         c_areas = c_areas(*areas)
 
-        err_code = self._safelibcall(
-            self.__libandor__.SetRandomTracks, numTracks, ctypes.byref(c_areas)
-        )
+        err_code = self._safelibcall(self._sdk["SetRandomTracks"], numTracks, c_areas)
         if err_code == SUCCESS_CODE:
             self.random_track = RandomTrack(tracks=areas)
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
     def SetSingleTrack(self, center: int, height: int) -> None:
         c = ctypes.c_int(center)
         h = ctypes.c_int(height)
-        err_code = self._safelibcall(self.__libandor__.SetSingleTrack, c, h)
+        err_code = self._safelibcall(self._sdk["SetSingleTrack"], c, h)
 
         if err_code == SUCCESS_CODE:
             self.single_track = SingleTrack(center=center, height=height)
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
     def SetPreAmpGain(self, gainIndex: int) -> None:
         gain = ctypes.c_int(gainIndex)
-        err_code = self._safelibcall(self.__libandor__.SetPreAmpGain, (gain))
+        err_code = self._safelibcall(self._sdk["SetPreAmpGain"], (gain))
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        if err_code == SUCCESS_CODE:
+            self.preamp_gain_index = gainIndex
+
+        self._handle_error(err_code)
 
     ## Camera actions
 
+    def SetCurrentCamera(self, handle: int) -> None:
+        """Selects the camera driven by every following SDK call."""
+        err_code = self._safelibcall(
+            self._sdk["SetCurrentCamera"], ctypes.c_long(handle)
+        )
+
+        self._handle_error(err_code)
+
     def AbortAcquisition(self) -> None:
         err_code = self._safelibcall(
-            self.__libandor__.AbortAcquisition,
+            self._sdk["AbortAcquisition"],
         )
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
     def CancelWait(self) -> None:
         err_code = self._safelibcall(
-            self.__libandor__.CancelWait,
+            self._sdk["CancelWait"],
         )
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
     def CoolerOn(self) -> None:
         err_code = self._safelibcall(
-            self.__libandor__.CoolerON,
+            self._sdk["CoolerON"],
         )
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
     def CoolerOFF(self) -> None:
         err_code = self._safelibcall(
-            self.__libandor__.CoolerOFF,
+            self._sdk["CoolerOFF"],
         )
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
     def Initialize(self) -> None:
         err_code = self._safelibcall(
-            self.__libandor__.Initialize, "/usr/local/etc/andor".encode("utf8")
+            self._sdk["Initialize"], "/usr/local/etc/andor".encode("utf8")
         )
 
-        self.last_error = AndorError(err_code)
-        self.is_connected = self.last_error.is_success
-
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        error = self._handle_error(err_code)
+        self.is_connected = error.is_success
+        self._settings_synced = False
 
     def StartAcquisition(self) -> None:
         err_code = self._safelibcall(
-            self.__libandor__.StartAcquisition,
+            self._sdk["StartAcquisition"],
         )
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        self._handle_error(err_code)
 
     def WaitForAcquisition(self) -> None:
-        err_code = self.__libandor__.WaitForAcquisition()
+        err_code = self._unlockedlibcall(
+            self._sdk["WaitForAcquisition"],
+        )
 
-        self.last_error = AndorError(err_code)
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        # DRV_NO_NEW_DATA when interrupted by CancelWait
+        self._handle_error(err_code, (NO_NEW_DATA_CODE,))
 
     def ShutDown(self) -> None:
         err_code = self._safelibcall(
-            self.__libandor__.ShutDown,
+            self._sdk["ShutDown"],
         )
 
-        self.last_error = AndorError(err_code)
-        self.is_connected = not self.last_error.is_success
-
-        logger.debug("%i, %s", self.last_error.code, self.last_error.message)
+        error = self._handle_error(err_code)
+        self.is_connected = not error.is_success
+        self._settings_synced = False
 
     ## compound methods
 
+    def select_camera(self, camera_index: int) -> None:
+        """Makes this process drive the camera_index-th camera, call before connect.
+
+        The SDK keeps one current camera per process: several heads are
+        driven concurrently from separate processes (see AndorCameraManager).
+        """
+        handle = self.GetCameraHandle(camera_index)
+        if self.last_error.is_success:
+            self.SetCurrentCamera(handle)
+
     def connect(self) -> None:
         self.Initialize()
 
-        if not self.last_error.is_success:
+        if not self.is_connected:
             return
 
         self.get_info()
@@ -923,6 +1611,9 @@ class AndorCamera:
         self.get_info()
         self.ShutDown()
 
+        if not self.is_connected:
+            self.capabilities = None
+
     def apply_default_settings(self) -> None:
         default_settings = AndorSettings()
 
@@ -945,51 +1636,50 @@ class AndorCamera:
         # Random track to entire sensor size
         default_settings.random_track.tracks = [1, self.info.ypixels]
 
-        self.apply_settings(default_settings)
+        # Readout as the driver sets it at initialization: fastest HS speed,
+        # fastest recommended VS speed and the first gain available
+        speeds = self.info.readout_speeds
+        default_settings.vs_speed_index = speeds.recommended_vs_speed_index
+        default_settings.preamp_gain_index = next(
+            (
+                index
+                for index in range(len(speeds.preamp_gains))
+                if speeds.is_gain_available(0, index)
+            ),
+            0,
+        )
 
-    def apply_settings(self, setting: AndorSettings) -> None:
+        self.apply_settings(default_settings, force=True)
 
-        # Basic settings
-        self.SetExposureTime(setting.target_exposure_time)
-        self.SetAcquisitionMode(setting.acquisition_mode)
-        self.SetReadMode(setting.read_mode)
-        self.SetTemperature(setting.target_temperature)
+    def apply_settings(self, setting: AndorSettings, force: bool = False) -> int:
+        """Applies the settings to the camera.
 
-        # Normal settings
-        self.SetNumberKinetics(setting.number_kinetic)
-        self.SetNumberAccumulations(setting.number_accumulation)
-        self.SetAccumulationCycleTime(setting.target_accumulation_time)
-        self.SetKineticCycleTime(setting.target_kinetic_time)
-        self.SetImage(
-            hbin=setting.image_config.hbin,
-            vbin=setting.image_config.vbin,
-            hstart=setting.image_config.hstart,
-            vstart=setting.image_config.vstart,
-            hend=setting.image_config.hend,
-            vend=setting.image_config.vend,
-        )
-        self.SetSingleTrack(
-            center=setting.single_track.center,
-            height=setting.single_track.height,
-        )
-        self.SetMultiTrack(
-            number=setting.multi_track.number,
-            height=setting.multi_track.height,
-            offset=setting.multi_track.offset,
-        )
-        self.SetRandomTracks(
-            numTracks=len(setting.random_track.tracks) // 2,
-            areas=setting.random_track.tracks,
-        )
+        Only the setters whose inputs differ from the cached camera state are
+        called, in the SETTINGS_SETTERS order. ``force`` calls every setter,
+        which is always the case for the first call after connecting.
+        Setters that do not apply to the settings are never called.
 
-        # Advanced settings
-        self.SetShutter(
-            TTLtype=setting.shutter_profile.ttl_type,
-            mode=setting.shutter_profile.mode,
-            closing_time=setting.shutter_profile.closing_time,
-            opening_time=setting.shutter_profile.opening_time,
+        Returns the number of setter calls skipped.
+        """
+        force = force or not self._settings_synced
+        current = self.get_settings()
+        skipped = 0
+
+        for name, inputs in SETTINGS_SETTERS:
+            target = inputs(setting)
+            if target is None or (not force and target == inputs(current)):
+                skipped += 1
+                continue
+
+            getattr(self, name)(*target)
+
+        self._settings_synced = True
+        logger.debug(
+            "Applied settings, %i of %i setter calls skipped",
+            skipped,
+            len(SETTINGS_SETTERS),
         )
-        self.SetTriggerMode(setting.trigger_mode)
+        return skipped
 
     def get_settings(self) -> AndorSettings:
         settings = AndorSettings()
@@ -1006,6 +1696,7 @@ class AndorCamera:
         settings.target_accumulation_time = self.target_accumulation_time
         settings.target_kinetic_time = self.target_kinetic_time
         settings.image_config = self.image_config
+        settings.fast_kinetics = self.fast_kinetics
         settings.single_track = self.single_track
         settings.multi_track = self.multi_track
         settings.random_track = self.random_track
@@ -1013,28 +1704,104 @@ class AndorCamera:
         # Advanced settings
         settings.shutter_profile = self.shutter_settings
         settings.trigger_mode = self.trigger_mode
+        settings.hs_speed_index = self.hs_speed_index
+        settings.vs_speed_index = self.vs_speed_index
+        settings.vs_amplitude = self.vs_amplitude
+        settings.preamp_gain_index = self.preamp_gain_index
 
         return settings
 
+    def get_readout_speeds(self) -> ReadoutSpeeds:
+        """Enumerates the HS and VS speeds and pre-amp gains of the head.
+
+        Speeds are those of the first A/D channel and output amplifier 0, as
+        set by apply_settings. Use get_capabilities for the cached table.
+        """
+        with self._mutex:
+            n_hs_speeds = self.GetNumberHSSpeeds()
+            n_vs_speeds = self.GetNumberVSSpeeds()
+            n_gains = self.GetNumberPreAmpGains()
+
+            return ReadoutSpeeds(
+                hs_speeds=[self.GetHSSpeed(i) for i in range(n_hs_speeds)],
+                vs_speeds=[self.GetVSSpeed(i) for i in range(n_vs_speeds)],
+                preamp_gains=[self.GetPreAmpGain(i) for i in range(n_gains)],
+                preamp_gain_available=[
+                    [self.IsPreAmpGainAvailable(0, 0, i, j) for j in range(n_gains)]
+                    for i in range(n_hs_speeds)
+                ],
+                recommended_vs_speed_index=self.GetFastestRecommendedVSSpeed()[0],
+                n_vs_amplitudes=self.GetNumberVSAmplitudes(),
+            )
+
+    def get_capabilities(self) -> AndorCapabilities:
+        """Returns the fixed properties of the head.
+
+        They are read from the SDK on the first call after connecting and
+        cached until the camera is disconnected.
+        """
+        if self.capabilities is not None:
+            return self.capabilities
+
+        capabilities = AndorCapabilities()
+
+        with self._mutex:
+            capabilities.model = self.GetHeadModel()
+            capabilities.serial_number = self.GetCameraSerialNumber()
+            capabilities.min_temperature, capabilities.max_temperature = (
+                self.GetTemperatureRange()
+            )
+            capabilities.xpixels, capabilities.ypixels = self.GetDetector()
+            capabilities.readout_speeds = self.get_readout_speeds()
+            capabilities.software_version = SoftwareVersion(*self.GetSoftwareVersion())
+            capabilities.hardware_version = HardwareVersion(*self.GetHardwareVersion())
+
+        if self.is_connected:
+            self.capabilities = capabilities
+
+        return capabilities
+
+    def get_live_status(self) -> AndorLiveStatus:
+        """Snapshot of the camera state, taken under a single lock acquisition."""
+        live_status = AndorLiveStatus()
+
+        with self._mutex:
+            live_status.status = self.GetStatus()
+            live_status.temperature, cooling_status = self.get_temperature_status()
+            live_status.cooling_status = cooling_status.message
+            live_status.is_cooler_on = self.IsCoolerOn()
+            (
+                live_status.exposure_time,
+                live_status.accumulate_cycle,
+                live_status.kinetic_cycle,
+            ) = self.GetAcquisitionTimings()
+
+        return live_status
+
     def get_info(self) -> None:
+        capabilities = self.get_capabilities()
+        live_status = self.get_live_status()
 
         info = AndorInfo()
 
         info.is_connected = self.is_connected
-        info.status = self.GetStatus()
-        info.model = self.GetHeadModel()
-        info.serial_number = self.GetCameraSerialNumber()
-        info.min_temperature, info.max_temperature = self.GetTemperatureRange()
-        info.temperature = self.GetTemperature()
-        info.cooling_status = self.last_error.message
-        info.is_cooler_on = self.IsCoolerOn()
-        info.exposure_time, info.accumulate_cycle, info.kinetic_cycle = (
-            self.GetAcquisitionTimings()
-        )
-        info.xpixels, info.ypixels = self.GetDetector()
-
-        info.software_version = SoftwareVersion(*self.GetSoftwareVersion())
-        info.hardware_version = HardwareVersion(*self.GetHardwareVersion())
+        info.status = live_status.status
+        info.temperature = live_status.temperature
+        info.cooling_status = live_status.cooling_status
+        info.is_cooler_on = live_status.is_cooler_on
+        info.exposure_time = live_status.exposure_time
+        info.accumulate_cycle = live_status.accumulate_cycle
+        info.kinetic_cycle = live_status.kinetic_cycle
+
+        info.model = capabilities.model
+        info.serial_number = capabilities.serial_number
+        info.min_temperature = capabilities.min_temperature
+        info.max_temperature = capabilities.max_temperature
+        info.xpixels = capabilities.xpixels
+        info.ypixels = capabilities.ypixels
+        info.readout_speeds = capabilities.readout_speeds
+        info.software_version = capabilities.software_version
+        info.hardware_version = capabilities.hardware_version
 
         self.info = info
 
@@ -4,40 +4,48 @@ from dataclasses import asdict
 from pathlib import Path
 
 import tomli_w
-from PyQt5.QtCore import QThreadPool, QTimer
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QFileDialog, QWidget
 
-from lumed_andor.acquisition import AndorAcquisition
+from lumed_andor.acquisition import AcquisitionResult, AndorAcquisition
 from lumed_andor.andor_control import AndorCamera
+from lumed_andor.device_actor import CommandPriority, DeviceActor
 from lumed_andor.device_worker import DeviceWorker
 from lumed_andor.fileio import export_setting, import_setting
 from lumed_andor.plotting import AndorPlot
+from lumed_andor.track_detection import propose_tracks
 from lumed_andor.ui.andor_ui import Ui_andorCameraWidget
+from lumed_andor.validation import validate_settings
 
 logger = logging.getLogger(__name__)
 
 
 class AndorCameraWidget(QWidget, Ui_andorCameraWidget):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, camera: AndorCamera | None = None):
         super().__init__(parent)
         logger.info("Widget intialization")
         self.setupUi(self)
 
-        # Threadpool
-        self.threadpool = QThreadPool(parent=self)
-        self.threadpool.setMaxThreadCount(1)
-        # Only 1 thread at a time to talk to camera!!!
-        # More can cause seg faults
-
         # Connecting to device
-        self.connectingToAndorDrivers()
+        self.camera = camera
+        if self.camera is None:
+            self.connectingToAndorDrivers()
         if not self.camera:
             self.setEnabled(False)
             return
 
+        # Device thread
+        # Only 1 thread at a time to talk to camera!!!
+        # More can cause seg faults
+        self.device_actor = DeviceActor(self.camera)
+        self.device_actor.start()
+
         # Backend refs
         self.current_acquisition: AndorAcquisition = AndorAcquisition(self.camera)
         self.last_image_plot: None | AndorPlot = None
+        # Last image mode acquisition, for the read mode optimizer
+        self.last_image_result: None | AcquisitionResult = None
+        self.optimize_signal_fraction: float = 0.95
 
         # ui configuration
         self.set_default_ui()
@@ -86,8 +94,9 @@ class AndorCameraWidget(QWidget, Ui_andorCameraWidget):
         )
 
         # Disabling not implemented options
-        self.comboBoxAcquisitionMode.model().item(1).setEnabled(False)
+        # Fast Kinetics: no controls for its config, set through settings files
         self.comboBoxAcquisitionMode.model().item(3).setEnabled(False)
+        # Run till abort: no live display, streaming is used through the API
         self.comboBoxAcquisitionMode.model().item(4).setEnabled(False)
 
         # Misc
@@ -105,6 +114,7 @@ class AndorCameraWidget(QWidget, Ui_andorCameraWidget):
         ## Read Mode
         self.comboBoxReadMode.currentIndexChanged.connect(self.set_readmode)
         self.pushButtonReadModeDefault.clicked.connect(self.restore_readmode_default)
+        self.pushButtonReadModeOptimize.clicked.connect(self.optimize_readmode)
         self.checkBoxShowRegion.clicked.connect(self.update_readmode_region)
 
         # Multi Track
@@ -134,6 +144,10 @@ class AndorCameraWidget(QWidget, Ui_andorCameraWidget):
         )
         self.spinBoxkineticNumber.valueChanged.connect(self.set_kinetic_number)
         self.spinBoxkineticTime.valueChanged.connect(self.set_kinetic_cycle)
+        self.spinBoxAccumulationNumber.valueChanged.connect(
+            self.set_accumulation_number
+        )
+        self.spinBoxAccumulationTime.valueChanged.connect(self.set_accumulation_cycle)
 
         # Test acquisition
         self.pushButtonTestAcquisition.clicked.connect(self.acquisitionBtnClicked)
@@ -145,9 +159,23 @@ class AndorCameraWidget(QWidget, Ui_andorCameraWidget):
 
     # Updates and timers
 
+    def run_on_device(
+        self, fn, *args, priority=CommandPriority.SETTER, on_finished=None
+    ):
+        """Queues fn on the device thread, on_finished is called in the GUI thread."""
+        worker = DeviceWorker(fn, *args)
+        if on_finished is not None:
+            worker.signals.finished.connect(on_finished)
+
+        return self.device_actor.submit(worker.run, priority=priority)
+
     def trigger_camera_update(self):
-        worker = DeviceWorker(self.camera.get_info)
-        self.threadpool.start(worker)
+        # Coalesced: at most one pending status poll behind a long command
+        self.device_actor.submit(
+            self.camera.get_info,
+            priority=CommandPriority.TELEMETRY,
+            coalesce_key="get_info",
+        )
 
     def update_ui(self):
 
@@ -193,6 +221,14 @@ class AndorCameraWidget(QWidget, Ui_andorCameraWidget):
             self.spinBoxkineticNumber.setValue(int(self.camera.number_kinetics))
         if not self.spinBoxkineticTime.hasFocus():
             self.spinBoxkineticTime.setValue(int(self.camera.target_kinetic_time))
+        if not self.spinBoxAccumulationNumber.hasFocus():
+            self.spinBoxAccumulationNumber.setValue(
+                int(self.camera.number_accumulation)
+            )
+        if not self.spinBoxAccumulationTime.hasFocus():
+            self.spinBoxAccumulationTime.setValue(
+                int(self.camera.target_accumulation_time)
+            )
 
     def update_readmode_tab(self):
         # Read Modes
@@ -280,15 +316,18 @@ class AndorCameraWidget(QWidget, Ui_andorCameraWidget):
             self.checkBoxShowRegion.show()
             self.pushButtonReadModeOptimize.show()
 
+        # Tracks are optimized on the last image
+        self.pushButtonReadModeOptimize.setEnabled(
+            read_mode in (1, 2, 3) and self.last_image_result is not None
+        )
+
     # Connect and disconnect
 
     def connectBtnClicked(self):
         logger.info("Connecting to Andor camera")
         self.pushButtonConnect.setEnabled(False)
 
-        worker = DeviceWorker(self.camera.connect)
-        worker.signals.finished.connect(self.post_camera_connection)
-        self.threadpool.start(worker)
+        self.run_on_device(self.camera.connect, on_finished=self.post_camera_connection)
 
     def post_camera_connection(self):
         error = self.camera.last_error
@@ -313,7 +352,7 @@ class AndorCameraWidget(QWidget, Ui_andorCameraWidget):
         self.spinBoxMultiTrackOffset.setMaximum(self.camera.info.ypixels)
         self.spinBoxMultiTrackNumber.setMinimum(1)
         self.spinBoxMultiTrackHeight.setMinimum(1)
-        self.spinBoxMultiTrackOffset.setMinimum(0)
+        self.spinBoxMultiTrackOffset.setMinimum(-self.camera.info.ypixels)
 
         # Random Track
 
@@ -345,9 +384,9 @@ class AndorCameraWidget(QWidget, Ui_andorCameraWidget):
         self.pushButtonDisconnect.setEnabled(False)
         self.update_timer.stop()
 
-        worker = DeviceWorker(self.camera.disconnect)
-        worker.signals.finished.connect(self.post_camera_disconnection)
-        self.threadpool.start(worker)
+        self.run_on_device(
+            self.camera.disconnect, on_finished=self.post_camera_disconnection
+        )
 
     def post_camera_disconnection(self):
         error = self.camera.last_error
@@ -369,18 +408,28 @@ class AndorCameraWidget(QWidget, Ui_andorCameraWidget):
         if new_target_temp == self.camera.target_temperature:
             return
 
-        self.camera.SetTemperature(new_target_temp)
-        andor_msg = self.camera.last_error.message
-        logger.info("target temperature changed - %i - %s", new_target_temp, andor_msg)
+        def set_temperature():
+            self.camera.SetTemperature(new_target_temp)
+            andor_msg = self.camera.last_error.message
+            logger.info(
+                "target temperature changed - %i - %s", new_target_temp, andor_msg
+            )
+
+        self.run_on_device(set_temperature)
 
     def set_exposure_time(self):
         new_exposure_time = self.spinBoxTargetExposureTime.value()
         if new_exposure_time == self.camera.target_exposure_time:
             return
 
-        self.camera.SetExposureTime(new_exposure_time)
-        andor_msg = self.camera.last_error.message
-        logger.info("exposure time changed - %i ms - %s", new_exposure_time, andor_msg)
+        def set_exposure():
+            self.camera.SetExposureTime(new_exposure_time)
+            andor_msg = self.camera.last_error.message
+            logger.info(
+                "exposure time changed - %i ms - %s", new_exposure_time, andor_msg
+            )
+
+        self.run_on_device(set_exposure)
 
     # Read mode control
 
@@ -390,11 +439,12 @@ class AndorCameraWidget(QWidget, Ui_andorCameraWidget):
         if new_readMode_index == self.camera.read_mode:
             return
 
-        self.camera.SetReadMode(new_readMode_index)
-        andor_msg = self.camera.last_error.message
-        logger.info("readMode changed to - %s - %s", new_readMode, andor_msg)
+        def set_readmode():
+            self.camera.SetReadMode(new_readMode_index)
+            andor_msg = self.camera.last_error.message
+            logger.info("readMode changed to - %s - %s", new_readMode, andor_msg)
 
-        self.update_readmode_region()
+        self.run_on_device(set_readmode, on_finished=self.update_readmode_region)
 
     def restore_readmode_default(self):
 
@@ -420,17 +470,62 @@ class AndorCameraWidget(QWidget, Ui_andorCameraWidget):
 
         self.update_readmode_region()
 
+    def optimize_readmode(self):
+        result = self.last_image_result
+        if result is None:
+            return
+
+        settings = result.camera_settings
+        try:
+            proposals = propose_tracks(
+                result.data,
+                settings.image_config,
+                result.camera_info.ypixels,
+                fraction=self.optimize_signal_fraction,
+                hbin=self.camera.random_track.hbin,
+            )
+        except ValueError as e:
+            logger.error("Cannot optimize the read mode tracks - %s", e)
+            return
+
+        read_mode = self.camera.read_mode
+        proposal = proposals.get(read_mode)
+        if proposal is None:
+            return
+        logger.info(
+            "Optimized tracks - %s - %i rows, %.1f%% of the signal",
+            proposal.track,
+            proposal.n_rows,
+            100 * proposal.fraction,
+        )
+
+        # Applied through the controls, as the user would
+        if read_mode == 1:
+            self.spinBoxMultiTrackNumber.setValue(proposal.track.number)
+            self.spinBoxMultiTrackOffset.setValue(proposal.track.offset)
+            self.spinBoxMultiTrackHeight.setValue(proposal.track.height)
+        elif read_mode == 2:
+            self.plainTextEditRandomTracks.setPlainText(str(proposal.track.tracks))
+        elif read_mode == 3:
+            self.spinBoxsingleTrackCenter.setValue(proposal.track.center)
+            self.spinBoxsingleTrackHeight.setValue(proposal.track.height)
+
+        self.update_readmode_region()
+
     def set_multi_track(self):
         new_number = self.spinBoxMultiTrackNumber.value()
         new_height = self.spinBoxMultiTrackHeight.value()
         new_offset = self.spinBoxMultiTrackOffset.value()
 
-        self.camera.SetMultiTrack(new_number, new_height, new_offset)
-        andor_msg = self.camera.last_error.message
+        def set_multi_track():
+            self.camera.SetMultiTrack(new_number, new_height, new_offset)
+            andor_msg = self.camera.last_error.message
 
-        logger.info("Multi Track changed - %s - %s", self.camera.multi_track, andor_msg)
+            logger.info(
+                "Multi Track changed - %s - %s", self.camera.multi_track, andor_msg
+            )
 
-        self.update_readmode_region()
+        self.run_on_device(set_multi_track, on_finished=self.update_readmode_region)
 
     def set_random_track(self):
         try:
@@ -443,29 +538,32 @@ class AndorCameraWidget(QWidget, Ui_andorCameraWidget):
             return
 
         numTracks = len(new_tracks) // 2
-        self.camera.SetRandomTracks(numTracks=numTracks, areas=new_tracks)
-        andor_msg = self.camera.last_error.message
 
-        logger.info(
-            "Random Track changed - %s - %s", self.camera.random_track, andor_msg
-        )
+        def set_random_track():
+            self.camera.SetRandomTracks(numTracks=numTracks, areas=new_tracks)
+            andor_msg = self.camera.last_error.message
 
-        self.update_readmode_region()
+            logger.info(
+                "Random Track changed - %s - %s", self.camera.random_track, andor_msg
+            )
+
+        self.run_on_device(set_random_track, on_finished=self.update_readmode_region)
 
     def set_single_track(self):
         new_center = self.spinBoxsingleTrackCenter.value()
         new_height = self.spinBoxsingleTrackHeight.value()
 
-        self.camera.SetSingleTrack(new_center, new_height)
-        andor_msg = self.camera.last_error.message
+        def set_single_track():
+            self.camera.SetSingleTrack(new_center, new_height)
+            andor_msg = self.camera.last_error.message
 
-        logger.info(
-            "Single Track changed - %s - %s",
-            self.camera.single_track,
-            andor_msg,
-        )
+            logger.info(
+                "Single Track changed - %s - %s",
+                self.camera.single_track,
+                andor_msg,
+            )
 
-        self.update_readmode_region()
+        self.run_on_device(set_single_track, on_finished=self.update_readmode_region)
 
     def set_image(self):
         hbin = self.spinBoxImageHBin.value()
@@ -475,15 +573,16 @@ class AndorCameraWidget(QWidget, Ui_andorCameraWidget):
         vstart = self.spinBoxImageVStart.value()
         vend = self.spinBoxImageVEnd.value()
 
-        self.camera.SetImage(hbin, vbin, hstart, hend, vstart, vend)
-        andor_msg = self.camera.last_error.message
-        logger.info(
-            "Image changed - %s - %s",
-            self.camera.image_config,
-            andor_msg,
-        )
+        def set_image():
+            self.camera.SetImage(hbin, vbin, hstart, hend, vstart, vend)
+            andor_msg = self.camera.last_error.message
+            logger.info(
+                "Image changed - %s - %s",
+                self.camera.image_config,
+                andor_msg,
+            )
 
-        self.update_readmode_region()
+        self.run_on_device(set_image, on_finished=self.update_readmode_region)
 
     # Acquisition mode control
 
@@ -494,40 +593,89 @@ class AndorCameraWidget(QWidget, Ui_andorCameraWidget):
         if new_acquiMode_index == self.camera.acquisition_mode - 1:
             return
 
-        self.camera.SetAcquisitionMode(new_acquiMode_index + 1)
-        andor_msg = self.camera.last_error.message
-        logger.info("readMode changed to - %s - %s", new_acquiMode, andor_msg)
+        def set_acquisition_mode():
+            self.camera.SetAcquisitionMode(new_acquiMode_index + 1)
+            andor_msg = self.camera.last_error.message
+            logger.info("readMode changed to - %s - %s", new_acquiMode, andor_msg)
+
+        self.run_on_device(set_acquisition_mode)
 
     def set_kinetic_number(self):
         new_kineticNumber = self.spinBoxkineticNumber.value()
         if new_kineticNumber == self.camera.number_kinetics:
             return
 
-        self.camera.SetNumberKinetics(new_kineticNumber)
-        andor_msg = self.camera.last_error.message
-        logger.info("kinetic number changed - %i - %s", new_kineticNumber, andor_msg)
+        def set_kinetic_number():
+            self.camera.SetNumberKinetics(new_kineticNumber)
+            andor_msg = self.camera.last_error.message
+            logger.info(
+                "kinetic number changed - %i - %s", new_kineticNumber, andor_msg
+            )
+
+        self.run_on_device(set_kinetic_number)
 
     def set_kinetic_cycle(self):
         new_kineticTime = self.spinBoxkineticTime.value()
         if new_kineticTime == self.camera.info.kinetic_cycle:
             return
 
-        self.camera.SetKineticCycleTime(new_kineticTime)
-        andor_msg = self.camera.last_error.message
-        logger.info("kinetic time changed - %i - %s", new_kineticTime, andor_msg)
+        def set_kinetic_cycle():
+            self.camera.SetKineticCycleTime(new_kineticTime)
+            andor_msg = self.camera.last_error.message
+            logger.info("kinetic time changed - %i - %s", new_kineticTime, andor_msg)
+
+        self.run_on_device(set_kinetic_cycle)
+
+    def set_accumulation_number(self):
+        new_accumulationNumber = self.spinBoxAccumulationNumber.value()
+        if new_accumulationNumber == self.camera.number_accumulation:
+            return
+
+        def set_accumulation_number():
+            self.camera.SetNumberAccumulations(new_accumulationNumber)
+            andor_msg = self.camera.last_error.message
+            logger.info(
+                "accumulation number changed - %i - %s",
+                new_accumulationNumber,
+                andor_msg,
+            )
+
+        self.run_on_device(set_accumulation_number)
+
+    def set_accumulation_cycle(self):
+        new_accumulationTime = self.spinBoxAccumulationTime.value()
+        if new_accumulationTime == self.camera.target_accumulation_time:
+            return
+
+        def set_accumulation_cycle():
+            self.camera.SetAccumulationCycleTime(new_accumulationTime)
+            andor_msg = self.camera.last_error.message
+            logger.info(
+                "accumulation time changed - %i - %s", new_accumulationTime, andor_msg
+            )
+
+        self.run_on_device(set_accumulation_cycle)
 
     # Test acquisition
 
     def acquisitionBtnClicked(self):
 
         self.current_acquisition = AndorAcquisition(self.camera)
+        self.current_acquisition.host_accumulation = (
+            self.checkBoxHostAccumulation.isChecked()
+        )
         self.current_acquisition.signals.finished.connect(self.plot_acquisition_results)
         logger.info("Starting test acquisition")
-        self.threadpool.start(self.current_acquisition)
+        self.device_actor.submit(
+            self.current_acquisition.run, priority=CommandPriority.ACQUISITION
+        )
 
     def abort_acquisition(self):
         logger.warning("Abborting acquisition")
-        self.current_acquisition.abort_acquisition()
+        # Not queued, interrupts the acquisition running on the device thread
+        self.device_actor.submit(
+            self.current_acquisition.abort_acquisition, priority=CommandPriority.ABORT
+        )
 
     def plot_acquisition_results(self):
 
@@ -542,6 +690,10 @@ class AndorCameraWidget(QWidget, Ui_andorCameraWidget):
         if andor_plot.is_image_plot:
             self.last_image_plot = andor_plot
 
+        settings = result.camera_settings
+        if settings.read_mode == 4 and settings.acquisition_mode != 4:
+            self.last_image_result = result
+
     def update_readmode_region(self):
         if not self.checkBoxShowRegion.isChecked():
             return
@@ -600,5 +752,16 @@ class AndorCameraWidget(QWidget, Ui_andorCameraWidget):
         logger.info("Loading settings from file")
         setting = import_setting(filepath=filepath)
 
-        logger.info("Applying settings to camera - %s", setting)
-        self.camera.apply_settings(setting)
+        violations = validate_settings(setting, self.camera.info)
+        if violations:
+            for violation in violations:
+                logger.error("Invalid setting in %s - %s", filepath.name, violation)
+            logger.error("Settings not applied")
+            return
+
+        def apply_settings():
+            logger.info("Applying settings to camera - %s", setting)
+            skipped = self.camera.apply_settings(setting)
+            logger.info("%i unchanged settings skipped", skipped)
+
+        self.run_on_device(apply_settings)
@@ -0,0 +1,207 @@
+import asyncio
+import functools
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+from PyQt5.QtCore import Qt
+
+from lumed_andor.acquisition import AcquisitionResult, AndorAcquisition
+from lumed_andor.andor_control import AndorCamera, AndorLiveStatus, AndorSettings
+from lumed_andor.device_actor import CommandPriority, DeviceActor
+from lumed_andor.validation import validate_settings
+
+logger = logging.getLogger()
+
+TEMPERATURE_STABILIZED = "DRV_TEMPERATURE_STABILIZED"
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    fraction: float
+
+
+@dataclass(frozen=True)
+class FrameEvent:
+    """Frame read during an acquisition.
+
+    ``data`` is a copy: the frames of the result live in pooled buffers that
+    are reused once released, possibly before a slow subscriber gets the
+    event.
+    """
+
+    index: int
+    data: np.ndarray
+
+
+class AsyncAndorCamera:
+    """asyncio facade over an AndorCamera.
+
+    Every blocking SDK call runs on a single DeviceActor thread, so the
+    library is never entered concurrently and any number of coroutines can
+    share one camera without spawning threads. Status requests issued while
+    one is already pending share its result.
+
+    Progress and frame events are broadcast to every ``events()`` iterator.
+    Each subscriber has its own bounded queue, a slow subscriber loses its
+    oldest events instead of delaying the others.
+    """
+
+    def __init__(
+        self,
+        camera: AndorCamera | None = None,
+        actor: DeviceActor | None = None,
+        event_queue_size: int = 256,
+    ):
+        self.camera: AndorCamera = camera if camera is not None else AndorCamera()
+        self.actor: DeviceActor = (
+            actor if actor is not None else DeviceActor(self.camera)
+        )
+        if not self.actor.is_alive():
+            self.actor.start()
+
+        self.event_queue_size: int = event_queue_size
+        self._subscribers: set[asyncio.Queue] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._acquisition: AndorAcquisition | None = None
+
+    async def _call(
+        self, fn, *args, priority=CommandPriority.SETTER, coalesce_key=None
+    ):
+        self._loop = asyncio.get_running_loop()
+        future = self.actor.submit(
+            fn, *args, priority=priority, coalesce_key=coalesce_key
+        )
+        return await asyncio.wrap_future(future)
+
+    async def connect(self) -> bool:
+        await self._call(self.camera.connect)
+        return self.camera.is_connected
+
+    async def disconnect(self) -> bool:
+        await self._call(self.camera.disconnect)
+        return not self.camera.is_connected
+
+    async def close(self) -> None:
+        """Stops the device thread, pending commands are cancelled."""
+        await asyncio.to_thread(self.actor.stop)
+
+    async def apply_settings(self, settings: AndorSettings, force=False) -> int:
+        """Validates and applies settings, returns the number of skipped setters."""
+        violations = validate_settings(settings, self.camera.info)
+        if violations:
+            raise ValueError(
+                "Invalid camera settings - " + "; ".join(map(str, violations))
+            )
+
+        return await self._call(self.camera.apply_settings, settings, force)
+
+    async def get_status(self) -> AndorLiveStatus:
+        return await self._call(
+            self.camera.get_live_status,
+            priority=CommandPriority.TELEMETRY,
+            coalesce_key="live_status",
+        )
+
+    async def wait_temperature_stable(
+        self,
+        target: int | None = None,
+        poll_interval: float = 1.0,
+        timeout: float | None = None,
+    ) -> AndorLiveStatus:
+        """Waits until the cooler reports a stabilized temperature.
+
+        When ``target`` is given, the target temperature is set and the cooler
+        turned on first. Raises TimeoutError after ``timeout`` seconds.
+        """
+        if target is not None:
+            await self._call(self.camera.SetTemperature, target)
+            await self._call(self.camera.CoolerOn)
+
+        async def poll():
+            while True:
+                status = await self.get_status()
+                if status.cooling_status == TEMPERATURE_STABILIZED:
+                    return status
+                logger.debug(
+                    "Temperature %i - %s", status.temperature, status.cooling_status
+                )
+                await asyncio.sleep(poll_interval)
+
+        return await asyncio.wait_for(poll(), timeout)
+
+    async def acquire(self) -> AcquisitionResult:
+        """Runs one acquisition with the current settings.
+
+        Frames are published to the subscribers as soon as they are read. The
+        result data comes from the camera buffer pool, call
+        ``result.release()`` once it is no longer needed.
+        """
+        if self._acquisition is not None:
+            raise RuntimeError("An acquisition is already in progress")
+
+        self._loop = asyncio.get_running_loop()
+        acquisition = AndorAcquisition(self.camera)
+        # Emitted from the device thread, no Qt event loop is needed
+        acquisition.signals.progress.connect(
+            lambda fraction: self._publish(ProgressEvent(fraction)),
+            Qt.DirectConnection,
+        )
+        acquisition.signals.frames.connect(self._publish_frames, Qt.DirectConnection)
+
+        self._acquisition = acquisition
+        try:
+            await self._call(acquisition.run, priority=CommandPriority.ACQUISITION)
+        finally:
+            self._acquisition = None
+
+        return acquisition.result
+
+    async def abort(self) -> None:
+        acquisition = self._acquisition
+        if acquisition is None:
+            return
+
+        # ABORT commands run at once on the submitting thread: submitted from
+        # the executor, the blocking AbortAcquisition and CancelWait calls
+        # stay off the event loop while the device thread is interrupted
+        future = await asyncio.get_running_loop().run_in_executor(
+            None,
+            functools.partial(
+                self.actor.submit,
+                acquisition.abort_acquisition,
+                priority=CommandPriority.ABORT,
+            ),
+        )
+        future.result()
+
+    async def events(self):
+        """Async iterator of ProgressEvent and FrameEvent."""
+        queue = asyncio.Queue(maxsize=self.event_queue_size)
+        self._subscribers.add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers.discard(queue)
+
+    async def frames(self):
+        """Async iterator of the acquired frames."""
+        async for event in self.events():
+            if isinstance(event, FrameEvent):
+                yield event
+
+    def _publish(self, event) -> None:
+        """Thread-safe broadcast to the subscribers."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._broadcast, event)
+
+    def _publish_frames(self, first: int, frames: np.ndarray) -> None:
+        for index, frame in enumerate(frames, start=first):
+            self._publish(FrameEvent(index, frame.copy()))
+
+    def _broadcast(self, event) -> None:
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
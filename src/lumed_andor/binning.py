@@ -0,0 +1,223 @@
+import numpy as np
+
+from lumed_andor.andor_control import (
+    AndorSettings,
+    ImageConfig,
+    MultiTrack,
+    RandomTrack,
+    SingleTrack,
+)
+
+
+def single_track_rows(track: SingleTrack, ypixels: int) -> tuple[int, int]:
+    """First and last sensor rows (1-based, inclusive) of a single track."""
+    first = max(track.center - track.height // 2, 1)
+    return first, min(first + track.height - 1, ypixels)
+
+
+def multi_track_layout(
+    number: int, height: int, offset: int, ypixels: int
+) -> tuple[int, int]:
+    """Bottom row (1-based) and gap of evenly spread tracks, as SetMultiTrack."""
+    free_rows = max(ypixels - number * height, 0)
+    gap = free_rows // number if number > 1 else 0
+    bottom = 1 + (free_rows - gap * (number - 1)) // 2 + offset
+    return bottom, gap
+
+
+def multi_track_rows(track: MultiTrack, ypixels: int) -> list[tuple[int, int]]:
+    """Sensor rows of every track, bottom and gap as returned by the SDK.
+
+    When the track has not been set on a camera (bottom is 0), the layout of
+    SetMultiTrack is computed.
+    """
+    bottom, gap = track.bottom, track.gap
+    if bottom < 1:
+        bottom, gap = multi_track_layout(
+            track.number, track.height, track.offset, ypixels
+        )
+
+    firsts = bottom + np.arange(track.number) * (track.height + gap)
+    return [(int(first), int(first) + track.height - 1) for first in firsts]
+
+
+def random_track_rows(track: RandomTrack) -> list[tuple[int, int]]:
+    tracks = track.tracks
+    return [(tracks[i], tracks[i + 1]) for i in range(0, len(tracks) - 1, 2)]
+
+
+class HostBinning:
+    """Re-bins and re-crops image mode data on the host.
+
+    The data is a (n_frames, rows, columns) series read in image mode with
+    the ``source`` ImageConfig. Any ImageConfig binning or region, single,
+    multi or random tracks and full vertical binning can be extracted from
+    it, for the whole series at once. Results have the shapes the camera
+    gives in the corresponding read mode.
+
+    Sensor coordinates are 1-based as in the SDK. Regions must lie in the
+    acquired area and, when the source is itself binned, be aligned on its
+    binning. Plain crops are returned as views of the data, binned values
+    are summed in 64 bits.
+    """
+
+    def __init__(self, data: np.ndarray, source: ImageConfig, ypixels: int = 0):
+        if data.ndim == 2:
+            data = data[np.newaxis]
+        self.data: np.ndarray = data
+        self.source: ImageConfig = source
+        # Sensor height, for tracks clipped at the top of the sensor
+        self.ypixels: int = ypixels or source.vstart + data.shape[1] * source.vbin - 1
+
+    @classmethod
+    def from_result(cls, result) -> "HostBinning":
+        """From an AcquisitionResult acquired in image mode."""
+        settings = result.camera_settings
+        if settings.read_mode != 4 or settings.acquisition_mode == 4:
+            raise ValueError("Host binning needs data acquired in image mode")
+
+        return cls(result.data, settings.image_config, result.camera_info.ypixels)
+
+    @property
+    def sum_dtype(self) -> np.dtype:
+        if np.issubdtype(self.data.dtype, np.integer):
+            return np.dtype(np.int64)
+        return self.data.dtype
+
+    @staticmethod
+    def _indices(first, last, start, binning, size, axis) -> tuple[int, int]:
+        """Data indices [i0, i1) of the sensor pixels first to last."""
+        if (first - start) % binning or (last - first + 1) % binning:
+            raise ValueError(
+                f"{axis} {first} to {last} are not aligned on the source binning "
+                f"of {binning} from {start}"
+            )
+
+        i0 = (first - start) // binning
+        i1 = (last - start + 1) // binning
+        if i0 < 0 or i1 > size or i1 <= i0:
+            raise ValueError(f"{axis} {first} to {last} are outside the acquired area")
+        return i0, i1
+
+    def _factor(self, binning: int, source_binning: int, axis: str) -> int:
+        if binning % source_binning:
+            raise ValueError(
+                f"{axis} binning {binning} is not a multiple of the source binning "
+                f"{source_binning}"
+            )
+        return binning // source_binning
+
+    def _sum_bins(self, data: np.ndarray, factor: int, axis: int) -> np.ndarray:
+        """Sums groups of ``factor`` consecutive values along axis.
+
+        Small groups are summed as strided slices (one add per position in
+        the group, no loop over rows nor columns), large groups of columns
+        with a reshape and sum over the contiguous last axis.
+        """
+        if factor == 1:
+            return data
+
+        size = data.shape[axis] // factor * factor
+        if axis == data.ndim - 1 and factor > 8:
+            shape = (*data.shape[:-1], size // factor, factor)
+            return data[..., :size].reshape(shape).sum(axis=-1, dtype=self.sum_dtype)
+
+        index = [slice(None)] * data.ndim
+        index[axis] = slice(0, size, factor)
+        out = data[tuple(index)].astype(self.sum_dtype)
+        for offset in range(1, factor):
+            index[axis] = slice(offset, size, factor)
+            np.add(out, data[tuple(index)], out=out)
+        return out
+
+    def _bin_columns(self, data: np.ndarray, hbin: int) -> np.ndarray:
+        # No binning keeps the horizontal resolution of the source
+        factor = self._factor(hbin, self.source.hbin, "Horizontal") if hbin > 1 else 1
+        return self._sum_bins(data, factor, axis=2)
+
+    def image(self, config: ImageConfig) -> np.ndarray:
+        """(n, height, width) data of the image read mode."""
+        source = self.source
+        _, n_rows, n_columns = self.data.shape
+        height = (config.vend - config.vstart + 1) // config.vbin
+        width = (config.hend - config.hstart + 1) // config.hbin
+
+        r0, r1 = self._indices(
+            config.vstart,
+            config.vstart + height * config.vbin - 1,
+            source.vstart,
+            source.vbin,
+            n_rows,
+            "Rows",
+        )
+        c0, c1 = self._indices(
+            config.hstart,
+            config.hstart + width * config.hbin - 1,
+            source.hstart,
+            source.hbin,
+            n_columns,
+            "Columns",
+        )
+        vfactor = self._factor(config.vbin, source.vbin, "Vertical")
+        hfactor = self._factor(config.hbin, source.hbin, "Horizontal")
+
+        # Rows first, the columns are then binned on the smaller array
+        region = self.data[:, r0:r1, c0:c1]
+        region = self._sum_bins(region, vfactor, axis=1)
+        return self._sum_bins(region, hfactor, axis=2)
+
+    def rows(self, ranges, hbin: int = 1) -> np.ndarray:
+        """(n, n_ranges, width) sums of the sensor rows first to last of each range.
+
+        Ranges are 1-based and inclusive, in any order and may overlap.
+        """
+        n_rows = self.data.shape[1]
+        indices = np.array(
+            [
+                self._indices(
+                    first, last, self.source.vstart, self.source.vbin, n_rows, "Rows"
+                )
+                for first, last in ranges
+            ],
+            dtype=np.intp,
+        )
+        if len(indices) == 0:
+            raise ValueError("No track to extract")
+
+        # One reduction per range over its slice of rows
+        sums = np.empty(
+            (len(self.data), len(indices), self.data.shape[2]), dtype=self.sum_dtype
+        )
+        for k, (start, stop) in enumerate(indices):
+            np.sum(self.data[:, start:stop], axis=1, out=sums[:, k])
+
+        return self._bin_columns(sums, hbin)
+
+    def full_vertical_binning(self) -> np.ndarray:
+        """Sum of every acquired row, (n, 1, width)."""
+        return self.data.sum(axis=1, keepdims=True, dtype=self.sum_dtype)
+
+    def single_track(self, track: SingleTrack) -> np.ndarray:
+        return self.rows([single_track_rows(track, self.ypixels)])
+
+    def multi_track(self, track: MultiTrack) -> np.ndarray:
+        return self.rows(multi_track_rows(track, self.ypixels))
+
+    def random_track(self, track: RandomTrack) -> np.ndarray:
+        return self.rows(random_track_rows(track), hbin=track.hbin)
+
+    def apply(self, settings: AndorSettings) -> np.ndarray:
+        """Data as the camera would read it with the read mode of settings."""
+        read_mode = settings.read_mode
+        if read_mode == 0:
+            return self.full_vertical_binning()
+        if read_mode == 1:
+            return self.multi_track(settings.multi_track)
+        if read_mode == 2:
+            return self.random_track(settings.random_track)
+        if read_mode == 3:
+            return self.single_track(settings.single_track)
+        if read_mode == 4:
+            return self.image(settings.image_config)
+
+        raise ValueError(f"Unknown read mode {read_mode}")
@@ -0,0 +1,118 @@
+import logging
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import RLock
+
+import numpy as np
+
+logger = logging.getLogger()
+
+DEFAULT_MAX_BYTES = 2 * 1024**3  # 2 GiB of idle buffers
+
+
+@dataclass
+class BufferPoolStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    idle_bytes: int = 0
+    in_use_bytes: int = 0
+    peak_bytes: int = 0
+
+
+class FrameBufferPool:
+    """Pool of preallocated frame buffers keyed by (shape, dtype).
+
+    ``acquire`` hands out an idle buffer of the requested geometry when one is
+    available and allocates a new one otherwise. Buffers come back to the pool
+    with ``release`` and are reused by the next acquisition of the same
+    geometry. When the idle buffers exceed ``max_bytes``, the least recently
+    released ones are dropped.
+
+    Buffers in use are tracked weakly: a buffer never released is freed by
+    the garbage collector once unreferenced, as a plain array would be.
+
+    Buffers are handed out uninitialized, like ``np.empty``.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes: int = max_bytes
+        self.stats: BufferPoolStats = BufferPoolStats()
+
+        # Reentrant: the garbage collection of a buffer in use can run its
+        # finalizer while the pool is locked by the same thread
+        self._mutex: RLock = RLock()
+        self._idle: OrderedDict[tuple, list[np.ndarray]] = OrderedDict()
+        self._in_use: dict[int, weakref.finalize] = {}
+
+    @staticmethod
+    def _key(shape, dtype) -> tuple:
+        return tuple(shape), np.dtype(dtype)
+
+    def acquire(self, shape, dtype=np.int32) -> np.ndarray:
+        key = self._key(shape, dtype)
+
+        with self._mutex:
+            buffers = self._idle.get(key)
+            if buffers:
+                buffer = buffers.pop()
+                if not buffers:
+                    del self._idle[key]
+                self.stats.hits += 1
+                self.stats.idle_bytes -= buffer.nbytes
+            else:
+                buffer = np.empty(key[0], dtype=key[1])
+                self.stats.misses += 1
+
+            self._in_use[id(buffer)] = weakref.finalize(
+                buffer, self._forget, id(buffer), buffer.nbytes
+            )
+            self.stats.in_use_bytes += buffer.nbytes
+            self._update_peak()
+
+        return buffer
+
+    def release(self, buffer: np.ndarray) -> None:
+        with self._mutex:
+            finalizer = self._in_use.pop(id(buffer), None)
+            if finalizer is None:
+                logger.debug("Buffer %s does not belong to the pool", buffer.shape)
+                return
+            finalizer.detach()
+
+            self.stats.in_use_bytes -= buffer.nbytes
+            self.stats.idle_bytes += buffer.nbytes
+
+            key = self._key(buffer.shape, buffer.dtype)
+            self._idle.setdefault(key, []).append(buffer)
+            self._idle.move_to_end(key)
+
+            self._evict()
+
+    def clear(self) -> None:
+        """Drops every idle buffer. Buffers in use are left untouched."""
+        with self._mutex:
+            self._idle.clear()
+            self.stats.idle_bytes = 0
+
+    def _forget(self, key: int, nbytes: int) -> None:
+        """Finalizer of a buffer collected without being released."""
+        with self._mutex:
+            if self._in_use.pop(key, None) is not None:
+                self.stats.in_use_bytes -= nbytes
+
+    def _evict(self) -> None:
+        while self.stats.idle_bytes > self.max_bytes and self._idle:
+            key, buffers = next(iter(self._idle.items()))
+            buffer = buffers.pop(0)
+            if not buffers:
+                del self._idle[key]
+
+            self.stats.idle_bytes -= buffer.nbytes
+            self.stats.evictions += 1
+            logger.debug("Evicted buffer %s %s from pool", key[0], key[1])
+
+    def _update_peak(self) -> None:
+        total_bytes = self.stats.idle_bytes + self.stats.in_use_bytes
+        self.stats.peak_bytes = max(self.stats.peak_bytes, total_bytes)
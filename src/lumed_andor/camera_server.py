@@ -0,0 +1,339 @@
+import functools
+import logging
+import multiprocessing
+from multiprocessing.shared_memory import SharedMemory
+from threading import Lock, Thread
+
+import numpy as np
+
+from lumed_andor.acquisition import AcquisitionResult, AndorAcquisition
+from lumed_andor.andor_control import AndorCamera, AndorInfo, AndorSettings
+from lumed_andor.multicamera import CameraResult, CameraWorker, serve_worker
+
+logger = logging.getLogger()
+
+DEFAULT_SLOT_BYTES = 64 * 1024**2
+
+
+class CameraServerError(RuntimeError):
+    """The camera server process died while serving a command."""
+
+
+class SharedFrameRing:
+    """Fixed-size frame slots in a shared memory block.
+
+    The block is created by the client and attached by the server, it
+    outlives server crashes. The client reserves a slot per acquisition, the
+    server has the SDK write the data into it and the client reads it back
+    as a NumPy view, without copy nor pickling. ``release`` gives the slot
+    back, which lets the ring be used as the buffer pool of an
+    AcquisitionResult.
+    """
+
+    def __init__(
+        self,
+        n_slots: int = 4,
+        slot_bytes: int = DEFAULT_SLOT_BYTES,
+        name: str | None = None,
+    ):
+        self.n_slots: int = n_slots
+        self.slot_bytes: int = slot_bytes
+        self.owner: bool = name is None
+        self.shm: SharedMemory = SharedMemory(
+            name=name, create=self.owner, size=n_slots * slot_bytes
+        )
+
+        self._mutex: Lock = Lock()
+        self._free: list[int] = list(range(n_slots))
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def view(self, slot: int, shape, dtype=np.int32) -> np.ndarray:
+        dtype = np.dtype(dtype)
+        n_bytes = int(np.prod(shape)) * dtype.itemsize
+        if n_bytes > self.slot_bytes:
+            raise ValueError(
+                f"{n_bytes} bytes frame does not fit in {self.slot_bytes} bytes slots"
+            )
+
+        return np.ndarray(
+            shape, dtype=dtype, buffer=self.shm.buf, offset=slot * self.slot_bytes
+        )
+
+    def reserve(self) -> int:
+        with self._mutex:
+            if not self._free:
+                raise RuntimeError(
+                    "Every shared memory slot is in use, release previous results"
+                )
+            return self._free.pop(0)
+
+    def free(self, slot: int) -> None:
+        with self._mutex:
+            if slot not in self._free:
+                self._free.append(slot)
+
+    def release(self, buffer: np.ndarray) -> None:
+        base = np.frombuffer(self.shm.buf, dtype=np.uint8).ctypes.data
+        self.free((buffer.ctypes.data - base) // self.slot_bytes)
+
+    def close(self) -> None:
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class _SlotPool:
+    """Buffer pool handing out a single shared memory slot."""
+
+    def __init__(self, ring: SharedFrameRing, slot: int):
+        self.ring: SharedFrameRing = ring
+        self.slot: int = slot
+
+    def acquire(self, shape, dtype=np.int32) -> np.ndarray:
+        return self.ring.view(self.slot, shape, dtype)
+
+    def release(self, buffer: np.ndarray) -> None:
+        pass
+
+
+class CameraServerWorker(CameraWorker):
+    """Server side: acquisitions are written into the shared memory slots.
+
+    Commands are served one at a time, ``abort_event`` is watched by a
+    separate thread to abort the running acquisition meanwhile.
+    """
+
+    def __init__(
+        self, camera_index, camera_factory, ring_name, n_slots, slot_bytes, abort_event
+    ):
+        super().__init__(camera_index, camera_factory, start_barrier=None)
+        self.ring: SharedFrameRing = SharedFrameRing(n_slots, slot_bytes, ring_name)
+        self.abort_event = abort_event
+        self._acquisition: AndorAcquisition | None = None
+        Thread(target=self._watch_abort, name="andor-server-abort", daemon=True).start()
+
+    def _watch_abort(self) -> None:
+        while True:
+            self.abort_event.wait()
+            acquisition = self._acquisition
+            if acquisition is not None:
+                logger.info("Camera %i - aborting acquisition", self.camera_index)
+                acquisition.abort_acquisition()
+            self.abort_event.clear()
+
+    def acquire_into(self, slot: int) -> tuple[CameraResult, tuple, str]:
+        acquisition = AndorAcquisition(self.camera)
+        acquisition.buffer_pool = _SlotPool(self.ring, slot)
+        self._acquisition = acquisition
+        try:
+            acquisition.run()
+        finally:
+            self._acquisition = None
+
+        result = acquisition.result
+        data = result.data
+        slot_view = self.ring.view(slot, data.shape, data.dtype)
+        if not np.shares_memory(data, slot_view):
+            # Data computed on the host (e.g. host accumulation)
+            np.copyto(slot_view, data)
+
+        camera_result = CameraResult(
+            camera_index=self.camera_index,
+            model=result.camera_info.model,
+            serial_number=result.camera_info.serial_number,
+            camera_info=result.camera_info,
+            camera_settings=result.camera_settings,
+            integrity=result.integrity,
+            start_time_ns=acquisition.start_time_ns,
+        )
+        return camera_result, data.shape, data.dtype.str
+
+
+def _server_main(
+    camera_index, camera_factory, ring_name, n_slots, slot_bytes, abort_event, conn
+):
+    worker_factory = functools.partial(
+        CameraServerWorker,
+        camera_index,
+        camera_factory,
+        ring_name,
+        n_slots,
+        slot_bytes,
+        abort_event,
+    )
+    serve_worker(worker_factory, conn)
+
+
+class CameraServer:
+    """Runs an AndorCamera in a child process.
+
+    A crash of ``libandor.so`` only takes the server process down: the
+    server is restarted (up to ``max_restarts`` times), reconnected if it
+    was connected and the last settings successfully applied are applied
+    again. The command that was running raises CameraServerError.
+
+    Acquired data is transferred through the shared memory slots of a
+    SharedFrameRing, ``acquire`` returns an AcquisitionResult whose data is
+    a view of its slot. Call ``result.release()`` to free the slot.
+
+    Commands are blocking and served one at a time. ``abort`` is out of
+    band: it can be called from another thread while ``acquire`` waits, e.g.
+    to stop a long series or a Run till abort acquisition (the result then
+    holds the last frame).
+    """
+
+    def __init__(
+        self,
+        camera_index: int = 0,
+        camera_factory=AndorCamera,
+        n_slots: int = 4,
+        slot_bytes: int = DEFAULT_SLOT_BYTES,
+        max_restarts: int = 3,
+        mp_context: str = "spawn",
+    ):
+        self.camera_index: int = camera_index
+        self.camera_factory = camera_factory
+        self.n_slots: int = n_slots
+        self.slot_bytes: int = slot_bytes
+        self.max_restarts: int = max_restarts
+        self.n_restarts: int = 0
+
+        self.ring: SharedFrameRing | None = None
+        self.is_connected: bool = False
+        self.last_settings: AndorSettings | None = None
+
+        self._context = multiprocessing.get_context(mp_context)
+        self._abort_event = self._context.Event()
+        self._process = None
+        self._connection = None
+
+    def __enter__(self) -> "CameraServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self.ring = SharedFrameRing(self.n_slots, self.slot_bytes)
+        self._spawn()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        if self._process is not None:
+            try:
+                self._connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self._process.join(timeout)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process = None
+
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+
+    def _spawn(self) -> None:
+        connection, server_connection = self._context.Pipe()
+        self._process = self._context.Process(
+            target=_server_main,
+            args=(
+                self.camera_index,
+                self.camera_factory,
+                self.ring.name,
+                self.n_slots,
+                self.slot_bytes,
+                self._abort_event,
+                server_connection,
+            ),
+            name=f"andor-camera-server-{self.camera_index}",
+            daemon=True,
+        )
+        self._process.start()
+        # Only the server holds its end: EOF as soon as it dies
+        server_connection.close()
+        self._connection = connection
+
+        status, value = self._receive()
+        if status == "error":
+            raise value
+
+    def _receive(self):
+        while not self._connection.poll(0.1):
+            if not self._process.is_alive():
+                raise EOFError
+        return self._connection.recv()
+
+    def _restart(self) -> None:
+        self._process.join(1)
+        self._connection.close()
+        logger.error("Camera server died (exit code %s)", self._process.exitcode)
+
+        self.n_restarts += 1
+        if self.n_restarts > self.max_restarts:
+            self._process = None
+            raise CameraServerError(
+                f"Camera server crashed more than {self.max_restarts} times"
+            )
+
+        logger.warning("Restarting camera server (%i)", self.n_restarts)
+        self._spawn()
+        if self.is_connected:
+            self.is_connected = self.call("connect")
+        if self.is_connected and self.last_settings is not None:
+            self.call("apply_settings", self.last_settings)
+
+    def call(self, name: str, *args):
+        """Runs a CameraServerWorker method in the server process."""
+        try:
+            self._connection.send((name, args))
+            status, value = self._receive()
+        except (EOFError, OSError) as e:
+            self._restart()
+            raise CameraServerError(f"Camera server crashed during {name}") from e
+
+        if status == "error":
+            raise value
+        return value
+
+    def connect(self) -> bool:
+        self.is_connected = self.call("connect")
+        return self.is_connected
+
+    def disconnect(self) -> bool:
+        disconnected = self.call("disconnect")
+        self.is_connected = not disconnected
+        return disconnected
+
+    def get_info(self) -> AndorInfo:
+        return self.call("get_info")
+
+    def apply_settings(self, settings: AndorSettings) -> int:
+        skipped = self.call("apply_settings", settings)
+        self.last_settings = settings
+        return skipped
+
+    def abort(self) -> None:
+        """Aborts the acquisition running in the server, if any."""
+        self._abort_event.set()
+
+    def acquire(self) -> AcquisitionResult:
+        self._abort_event.clear()
+        slot = self.ring.reserve()
+        try:
+            camera_result, shape, dtype = self.call("acquire_into", slot)
+        except Exception:
+            self.ring.free(slot)
+            raise
+
+        result = AcquisitionResult(
+            camera_info=camera_result.camera_info,
+            camera_settings=camera_result.camera_settings,
+            buffer_pool=self.ring,
+            integrity=camera_result.integrity,
+        )
+        result.data = self.ring.view(slot, shape, dtype)
+        return result
@@ -0,0 +1,170 @@
+import itertools
+import logging
+import queue
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from enum import IntEnum
+from threading import Lock, Thread
+
+from lumed_andor.andor_control import AndorCamera
+
+logger = logging.getLogger()
+
+
+class CommandPriority(IntEnum):
+    """Lower values are served first."""
+
+    ABORT = 0
+    ACQUISITION = 1
+    SETTER = 2
+    TELEMETRY = 3
+
+
+@dataclass
+class WaitTimeStats:
+    count: int = 0
+    total: float = 0.0  # [s]
+    max: float = 0.0  # [s]
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def add(self, wait_time: float) -> None:
+        self.count += 1
+        self.total += wait_time
+        self.max = max(self.max, wait_time)
+
+
+@dataclass
+class DeviceActorMetrics:
+    queue_depth: int = 0
+    executed: int = 0
+    coalesced: int = 0
+    wait_time: dict[str, WaitTimeStats] = field(default_factory=dict)
+
+
+@dataclass
+class _Command:
+    fn: Callable
+    args: tuple
+    kwargs: dict
+    priority: CommandPriority
+    future: Future
+    coalesce_key: object = None
+    submitted: float = field(default_factory=time.monotonic)
+
+
+_STOP = object()
+
+
+class DeviceActor(Thread):
+    """Dedicated thread owning an AndorCamera and serving a priority queue.
+
+    The Andor library is not thread safe: every command submitted here runs on
+    this single thread, highest priority first and in submission order within
+    a priority. Each submission returns a ``concurrent.futures.Future``.
+
+    Commands submitted with a ``coalesce_key`` are merged with a pending
+    command holding the same key, which keeps periodic telemetry polls from
+    piling up behind a long acquisition.
+
+    ABORT commands are not queued: the SDK allows AbortAcquisition and
+    CancelWait while another thread is blocked in WaitForAcquisition, so they
+    run right away on the calling thread to interrupt the running command.
+    """
+
+    def __init__(self, camera: AndorCamera, name: str = "andor-device-actor"):
+        super().__init__(name=name, daemon=True)
+        self.camera: AndorCamera = camera
+
+        self._queue: queue.PriorityQueue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._mutex: Lock = Lock()
+        self._pending: dict[object, Future] = {}
+        self._metrics: DeviceActorMetrics = DeviceActorMetrics(
+            wait_time={priority.name: WaitTimeStats() for priority in CommandPriority}
+        )
+
+    def submit(
+        self,
+        fn,
+        *args,
+        priority: CommandPriority = CommandPriority.SETTER,
+        coalesce_key=None,
+        **kwargs,
+    ) -> Future:
+        if priority == CommandPriority.ABORT:
+            return self._run_now(fn, *args, **kwargs)
+
+        with self._mutex:
+            if coalesce_key is not None and coalesce_key in self._pending:
+                self._metrics.coalesced += 1
+                return self._pending[coalesce_key]
+
+            future = Future()
+            command = _Command(fn, args, kwargs, priority, future, coalesce_key)
+            if coalesce_key is not None:
+                self._pending[coalesce_key] = future
+
+            self._queue.put((priority, next(self._sequence), command))
+
+        return future
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stops the thread after the running command, pending ones are cancelled."""
+        self._queue.put((-1, next(self._sequence), _STOP))
+        self.join(timeout)
+
+        while not self._queue.empty():
+            _, _, command = self._queue.get_nowait()
+            if command is not _STOP:
+                command.future.cancel()
+
+    def metrics(self) -> DeviceActorMetrics:
+        with self._mutex:
+            return DeviceActorMetrics(
+                queue_depth=self._queue.qsize(),
+                executed=self._metrics.executed,
+                coalesced=self._metrics.coalesced,
+                wait_time={
+                    name: WaitTimeStats(stats.count, stats.total, stats.max)
+                    for name, stats in self._metrics.wait_time.items()
+                },
+            )
+
+    def run(self):
+        while True:
+            _, _, command = self._queue.get()
+            if command is _STOP:
+                return
+
+            with self._mutex:
+                if command.coalesce_key is not None:
+                    self._pending.pop(command.coalesce_key, None)
+                wait_time = time.monotonic() - command.submitted
+                self._metrics.wait_time[command.priority.name].add(wait_time)
+                self._metrics.executed += 1
+
+            if not command.future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                result = command.fn(*command.args, **command.kwargs)
+            except Exception as e:
+                logger.exception("Device command %s failed", command.fn)
+                command.future.set_exception(e)
+            else:
+                command.future.set_result(result)
+
+    @staticmethod
+    def _run_now(fn, *args, **kwargs) -> Future:
+        future = Future()
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
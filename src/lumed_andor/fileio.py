@@ -1,3 +1,4 @@
+import re
 from dataclasses import asdict
 from pathlib import Path
 
@@ -5,7 +6,8 @@ import tomli
 import tomli_w
 from dacite import from_dict
 
-from lumed_andor.andor_control import AndorSettings
+from lumed_andor.andor_control import AndorCamera, AndorSettings
+from lumed_andor.planner import TimingProfile, measure_timing_profile
 
 
 def export_setting(setting: AndorSettings, filepath: Path):
@@ -22,6 +24,40 @@ def import_setting(filepath: Path) -> AndorSettings:
     return andor_setting
 
 
+def export_timing_profile(profile: TimingProfile, filepath: Path):
+    export_dict = {"timing_profile": asdict(profile)}
+    with open(filepath, "wb") as fp:
+        tomli_w.dump(export_dict, fp)
+
+
+def import_timing_profile(filepath: Path) -> TimingProfile:
+    with open(filepath, "rb") as fp:
+        profile_dict = tomli.load(fp)["timing_profile"]
+
+    return from_dict(data_class=TimingProfile, data=profile_dict)
+
+
+def timing_profile_path(directory: Path, model: str, serial_number: int) -> Path:
+    """File of the timing profile of a head in the cache directory."""
+    name = re.sub(r"[^\w.-]+", "_", model.strip()) or "andor"
+    return Path(directory) / f"timing_{name}_{serial_number}.toml"
+
+
+def cached_timing_profile(camera: AndorCamera, directory: Path) -> TimingProfile:
+    """Timing profile of the connected head, measured once and then cached."""
+    capabilities = camera.get_capabilities()
+    filepath = timing_profile_path(
+        directory, capabilities.model, capabilities.serial_number
+    )
+    if filepath.exists():
+        return import_timing_profile(filepath)
+
+    profile = measure_timing_profile(camera)
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    export_timing_profile(profile, filepath)
+    return profile
+
+
 if __name__ == "__main__":
 
     s = AndorSettings()
@@ -0,0 +1,315 @@
+import functools
+import logging
+import multiprocessing
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from lumed_andor.acquisition import AcquisitionResult, AndorAcquisition, IntegrityReport
+from lumed_andor.andor_control import AndorCamera, AndorInfo, AndorSettings
+from lumed_andor.validation import validate_settings
+
+logger = logging.getLogger()
+
+
+@dataclass
+class CameraResult:
+    """Acquisition of one head, with the metadata needed to tell heads apart."""
+
+    camera_index: int
+    model: str = ""
+    serial_number: int = 0
+    data: np.ndarray | None = None
+    camera_info: AndorInfo = field(default_factory=AndorInfo)
+    camera_settings: AndorSettings = field(default_factory=AndorSettings)
+    integrity: IntegrityReport = field(default_factory=IntegrityReport)
+    start_time_ns: int = 0  # time.time_ns() at StartAcquisition
+    end_time_ns: int = 0
+
+
+@dataclass
+class MultiCameraResult:
+    results: list[CameraResult] = field(default_factory=list)
+
+    @property
+    def start_skew_ns(self) -> int:
+        """Spread of the StartAcquisition times of the heads."""
+        start_times = [result.start_time_ns for result in self.results]
+        return max(start_times) - min(start_times) if start_times else 0
+
+    @property
+    def is_complete(self) -> bool:
+        return all(result.integrity.is_complete for result in self.results)
+
+    def by_serial_number(self) -> dict[int, CameraResult]:
+        return {result.serial_number: result for result in self.results}
+
+    def stack(self) -> np.ndarray:
+        """(n_cameras, ...) array, the heads must share the same data shape."""
+        shapes = {result.data.shape for result in self.results}
+        if len(shapes) != 1:
+            raise ValueError(f"Cannot stack data of different shapes {shapes}")
+
+        return np.stack([result.data for result in self.results])
+
+
+class CameraWorker:
+    """Owns the AndorCamera of one head, inside a worker process."""
+
+    def __init__(self, camera_index: int, camera_factory, start_barrier):
+        self.camera_index: int = camera_index
+        self.camera: AndorCamera = camera_factory()
+        self.camera.select_camera(camera_index)
+        self.start_barrier = start_barrier
+        self._sent_result: AcquisitionResult | None = None
+
+    def release_sent_result(self) -> None:
+        # The data buffer goes back to the pool once it has been sent
+        if self._sent_result is not None:
+            self._sent_result.release()
+            self._sent_result = None
+
+    def connect(self) -> bool:
+        self.camera.connect()
+        return self.camera.is_connected
+
+    def disconnect(self) -> bool:
+        self.camera.disconnect()
+        return not self.camera.is_connected
+
+    def get_info(self) -> AndorInfo:
+        self.camera.get_info()
+        return self.camera.info
+
+    def apply_settings(self, settings: AndorSettings) -> int:
+        violations = validate_settings(settings, self.camera.info)
+        if violations:
+            raise ValueError(
+                "Invalid camera settings - " + "; ".join(map(str, violations))
+            )
+
+        return self.camera.apply_settings(settings)
+
+    def acquire(self) -> CameraResult:
+        acquisition = AndorAcquisition(self.camera)
+        acquisition.start_barrier = self.start_barrier
+        acquisition.run()
+
+        result = acquisition.result
+        self._sent_result = result
+        return CameraResult(
+            camera_index=self.camera_index,
+            model=result.camera_info.model,
+            serial_number=result.camera_info.serial_number,
+            data=result.data,
+            camera_info=result.camera_info,
+            camera_settings=result.camera_settings,
+            integrity=result.integrity,
+            start_time_ns=acquisition.start_time_ns,
+            end_time_ns=time.time_ns(),
+        )
+
+
+def serve_worker(worker_factory, connection) -> None:
+    """Command loop of a worker process.
+
+    Messages are (method name, args) tuples answered with ("ok", value) or
+    ("error", exception), None stops the loop. ("ok", None) is sent once the
+    worker is created.
+    """
+    try:
+        worker = worker_factory()
+    except Exception as e:
+        connection.send(("error", e))
+        return
+    connection.send(("ok", None))
+
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+
+        worker.release_sent_result()
+        name, args = message
+        try:
+            reply = ("ok", getattr(worker, name)(*args))
+        except Exception as e:
+            logger.exception("Camera %i - %s failed", worker.camera_index, name)
+            reply = ("error", e)
+        connection.send(reply)
+
+    if worker.camera.is_connected:
+        worker.disconnect()
+
+
+def _worker_main(camera_index, camera_factory, start_barrier, connection):
+    serve_worker(
+        functools.partial(CameraWorker, camera_index, camera_factory, start_barrier),
+        connection,
+    )
+
+
+class AndorCameraManager:
+    """Drives several heads concurrently, each from its own process.
+
+    The SDK selects one current camera per process and is not thread safe,
+    so heads sharing a process are serialized. Here every head gets a worker
+    process (SetCurrentCamera on its camera handle) and the manager only
+    exchanges commands and results with them: SDK calls, waits and data
+    transfers of the heads overlap.
+
+    Every call is sent to all the workers before any answer is awaited.
+    ``acquire`` starts the heads together: each worker arms its acquisition
+    then waits on a shared barrier right before StartAcquisition (software
+    synchronization, within a few ms; use an external trigger for tighter
+    synchronization).
+    """
+
+    def __init__(
+        self,
+        camera_indices=None,
+        camera_factory=AndorCamera,
+        start_timeout: float = 30.0,
+        mp_context: str = "spawn",
+    ):
+        if camera_indices is None:
+            camera_indices = range(self.available_cameras(camera_factory))
+
+        self.camera_indices: list[int] = list(camera_indices)
+        self.camera_factory = camera_factory
+        self.start_timeout: float = start_timeout
+        self._context = multiprocessing.get_context(mp_context)
+        self._processes: list = []
+        self._connections: list = []
+        self._start_barrier = None
+
+    @staticmethod
+    def available_cameras(camera_factory=AndorCamera) -> int:
+        # Allowed before any camera is initialized
+        return camera_factory().GetAvailableCameras()
+
+    def __enter__(self) -> "AndorCameraManager":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        if not self.camera_indices:
+            raise RuntimeError("No Andor camera available")
+
+        self._start_barrier = self._context.Barrier(
+            len(self.camera_indices), timeout=self.start_timeout
+        )
+        for camera_index in self.camera_indices:
+            connection, worker_connection = self._context.Pipe()
+            process = self._context.Process(
+                target=_worker_main,
+                args=(
+                    camera_index,
+                    self.camera_factory,
+                    self._start_barrier,
+                    worker_connection,
+                ),
+                name=f"andor-camera-{camera_index}",
+                daemon=True,
+            )
+            process.start()
+            # Only the worker holds its end: EOF as soon as it dies
+            worker_connection.close()
+            self._processes.append(process)
+            self._connections.append(connection)
+
+        self._receive_all("start")
+        logger.info("Started workers of cameras %s", self.camera_indices)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        for connection in self._connections:
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                logger.warning("Terminating %s", process.name)
+                process.terminate()
+
+        self._processes.clear()
+        self._connections.clear()
+
+    @staticmethod
+    def _receive(process, connection):
+        while not connection.poll(0.1):
+            if not process.is_alive():
+                raise EOFError
+        return connection.recv()
+
+    def _receive_all(self, name: str) -> list:
+        replies = []
+        for process, connection in zip(self._processes, self._connections):
+            try:
+                replies.append(self._receive(process, connection))
+            except (EOFError, OSError):
+                process.join(1)
+                replies.append(
+                    (
+                        "error",
+                        RuntimeError(
+                            f"{process.name} died (exit code {process.exitcode})"
+                        ),
+                    )
+                )
+
+        errors = {
+            camera_index: value
+            for camera_index, (status, value) in zip(self.camera_indices, replies)
+            if status == "error"
+        }
+        if errors:
+            if self._start_barrier is not None:
+                self._start_barrier.reset()
+            raise RuntimeError(f"{name} failed on cameras {errors}") from next(
+                iter(errors.values())
+            )
+
+        return [value for _, value in replies]
+
+    def call(self, name: str, *args) -> list:
+        """Calls a worker method on every head at once, results in camera order."""
+        for connection in self._connections:
+            connection.send((name, args))
+        return self._receive_all(name)
+
+    def connect(self) -> list[bool]:
+        return self.call("connect")
+
+    def disconnect(self) -> list[bool]:
+        return self.call("disconnect")
+
+    def get_info(self) -> dict[int, AndorInfo]:
+        return dict(zip(self.camera_indices, self.call("get_info")))
+
+    def apply_settings(
+        self, settings: AndorSettings | dict[int, AndorSettings]
+    ) -> list[int]:
+        """Same settings for every head, or a {camera_index: settings} dict."""
+        if isinstance(settings, AndorSettings):
+            return self.call("apply_settings", settings)
+
+        for camera_index, connection in zip(self.camera_indices, self._connections):
+            connection.send(("apply_settings", (settings[camera_index],)))
+        return self._receive_all("apply_settings")
+
+    def acquire(self) -> MultiCameraResult:
+        """Synchronized acquisition on every head."""
+        result = MultiCameraResult(self.call("acquire"))
+        logger.info(
+            "Acquired %i cameras, start skew %.3f ms",
+            len(result.results),
+            result.start_skew_ns / 1e6,
+        )
+        return result
@@ -0,0 +1,202 @@
+import logging
+import queue
+import time
+from copy import deepcopy
+from dataclasses import dataclass
+from threading import Semaphore, Thread
+
+from PyQt5.QtCore import pyqtSlot
+
+from lumed_andor.acquisition import AcquisitionResult, AndorAcquisition
+from lumed_andor.andor_control import AndorCamera
+
+logger = logging.getLogger()
+
+
+@dataclass
+class PipelineStats:
+    """Timings of a pipelined acquisition [s], summed over the repeats."""
+
+    repeats: int = 0  # acquisitions completed
+    processed: int = 0  # results handed back by the consumer
+    wall_time: float = 0.0
+    acquiring_time: float = 0.0  # from StartAcquisition to the last frame read
+    exposing_time: float = 0.0  # sensor exposed, from the actual exposure time
+    blocked_time: float = 0.0  # camera idle, every buffer held by the consumer
+    processing_time: float = 0.0  # in the consumer
+    max_pending: int = 0  # most results waiting for the consumer at once
+
+    @property
+    def duty_cycle(self) -> float:
+        """Fraction of the wall time the sensor spent exposing."""
+        return self.exposing_time / self.wall_time if self.wall_time > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.repeats} acquisitions in {self.wall_time:.3f} s, "
+            f"exposing {100 * self.duty_cycle:.1f}% of the time, "
+            f"acquiring {self.acquiring_time:.3f} s, "
+            f"blocked {self.blocked_time:.3f} s, "
+            f"processing {self.processing_time:.3f} s, "
+            f"max pending {self.max_pending}"
+        )
+
+
+class PipelinedAcquisition(AndorAcquisition):
+    """Repeats the acquisition while the previous results are processed.
+
+    The camera is re-armed as soon as the data of an acquisition has been
+    read. Each result is handed to ``consumer`` (e.g. saving or plotting) on
+    a separate thread, then released: its buffer goes back to the pool for
+    a following acquisition. At most ``n_buffers`` results are in flight,
+    when the consumer falls behind the camera waits for a buffer to be
+    released (back-pressure) instead of allocating more.
+
+    ``n_repeats`` acquisitions are run, 0 repeats until aborted. The
+    pipeline stops at the first incomplete acquisition (SDK error). The
+    consumer must not call the SDK nor keep the data after returning. Run
+    till abort is not supported, use the streaming of AndorAcquisition.
+    """
+
+    def __init__(
+        self,
+        camera: AndorCamera,
+        consumer=None,
+        n_repeats: int = 0,
+        n_buffers: int = 2,
+    ):
+        super().__init__(camera)
+        self.consumer = consumer
+        self.n_repeats: int = n_repeats
+        self.n_buffers: int = n_buffers
+        self.stats: PipelineStats = PipelineStats()
+
+        self.camera_info = camera.info
+        self._stop: bool = False
+
+    def get_camera_info(self):
+        # Read once per pipeline, not between repeats, to re-arm at once
+        self.result.camera_info = self.camera_info
+
+    def abort_acquisition(self):
+        self._stop = True
+        super().abort_acquisition()
+
+    @pyqtSlot()
+    def run(self):
+        settings = deepcopy(self.result.camera_settings)
+        if settings.acquisition_mode == 5:
+            logger.error("Run till abort cannot be pipelined")
+            self.signals.finished.emit(False)
+            return
+
+        self.camera.get_info()
+        self.camera_info = self.camera.info
+        exposure_time = self.exposure_time(settings)
+
+        self._stop = False
+        self.stats = PipelineStats()
+        buffers = Semaphore(self.n_buffers)
+        results = queue.Queue()
+        consumer = Thread(
+            target=self._consume,
+            args=(results, buffers),
+            name="andor-pipeline-consumer",
+            daemon=True,
+        )
+        consumer.start()
+
+        logger.info(
+            "Starting pipelined acquisition of %s repeats",
+            self.n_repeats or "unlimited",
+        )
+        start = time.perf_counter()
+        failed = False
+        try:
+            while not self._stop and (
+                self.n_repeats == 0 or self.stats.repeats < self.n_repeats
+            ):
+                if not self.wait_for_buffer(buffers):
+                    break
+
+                result = self.acquire_once(settings, exposure_time)
+                if result is None:
+                    buffers.release()
+                    failed = not self._stop
+                    break
+                results.put(result)
+                self.stats.max_pending = max(self.stats.max_pending, results.qsize())
+        finally:
+            results.put(None)
+            consumer.join()
+            self.stats.wall_time = time.perf_counter() - start
+
+        logger.info("Pipelined acquisition done - %s", self.stats)
+        self.signals.finished.emit(not failed)
+
+    def wait_for_buffer(self, buffers: Semaphore) -> bool:
+        """Back-pressure: waits for the consumer to free a buffer.
+
+        Returns False when aborted meanwhile.
+        """
+        start = time.perf_counter()
+        while not buffers.acquire(timeout=0.1):
+            if self._stop:
+                return False
+        self.stats.blocked_time += time.perf_counter() - start
+        return True
+
+    def exposure_time(self, settings) -> float:
+        """Time [s] the sensor is exposed per acquired image."""
+        if settings.acquisition_mode == 4:
+            fast_kinetics = settings.fast_kinetics
+            return fast_kinetics.series_length * self.camera.GetFKExposureTime() / 1000
+
+        exposure = self.camera_info.exposure_time / 1000
+        host_accumulation = settings.acquisition_mode == 2 and self.host_accumulation
+        if settings.acquisition_mode in (2, 3) and not host_accumulation:
+            exposure *= settings.number_accumulation
+        return exposure
+
+    def acquire_once(self, settings, exposure_time: float) -> AcquisitionResult | None:
+        """Runs one acquisition, None when it was aborted or failed."""
+        self.result = AcquisitionResult(
+            camera_info=self.camera_info, camera_settings=settings
+        )
+        for _ in self.frames():
+            pass
+        result = self.result
+        integrity = result.integrity
+
+        self.stats.acquiring_time += (time.time_ns() - self.start_time_ns) / 1e9
+        # Fast Kinetics: a single image holds the whole series
+        n_images = 1 if settings.acquisition_mode == 4 else integrity.acquired_frames
+        n_images = min(n_images, integrity.expected_frames)
+        self.stats.exposing_time += n_images * exposure_time
+
+        if not integrity.is_complete:
+            if not self._stop:
+                logger.error(
+                    "Pipelined acquisition stopped, incomplete acquisition - %s",
+                    integrity.summary(),
+                )
+            result.release()
+            return None
+
+        self.stats.repeats += 1
+        return result
+
+    def _consume(self, results: queue.Queue, buffers: Semaphore):
+        while (result := results.get()) is not None:
+            start = time.perf_counter()
+            try:
+                if self.consumer is not None:
+                    self.consumer(result)
+            except Exception:
+                logger.exception("Pipeline consumer failed")
+            finally:
+                result.release()
+                buffers.release()
+
+            self.stats.processing_time += time.perf_counter() - start
+            self.stats.processed += 1
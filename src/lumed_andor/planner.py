@@ -0,0 +1,339 @@
+import math
+from copy import deepcopy
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from lumed_andor.andor_control import (
+    READ_MODES,
+    AndorCamera,
+    AndorSettings,
+    ImageConfig,
+    ReadoutSpeeds,
+    acquisition_shape,
+)
+
+BYTES_PER_PIXEL = 4  # GetAcquiredData writes 32-bit integers
+
+
+@dataclass(kw_only=True)
+class TimingProfile:
+    """Readout timing model of a head, to plan acquisitions offline.
+
+    The readout time [ms] is modelled as::
+
+        row_factor * ypixels * vs_speed + pixel_factor * pixels / hs_speed
+        + readout_offset
+
+    with every sensor row shifted (vs_speed, [us]) and only the read pixels
+    digitized (hs_speed, [MHz]). The factors are fitted on readout times
+    measured on the head by measure_timing_profile.
+    """
+
+    model: str = ""
+    serial_number: int = 0
+    xpixels: int = 0
+    ypixels: int = 0
+    readout_speeds: ReadoutSpeeds = field(default_factory=ReadoutSpeeds)
+
+    row_factor: float = 1.0
+    pixel_factor: float = 1.0
+    readout_offset: float = 0.0  # [ms]
+    keep_clean_times: list = field(default_factory=list)  # [ms] per VS speed
+
+    def readout_time(self, settings: AndorSettings) -> float:
+        """Modelled readout time [ms] of settings."""
+        n_frames, height, width = acquisition_shape(settings, self.xpixels)
+        # Fast Kinetics reads every sub-frame stored under the mask at once
+        n_pixels = height * width * (n_frames if settings.acquisition_mode == 4 else 1)
+        vs_speed = self.readout_speeds.vs_speeds[settings.vs_speed_index]
+        hs_speed = self.readout_speeds.hs_speeds[settings.hs_speed_index]
+
+        return (
+            self.row_factor * self.ypixels * vs_speed / 1000
+            + self.pixel_factor * n_pixels / (hs_speed * 1000)
+            + self.readout_offset
+        )
+
+    def keep_clean_time(self, settings: AndorSettings) -> float:
+        """Modelled keep clean cycle time [ms] of settings."""
+        return self.keep_clean_times[settings.vs_speed_index]
+
+    def row_shift_time(self, settings: AndorSettings) -> float:
+        """Modelled time [ms] to shift one row."""
+        vs_speed = self.readout_speeds.vs_speeds[settings.vs_speed_index]
+        return self.row_factor * vs_speed / 1000
+
+
+@dataclass(kw_only=True)
+class AcquisitionPlan:
+    """Predicted timings and data rates of an acquisition."""
+
+    exposure_time: float = float("nan")  # [ms]
+    accumulate_cycle: float = float("nan")  # [ms]
+    kinetic_cycle: float = float("nan")  # [ms]
+    readout_time: float = float("nan")  # [ms]
+    keep_clean_time: float = float("nan")  # [ms]
+
+    n_frames: int = 0
+    frame_shape: tuple = (0, 0)  # (height, width)
+    frame_bytes: int = 0
+    frame_rate: float = float("nan")  # [frames/s]
+    duration: float = float("nan")  # [s], inf for Run till abort
+    total_bytes: float = float("nan")  # inf for Run till abort
+    bytes_per_second: float = float("nan")
+    source: str = ""  # "camera" or "profile"
+
+
+def plan_from_timings(
+    settings: AndorSettings,
+    xpixels: int,
+    timings: tuple[float, float, float],
+    readout_time: float,
+    keep_clean_time: float,
+) -> AcquisitionPlan:
+    """Plan of settings from its (exposure, accumulation, kinetic) timings [ms]."""
+    exposure, accumulate_cycle, kinetic_cycle = timings
+    n_frames, height, width = acquisition_shape(settings, xpixels)
+    mode = settings.acquisition_mode
+
+    # Time between the starts of two consecutive readouts [ms]
+    if mode == 1:
+        period = accumulate_cycle
+    elif mode == 2:
+        period = settings.number_accumulation * accumulate_cycle
+    elif mode == 4:  # the whole series is read at once
+        period = accumulate_cycle
+    else:
+        period = kinetic_cycle
+    frames_per_period = n_frames if mode == 4 else 1
+
+    plan = AcquisitionPlan(
+        exposure_time=exposure,
+        accumulate_cycle=accumulate_cycle,
+        kinetic_cycle=kinetic_cycle,
+        readout_time=readout_time,
+        keep_clean_time=keep_clean_time,
+        n_frames=n_frames,
+        frame_shape=(height, width),
+        frame_bytes=height * width * BYTES_PER_PIXEL,
+    )
+    plan.frame_rate = frames_per_period * 1000 / period if period > 0 else math.inf
+    plan.bytes_per_second = plan.frame_rate * plan.frame_bytes
+    if mode == 5:
+        plan.duration = math.inf
+        plan.total_bytes = math.inf
+    else:
+        plan.duration = n_frames / frames_per_period * period / 1000
+        plan.total_bytes = n_frames * plan.frame_bytes
+
+    return plan
+
+
+def model_timings(
+    settings: AndorSettings,
+    readout_time: float,
+    keep_clean_time: float,
+    row_shift_time: float = 0.0,
+) -> tuple[float, float, float]:
+    """Exposure, accumulation and kinetic cycle times [ms] as the SDK sets them.
+
+    Cycle times shorter than exposure, readout and keep clean are extended,
+    Fast Kinetics exposures are rounded up to whole sub-area shifts of
+    ``row_shift_time`` [ms] per row.
+    """
+    if settings.acquisition_mode == 4:
+        fast_kinetics = settings.fast_kinetics
+        exposure = fast_kinetics.exposure_time
+        shift = fast_kinetics.exposed_rows * row_shift_time
+        if shift > 0:
+            exposure = max(math.ceil(exposure / shift - 1e-9), 1) * shift
+        cycle = fast_kinetics.series_length * exposure + readout_time
+        return exposure, cycle, cycle
+
+    exposure = settings.target_exposure_time
+    scan = exposure + readout_time + keep_clean_time
+    accumulate_cycle = max(settings.target_accumulation_time, scan)
+    n_accumulations = (
+        settings.number_accumulation if settings.acquisition_mode in (2, 3) else 1
+    )
+    kinetic_cycle = max(
+        settings.target_kinetic_time, n_accumulations * accumulate_cycle
+    )
+    return exposure, accumulate_cycle, kinetic_cycle
+
+
+def measure_timing_profile(camera: AndorCamera) -> TimingProfile:
+    """Fits the TimingProfile of the connected head.
+
+    The readout time is read for FVB and full image at every HS and VS
+    speed, and the keep clean time at every VS speed. The camera settings
+    are restored afterwards. Not to be called during an acquisition.
+    """
+    capabilities = camera.get_capabilities()
+    speeds = capabilities.readout_speeds
+    profile = TimingProfile(
+        model=capabilities.model,
+        serial_number=capabilities.serial_number,
+        xpixels=capabilities.xpixels,
+        ypixels=capabilities.ypixels,
+        readout_speeds=speeds,
+    )
+
+    with camera._mutex:
+        previous = deepcopy(camera.get_settings())
+        settings = deepcopy(previous)
+        settings.acquisition_mode = 1
+        settings.image_config = ImageConfig(hend=profile.xpixels, vend=profile.ypixels)
+
+        rows, times = [], []
+        try:
+            for vs_index, vs_speed in enumerate(speeds.vs_speeds):
+                settings.vs_speed_index = vs_index
+                for hs_index, hs_speed in enumerate(speeds.hs_speeds):
+                    settings.hs_speed_index = hs_index
+                    for read_mode, n_rows in ((0, 1), (4, profile.ypixels)):
+                        settings.read_mode = read_mode
+                        camera.apply_settings(settings)
+                        n_pixels = n_rows * profile.xpixels
+                        rows.append(
+                            (
+                                profile.ypixels * vs_speed / 1000,
+                                n_pixels / (hs_speed * 1000),
+                                1.0,
+                            )
+                        )
+                        times.append(camera.GetReadOutTime())
+                profile.keep_clean_times.append(camera.GetKeepCleanTime())
+        finally:
+            camera.apply_settings(previous)
+
+    if rows:
+        coefficients, *_ = np.linalg.lstsq(np.array(rows), np.array(times), rcond=None)
+        profile.row_factor, profile.pixel_factor, profile.readout_offset = (
+            float(c) for c in coefficients
+        )
+
+    return profile
+
+
+class AcquisitionPlanner:
+    """Predicts frame rates, durations and data rates of candidate settings.
+
+    With a connected ``camera``, the settings are applied in turn to read
+    the timings the SDK actually sets (GetAcquisitionTimings,
+    GetReadOutTime, GetKeepCleanTime), then the camera settings are
+    restored: plans must not be made during an acquisition. Without camera,
+    the timings are modelled from the ``profile`` of the head.
+    """
+
+    def __init__(
+        self, camera: AndorCamera | None = None, profile: TimingProfile | None = None
+    ):
+        if camera is None and profile is None:
+            raise ValueError("A camera or a timing profile is required")
+
+        self.camera: AndorCamera | None = camera
+        self.profile: TimingProfile | None = profile
+
+    @property
+    def is_offline(self) -> bool:
+        return self.camera is None or not self.camera.is_connected
+
+    def plan(self, settings: AndorSettings) -> AcquisitionPlan:
+        if self.is_offline:
+            return self._model(settings)
+        return self._query(settings)
+
+    def _model(self, settings: AndorSettings) -> AcquisitionPlan:
+        if self.profile is None:
+            raise ValueError("The camera is not connected and there is no profile")
+
+        readout_time = self.profile.readout_time(settings)
+        keep_clean_time = self.profile.keep_clean_time(settings)
+        plan = plan_from_timings(
+            settings,
+            self.profile.xpixels,
+            model_timings(
+                settings,
+                readout_time,
+                keep_clean_time,
+                self.profile.row_shift_time(settings),
+            ),
+            readout_time,
+            keep_clean_time,
+        )
+        plan.source = "profile"
+        return plan
+
+    def _query(self, settings: AndorSettings) -> AcquisitionPlan:
+        camera = self.camera
+        with camera._mutex:
+            previous = deepcopy(camera.get_settings())
+            try:
+                camera.apply_settings(settings)
+                timings = camera.GetAcquisitionTimings()
+                if settings.acquisition_mode == 4:
+                    exposure = camera.GetFKExposureTime()
+                    timings = (exposure, timings[1], timings[2])
+                readout_time = camera.GetReadOutTime()
+                keep_clean_time = camera.GetKeepCleanTime()
+            finally:
+                camera.apply_settings(previous)
+
+        plan = plan_from_timings(
+            settings,
+            camera.get_capabilities().xpixels,
+            timings,
+            readout_time,
+            keep_clean_time,
+        )
+        plan.source = "camera"
+        return plan
+
+    def rank(
+        self, candidates: dict[str, AndorSettings], key: str = "frame_rate"
+    ) -> list[tuple[str, AcquisitionPlan]]:
+        """Plans of the named candidates, highest ``key`` (throughput) first."""
+        plans = [(name, self.plan(settings)) for name, settings in candidates.items()]
+        return sorted(plans, key=lambda item: getattr(item[1], key), reverse=True)
+
+
+def read_mode_alternatives(
+    settings: AndorSettings, binnings=(1, 2, 4)
+) -> dict[str, AndorSettings]:
+    """Copies of settings in every read mode, image mode at several binnings.
+
+    Tracks are those configured in settings, the image area is cut down to
+    a whole number of bins. Fast Kinetics settings have no alternative.
+    """
+    if settings.acquisition_mode == 4:
+        return {}
+
+    candidates = {}
+    for read_mode, name in READ_MODES.items():
+        if read_mode == 4:
+            continue
+        candidate = deepcopy(settings)
+        candidate.read_mode = read_mode
+        candidates[name] = candidate
+
+    image_config = settings.image_config
+    width = image_config.hend - image_config.hstart + 1
+    height = image_config.vend - image_config.vstart + 1
+    for binning in binnings:
+        if binning > min(width, height):
+            continue
+        candidate = deepcopy(settings)
+        candidate.read_mode = 4
+        candidate.image_config = ImageConfig(
+            hbin=binning,
+            vbin=binning,
+            hstart=image_config.hstart,
+            hend=image_config.hstart + width // binning * binning - 1,
+            vstart=image_config.vstart,
+            vend=image_config.vstart + height // binning * binning - 1,
+        )
+        candidates[f"{READ_MODES[4]} {binning}x{binning}"] = candidate
+
+    return candidates
@@ -0,0 +1,112 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from lumed_andor.andor_control import AndorSettings, ReadoutSpeeds
+
+
+@dataclass(kw_only=True)
+class ReadoutChoice:
+    hs_speed_index: int = 0
+    vs_speed_index: int = 0
+    vs_amplitude: int = 0
+    preamp_gain_index: int = 0
+
+    hs_speed: float = float("nan")  # [MHz]
+    vs_speed: float = float("nan")  # row shift time [us]
+    preamp_gain: float = float("nan")
+    read_noise: float = float("nan")  # [e- rms], when known
+
+
+def fastest_readout(
+    speeds: ReadoutSpeeds,
+    read_noise=None,
+    max_read_noise: float | None = None,
+    min_gain: float | None = None,
+    max_gain: float | None = None,
+    min_vs_speed: float | None = None,
+    vs_amplitude: int = 0,
+) -> ReadoutChoice:
+    """Fastest HS/VS speeds and pre-amp gain meeting the noise and gain targets.
+
+    The SDK does not report the read noise: ``read_noise`` [e- rms] comes
+    from the performance sheet of the head or a measurement, either one
+    value per HS speed or a (HS speeds, pre-amp gains) table, and is
+    required with ``max_read_noise``. Gains are pre-amp gain factors, the
+    VS speed is the fastest row shift not shorter than ``min_vs_speed`` [us]
+    (slower shifts improve the charge transfer efficiency), by default the
+    fastest recommended one. Faster shifts are unreliable at the Normal VS
+    clock voltage: they are only chosen when ``vs_amplitude`` (index of a
+    raised voltage, see ReadoutSpeeds.n_vs_amplitudes) is given, the choice
+    then carries it.
+
+    Only the gains available at each HS speed are considered. Among the
+    gains allowed at the fastest HS speed, the one with the lowest read
+    noise is chosen, then the lowest gain (largest dynamic range).
+    Raises ValueError when no combination meets the targets.
+    """
+    hs_speeds = np.asarray(speeds.hs_speeds, dtype=float)
+    vs_speeds = np.asarray(speeds.vs_speeds, dtype=float)
+    gains = np.asarray(speeds.preamp_gains, dtype=float)
+    if not (len(hs_speeds) and len(vs_speeds) and len(gains)):
+        raise ValueError("The readout speeds of the head are unknown")
+
+    if read_noise is None:
+        if max_read_noise is not None:
+            raise ValueError("max_read_noise needs the read noise of the speeds")
+        noise = np.full((len(hs_speeds), len(gains)), np.nan)
+    else:
+        noise = np.asarray(read_noise, dtype=float).reshape(len(hs_speeds), -1)
+        noise = np.broadcast_to(noise, (len(hs_speeds), len(gains)))
+
+    allowed = np.ones(noise.shape, dtype=bool)
+    if speeds.preamp_gain_available:
+        allowed &= np.asarray(speeds.preamp_gain_available, dtype=bool)
+    if max_read_noise is not None:
+        allowed &= noise <= max_read_noise
+    if min_gain is not None:
+        allowed &= gains >= min_gain
+    if max_gain is not None:
+        allowed &= gains <= max_gain
+
+    recommended_vs_speed = vs_speeds[speeds.recommended_vs_speed_index]
+    if min_vs_speed is None:
+        min_vs_speed = 0.0 if vs_amplitude else recommended_vs_speed
+    elif not vs_amplitude:
+        min_vs_speed = max(min_vs_speed, recommended_vs_speed)
+
+    vs_allowed = np.flatnonzero(vs_speeds >= min_vs_speed)
+    if not allowed.any() or not len(vs_allowed):
+        raise ValueError("No readout speed and gain combination meets the targets")
+
+    # Sort keys, last is primary: fastest HS, lowest noise, lowest gain
+    hs_index, gain_index = np.nonzero(allowed)
+    order = np.lexsort(
+        (
+            gains[gain_index],
+            np.nan_to_num(noise[hs_index, gain_index], nan=0.0),
+            -hs_speeds[hs_index],
+        )
+    )
+    hs_index, gain_index = int(hs_index[order[0]]), int(gain_index[order[0]])
+    vs_index = int(vs_allowed[np.argmin(vs_speeds[vs_allowed])])
+
+    return ReadoutChoice(
+        hs_speed_index=hs_index,
+        vs_speed_index=vs_index,
+        # Only raised for the shifts faster than recommended
+        vs_amplitude=vs_amplitude if vs_speeds[vs_index] < recommended_vs_speed else 0,
+        preamp_gain_index=gain_index,
+        hs_speed=float(hs_speeds[hs_index]),
+        vs_speed=float(vs_speeds[vs_index]),
+        preamp_gain=float(gains[gain_index]),
+        read_noise=float(noise[hs_index, gain_index]),
+    )
+
+
+def apply_readout_choice(settings: AndorSettings, choice: ReadoutChoice) -> None:
+    """Sets the speed, VS amplitude and gain indices of the choice in settings."""
+    settings.hs_speed_index = choice.hs_speed_index
+    settings.vs_speed_index = choice.vs_speed_index
+    settings.vs_amplitude = choice.vs_amplitude
+    settings.preamp_gain_index = choice.preamp_gain_index
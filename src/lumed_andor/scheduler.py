@@ -0,0 +1,352 @@
+import logging
+import time
+from concurrent.futures import CancelledError, Future
+from copy import deepcopy
+from dataclasses import dataclass, field
+
+from lumed_andor.acquisition import AcquisitionResult, AndorAcquisition
+from lumed_andor.andor_control import (
+    TEMPERATURE_STABILIZED_CODE,
+    AndorCamera,
+    AndorSettings,
+    settings_changes,
+)
+from lumed_andor.device_actor import CommandPriority, DeviceActor
+from lumed_andor.planner import (
+    AcquisitionPlanner,
+    TimingProfile,
+    model_timings,
+    plan_from_timings,
+)
+from lumed_andor.validation import validate_settings
+
+logger = logging.getLogger()
+
+MODE_SETTERS = ("SetAcquisitionMode", "SetReadMode", "SetTriggerMode")
+GEOMETRY_SETTERS = (
+    "SetImage",
+    "SetSingleTrack",
+    "SetMultiTrack",
+    "SetRandomTracks",
+    "SetFastKineticsEx",
+)
+
+
+@dataclass(kw_only=True)
+class BatchJob:
+    """Settings of one acquisition of a batch.
+
+    ``after`` holds the names of the jobs that must be acquired before this
+    one, the other jobs can be reordered freely.
+    """
+
+    settings: AndorSettings
+    name: str = ""
+    after: list = field(default_factory=list)
+
+
+@dataclass(kw_only=True)
+class TransitionCosts:
+    """Estimated durations [s] of the settings changes between two jobs."""
+
+    temperature_settle: float = 120.0  # stabilization after a new target
+    temperature_rate: float = 2.0  # [s/°C] to reach the new target
+    mode: float = 0.5  # acquisition, read or trigger mode switch
+    geometry: float = 0.2  # image area, tracks or Fast Kinetics geometry
+    setter: float = 0.01  # any other setter call
+
+    def cost(self, current: AndorSettings, target: AndorSettings) -> float:
+        cost = 0.0
+        for name in settings_changes(current, target):
+            if name == "SetTemperature":
+                delta = abs(target.target_temperature - current.target_temperature)
+                cost += self.temperature_settle + self.temperature_rate * delta
+            elif name in MODE_SETTERS:
+                cost += self.mode
+            elif name in GEOMETRY_SETTERS:
+                cost += self.geometry
+            else:
+                cost += self.setter
+        return cost
+
+
+@dataclass(kw_only=True)
+class JobResult:
+    job: BatchJob
+    position: int  # in the schedule
+    result: AcquisitionResult | None = None
+    error: Exception | None = None
+    estimated_time: float = 0.0  # [s] settings changes and acquisition
+    actual_time: float = 0.0  # [s]
+
+
+@dataclass
+class BatchReport:
+    n_jobs: int = 0
+    completed: int = 0
+    failed: int = 0
+    estimated_transition_time: float = 0.0  # [s]
+    estimated_time: float = 0.0  # [s]
+    actual_time: float = 0.0  # [s]
+
+    def __str__(self) -> str:
+        return (
+            f"{self.completed} of {self.n_jobs} jobs ({self.failed} failed), "
+            f"estimated {self.estimated_time:.1f} s "
+            f"({self.estimated_transition_time:.1f} s of settings changes), "
+            f"actual {self.actual_time:.1f} s"
+        )
+
+
+class BatchScheduler:
+    """Runs a batch of acquisitions ordered to minimize reconfiguration.
+
+    The jobs are ordered greedily, each next job being the one cheapest to
+    reach from the current settings (TransitionCosts) among those whose
+    ``after`` jobs are done, then single jobs are moved while it lowers the
+    total cost. Jobs sharing a temperature, read mode and geometry thus end
+    up back to back.
+
+    The jobs are run in that order on the DeviceActor thread, one command
+    each: settings applied, temperature stabilization awaited when its
+    target changed and the cooler is on, then the acquisition. Results are
+    yielded as they complete, each must be released by the caller. A job
+    whose settings failed to apply or whose acquisition is incomplete has
+    its ``error`` set, along the partial result in the latter case. The jobs
+    not run yet are cancelled when the iteration stops early.
+
+    Acquisition times are estimated with ``profile`` (see planner) when
+    given, from the exposure and cycle times only otherwise.
+    """
+
+    def __init__(
+        self,
+        camera: AndorCamera,
+        costs: TransitionCosts | None = None,
+        profile: TimingProfile | None = None,
+        temperature_timeout: float = 900.0,
+        poll_interval: float = 1.0,
+    ):
+        self.camera: AndorCamera = camera
+        self.costs: TransitionCosts = costs if costs is not None else TransitionCosts()
+        self.planner: AcquisitionPlanner | None = (
+            AcquisitionPlanner(profile=profile) if profile is not None else None
+        )
+        self.wait_temperature: bool = True
+        self.temperature_timeout: float = temperature_timeout  # [s]
+        self.poll_interval: float = poll_interval  # [s]
+
+        self.report: BatchReport = BatchReport()
+        self._cancelled: bool = False
+        self._futures: list[Future] = []
+        self._acquisition: AndorAcquisition | None = None
+
+    ## Scheduling
+
+    @staticmethod
+    def _predecessors(jobs: list[BatchJob]) -> list[set[int]]:
+        indices = {}
+        for i, job in enumerate(jobs):
+            indices.setdefault(job.name, set()).add(i)
+
+        predecessors = []
+        for job in jobs:
+            unknown = [name for name in job.after if name not in indices]
+            if unknown:
+                raise ValueError(f"Job {job.name!r} runs after unknown jobs {unknown}")
+            predecessors.append(set().union(*(indices[name] for name in job.after)))
+        return predecessors
+
+    def schedule(
+        self, jobs: list[BatchJob], current: AndorSettings | None = None
+    ) -> list[BatchJob]:
+        """Jobs in execution order, starting from the ``current`` settings."""
+        if current is None:
+            current = self.camera.get_settings()
+
+        n_jobs = len(jobs)
+        predecessors = self._predecessors(jobs)
+        # costs[i][j]: from job i (n_jobs: the current settings) to job j
+        settings = [job.settings for job in jobs] + [current]
+        costs = [[self.costs.cost(a, b) for b in settings[:n_jobs]] for a in settings]
+
+        def total(order: list[int]) -> float:
+            return sum(costs[i][j] for i, j in zip([n_jobs] + order, order))
+
+        def is_valid(order: list[int]) -> bool:
+            position = {j: k for k, j in enumerate(order)}
+            return all(
+                position[i] < position[j] for j in order for i in predecessors[j]
+            )
+
+        # Greedy: cheapest next job among the ready ones
+        order, done, last = [], set(), n_jobs
+        while len(order) < n_jobs:
+            ready = [
+                j for j in range(n_jobs) if j not in done and predecessors[j] <= done
+            ]
+            if not ready:
+                raise ValueError("The job ordering constraints are cyclic")
+            last = min(ready, key=lambda j: (costs[last][j], j))
+            order.append(last)
+            done.add(last)
+
+        # Improvement: move single jobs while the total cost decreases
+        best = total(order)
+        improved = True
+        while improved:
+            improved = False
+            for k in range(n_jobs):
+                for position in range(n_jobs):
+                    if position == k:
+                        continue
+                    candidate = order[:k] + order[k + 1 :]
+                    candidate.insert(position, order[k])
+                    cost = total(candidate)
+                    if cost < best - 1e-9 and is_valid(candidate):
+                        order, best, improved = candidate, cost, True
+
+        return [jobs[j] for j in order]
+
+    def acquisition_time(self, settings: AndorSettings) -> float:
+        """Estimated duration [s] of the acquisition alone."""
+        if self.planner is not None:
+            return self.planner.plan(settings).duration
+
+        timings = model_timings(settings, 0.0, 0.0)
+        xpixels = self.camera.info.xpixels
+        return plan_from_timings(settings, xpixels, timings, 0.0, 0.0).duration
+
+    def estimate(
+        self, jobs: list[BatchJob], current: AndorSettings | None = None
+    ) -> list[tuple[float, float]]:
+        """(settings changes, acquisition) times [s] of the jobs in order."""
+        if current is None:
+            current = self.camera.get_settings()
+
+        estimates = []
+        for job in jobs:
+            transition = self.costs.cost(current, job.settings)
+            estimates.append((transition, self.acquisition_time(job.settings)))
+            current = job.settings
+        return estimates
+
+    ## Execution
+
+    def run(self, jobs: list[BatchJob], actor: DeviceActor):
+        """Schedules and runs the jobs, yields a JobResult per job in order."""
+        for job in jobs:
+            if job.settings.acquisition_mode == 5:
+                raise ValueError(f"Job {job.name!r} runs till abort")
+
+        current = deepcopy(self.camera.get_settings())
+        ordered = self.schedule(jobs, current)
+        times = self.estimate(ordered, current)
+        estimates = [transition + acquisition for transition, acquisition in times]
+        self.report = BatchReport(
+            n_jobs=len(ordered),
+            estimated_transition_time=sum(transition for transition, _ in times),
+            estimated_time=sum(estimates),
+        )
+        logger.info(
+            "Batch of %i jobs scheduled, estimated %.1f s",
+            len(ordered),
+            self.report.estimated_time,
+        )
+
+        self._cancelled = False
+        self._futures = [
+            actor.submit(self._run_job, job, priority=CommandPriority.ACQUISITION)
+            for job in ordered
+        ]
+
+        start = time.perf_counter()
+        try:
+            for position, (job, future, estimate) in enumerate(
+                zip(ordered, self._futures, estimates)
+            ):
+                job_result = JobResult(
+                    job=job, position=position, estimated_time=estimate
+                )
+                try:
+                    job_result.result, job_result.actual_time = future.result()
+                except CancelledError:
+                    break
+                except Exception as e:
+                    job_result.error = e
+                else:
+                    # The acquisition logs SDK errors instead of raising them
+                    integrity = job_result.result.integrity
+                    if not integrity.is_complete:
+                        job_result.error = RuntimeError(
+                            f"Incomplete acquisition - {integrity.summary()}"
+                        )
+
+                if job_result.error is None:
+                    self.report.completed += 1
+                else:
+                    self.report.failed += 1
+                yield job_result
+        finally:
+            # The consumer stopped early or a job was cancelled: the queued
+            # jobs must not keep the device thread busy
+            self.cancel()
+            self.report.actual_time = time.perf_counter() - start
+            logger.info("Batch done - %s", self.report)
+
+    def cancel(self) -> None:
+        """Cancels the pending jobs and aborts the running acquisition."""
+        self._cancelled = True
+        for future in self._futures:
+            future.cancel()
+        if self._acquisition is not None:
+            self._acquisition.abort_acquisition()
+
+    def _run_job(self, job: BatchJob) -> tuple[AcquisitionResult, float]:
+        """Runs on the device thread."""
+        start = time.perf_counter()
+        camera = self.camera
+        violations = validate_settings(job.settings, camera.info)
+        if violations:
+            raise ValueError(
+                f"Invalid settings for job {job.name!r} - "
+                + "; ".join(map(str, violations))
+            )
+
+        temperature_changed = (
+            job.settings.target_temperature != camera.target_temperature
+        )
+        acquisition = AndorAcquisition(camera)
+        acquisition.apply_settings(job.settings)
+        if acquisition.result.integrity.failed_calls:
+            raise RuntimeError(
+                f"Settings of job {job.name!r} not applied - "
+                + ", ".join(acquisition.result.integrity.failed_calls)
+            )
+        if self.wait_temperature and temperature_changed and camera.IsCoolerOn():
+            self._wait_temperature_stable()
+
+        self._acquisition = acquisition
+        try:
+            acquisition.run()
+        finally:
+            self._acquisition = None
+
+        return acquisition.result, time.perf_counter() - start
+
+    def _wait_temperature_stable(self) -> None:
+        deadline = time.monotonic() + self.temperature_timeout
+        while not self._cancelled:
+            temperature, status = self.camera.get_temperature_status()
+            if status.code == TEMPERATURE_STABILIZED_CODE:
+                return
+            if time.monotonic() > deadline:
+                logger.warning(
+                    "Temperature not stabilized after %.0f s - %i - %s",
+                    self.temperature_timeout,
+                    temperature,
+                    status.message,
+                )
+                return
+            logger.debug("Temperature %i - %s", temperature, status.message)
+            time.sleep(self.poll_interval)
@@ -0,0 +1,1003 @@
+import ctypes
+import functools
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from threading import Condition
+
+import numpy as np
+
+from lumed_andor.andor_control import (
+    ACQUIRING_CODE,
+    NO_NEW_DATA_CODE,
+    SUCCESS_CODE,
+    FastKineticsConfig,
+    MultiTrack,
+    RandomTrack,
+    SingleTrack,
+    fast_kinetics_shape,
+)
+from lumed_andor.binning import (
+    multi_track_layout,
+    multi_track_rows,
+    random_track_rows,
+    single_track_rows,
+)
+
+logger = logging.getLogger()
+
+IDLE_CODE = 20073
+NOT_INITIALIZED_CODE = 20075
+P1_INVALID_CODE = 20066
+P2_INVALID_CODE = 20067
+P3_INVALID_CODE = 20068
+P4_INVALID_CODE = 20069
+TEMPERATURE_OFF_CODE = 20034
+TEMPERATURE_NOT_STABILIZED_CODE = 20035
+TEMPERATURE_STABILIZED_CODE = 20036
+TEMPERATURE_NOT_REACHED_CODE = 20037
+
+# Series length standing for "till abort"
+_UNBOUNDED = 2**31 - 1
+
+# Functions answering before Initialize
+_UNINITIALIZED_FUNCTIONS = frozenset(
+    ("GetAvailableCameras", "GetCameraHandle", "SetCurrentCamera", "Initialize")
+)
+
+
+def _value(arg):
+    """Plain value of a ctypes (or Python) argument."""
+    return getattr(arg, "value", arg)
+
+
+def _set(pointer, value) -> None:
+    """Writes an output argument passed with ctypes.byref."""
+    pointer._obj.value = value
+
+
+def _sdk_function(fn):
+    """Counts the calls, returns injected errors and DRV_NOT_INITIALIZED."""
+
+    @functools.wraps(fn)
+    def wrapper(self, *args):
+        name = fn.__name__
+        with self._condition:
+            self.calls[name] = self.calls.get(name, 0) + 1
+            code = self._injected_error(name)
+            if code is None and not self.initialized:
+                if name not in _UNINITIALIZED_FUNCTIONS:
+                    code = NOT_INITIALIZED_CODE
+        if code is not None:
+            return code
+        return fn(self, *args)
+
+    return wrapper
+
+
+@dataclass(kw_only=True)
+class SpectralLine:
+    position: float  # fraction of the sensor width
+    width: float = 2.0  # gaussian sigma [pixels]
+    intensity: float = 2000.0  # peak [counts/s]
+
+
+@dataclass(kw_only=True)
+class Fiber:
+    position: float  # fraction of the sensor height
+    width: float = 3.0  # gaussian sigma [rows]
+    transmission: float = 1.0
+
+
+@dataclass(kw_only=True)
+class SimulatedCameraConfig:
+    """Detector, timing and scene of a SimulatedLibAndor.
+
+    Times are in simulated seconds unless stated otherwise. ``speed`` is the
+    number of simulated seconds per real second: with ``speed=100`` a 1 s
+    exposure lasts 10 ms and the cooler reaches its target 100 times faster.
+    """
+
+    speed: float = 1.0
+    n_cameras: int = 1
+
+    # Detector
+    model: str = "DU420_BEX2_DD (simulated)"
+    serial_number: int = 10000
+    xpixels: int = 1024
+    ypixels: int = 256
+    min_temperature: int = -100
+    max_temperature: int = 20
+    circular_buffer_size: int = 64  # images
+
+    # Readout timing model
+    hs_speeds: tuple[float, ...] = (3.0, 1.0, 0.05)  # [MHz]
+    vs_speeds: tuple[float, ...] = (8.25, 16.25, 32.25)  # row shift [us]
+    preamp_gains: tuple[float, ...] = (1.0, 2.0, 4.0)
+    recommended_vs_speed: int = 1  # index selected at initialization
+    n_vs_amplitudes: int = 5  # Normal, +1 V to +4 V
+    # (hs speed index, pre-amp gain index) combinations not available
+    unavailable_gains: tuple[tuple[int, int], ...] = ((0, 2),)
+    initialize_time: float = 2.0
+
+    # Cooling curve: first order towards the target (cooler on) or ambient
+    ambient_temperature: float = 20.0
+    cooling_time_constant: float = 30.0
+    stabilization_time: float = 10.0  # within 1 °C before being stabilized
+
+    # Scene: spectral lines over a continuum, seen through fibers
+    lines: list[SpectralLine] = field(
+        default_factory=lambda: [
+            SpectralLine(position=0.25),
+            SpectralLine(position=0.5, width=4.0, intensity=5000.0),
+            SpectralLine(position=0.8, intensity=1000.0),
+        ]
+    )
+    continuum: float = 200.0  # [counts/s]
+    fibers: list[Fiber] = field(
+        default_factory=lambda: [
+            Fiber(position=0.3),
+            Fiber(position=0.5),
+            Fiber(position=0.7, transmission=0.8),
+        ]
+    )
+    dark_current: float = 0.5  # [counts/s/pixel]
+    bias: float = 300.0  # [counts per read value]
+    read_noise: float = 4.0  # [counts rms]
+    noise_frames: int = 8  # distinct noise realizations cycled over frames
+    seed: int = 0
+
+
+class SimulatedLibAndor:
+    """Pure Python stand-in for libandor.so, for use without camera.
+
+    Implements every SDK function wrapped by AndorCamera, with the argument
+    conventions of the ctypes calls::
+
+        camera = AndorCamera(lib=SimulatedLibAndor(SimulatedCameraConfig(speed=50)))
+
+    Acquisitions follow the exposure, readout and cycle times of the timing
+    model on a simulated clock running ``speed`` times faster than real
+    time. Data is the synthetic scene binned like the camera would (read
+    modes, image binning, accumulations, fast kinetics) with shot and read
+    noise. Frames are copied from a few precomputed noise realizations, so
+    producing them costs about a memcpy.
+
+    Errors can be injected on any function with ``inject_error``. ``calls``
+    counts the calls of every function.
+    """
+
+    def __init__(self, config: SimulatedCameraConfig | None = None):
+        self.config: SimulatedCameraConfig = (
+            config if config is not None else SimulatedCameraConfig()
+        )
+        self.calls: dict[str, int] = {}
+
+        self._condition: Condition = Condition()
+        self._rng: np.random.Generator = np.random.default_rng(self.config.seed)
+        self._injected: dict[str, list[list[int]]] = {}
+        self._real_origin: float = time.monotonic()
+        self._scene: np.ndarray = self._make_scene()
+
+        self.current_camera: int = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        config = self.config
+        self.initialized: bool = False
+
+        # Settings, as after Initialize
+        self.acquisition_mode: int = 1
+        self.read_mode: int = 4
+        self.trigger_mode: int = 0
+        self.exposure_time: float = 0.01  # [s]
+        self.accumulation_cycle_time: float = 0.0
+        self.kinetic_cycle_time: float = 0.0
+        self.number_accumulations: int = 1
+        self.number_kinetics: int = 1
+        self.image = (1, 1, 1, config.xpixels, 1, config.ypixels)
+        self.single_track = (config.ypixels // 2, 1)
+        self.multi_track = (1, config.ypixels, 0, 1, 0)
+        self.random_tracks: tuple[int, ...] = (1, config.ypixels)
+        self.fast_kinetics: FastKineticsConfig = FastKineticsConfig()
+        self.hs_speed: int = 0
+        self.vs_speed: int = config.recommended_vs_speed
+        self.vs_amplitude: int = 0
+        self.preamp_gain: int = 0
+        self.shutter = (1, 0, 0, 0)
+
+        # Cooling
+        self.target_temperature: int = config.max_temperature
+        self.cooler_on: bool = False
+        self._temperature: float = config.ambient_temperature
+        self._temperature_time: float = self._now()
+        self._stable_since: float | None = None
+
+        # Acquisition
+        self._acquiring: bool = False
+        self._start_time: float = 0.0
+        self._period: float = 1.0  # between images
+        self._n_images: int = 0  # of the acquisition
+        self._n_done: int = 0  # frozen once idle
+        self._n_read: int = 0  # last image read (GetNumberNewImages)
+        self._n_waited: int = 0  # last image reported by WaitForAcquisition
+        self._cancel_wait: bool = False
+        self._bank: np.ndarray | None = None
+        self._bank_key: tuple | None = None
+        self._bank_offset: int = 0  # continues the bank across acquisitions
+
+    ## Simulated clock
+
+    def _now(self) -> float:
+        return (time.monotonic() - self._real_origin) * self.config.speed
+
+    def _wait(self, duration: float) -> None:
+        """Waits ``duration`` simulated seconds, woken up by notify_all."""
+        self._condition.wait(max(duration, 0) / self.config.speed)
+
+    ## Error injection
+
+    def inject_error(self, function: str, code: int, count: int = 1, after: int = 0):
+        """Makes the next ``count`` calls of ``function`` return ``code``.
+
+        The first ``after`` calls still succeed. The function is not executed
+        when its call fails.
+        """
+        with self._condition:
+            self._injected.setdefault(function, []).append([after, count, code])
+
+    def clear_errors(self) -> None:
+        with self._condition:
+            self._injected.clear()
+
+    def _injected_error(self, name: str) -> int | None:
+        for injection in self._injected.get(name, ()):
+            after, count, code = injection
+            if after > 0:
+                injection[0] -= 1
+            elif count > 0:
+                injection[1] -= 1
+                return code
+        return None
+
+    ## Scene and data
+
+    def _make_scene(self) -> np.ndarray:
+        """Sensor illumination [counts/s/pixel], (ypixels, xpixels)."""
+        config = self.config
+        x = np.arange(config.xpixels)
+        y = np.arange(config.ypixels)
+
+        spectrum = np.full(config.xpixels, config.continuum, dtype=np.float64)
+        for line in config.lines:
+            center = line.position * (config.xpixels - 1)
+            spectrum += line.intensity * np.exp(-0.5 * ((x - center) / line.width) ** 2)
+
+        profile = np.zeros(config.ypixels)
+        for fiber in config.fibers:
+            center = fiber.position * (config.ypixels - 1)
+            profile += fiber.transmission * np.exp(
+                -0.5 * ((y - center) / fiber.width) ** 2
+            )
+
+        return profile[:, np.newaxis] * spectrum + config.dark_current
+
+    @staticmethod
+    def _sum_rows(scene: np.ndarray, ranges) -> np.ndarray:
+        """Sums of the rows first to last (1-based, inclusive) of each range."""
+        ranges = np.asarray(ranges, dtype=np.int64).reshape(-1, 2)
+        cumulative = np.zeros((len(scene) + 1, scene.shape[1]))
+        np.cumsum(scene, axis=0, out=cumulative[1:])
+        return cumulative[ranges[:, 1]] - cumulative[ranges[:, 0] - 1]
+
+    def _track_ranges(self) -> list[tuple[int, int]]:
+        """Rows (1-based, inclusive) binned by the current track read mode."""
+        ypixels = self.config.ypixels
+        if self.read_mode == 0:  # FVB
+            return [(1, ypixels)]
+        if self.read_mode == 1:  # Multi-Track
+            number, height, offset, bottom, gap = self.multi_track
+            track = MultiTrack(
+                number=number, height=height, offset=offset, bottom=bottom, gap=gap
+            )
+            return multi_track_rows(track, ypixels)
+        if self.read_mode == 2:  # Random-Track
+            return random_track_rows(RandomTrack(tracks=list(self.random_tracks)))
+        center, height = self.single_track
+        return [single_track_rows(SingleTrack(center=center, height=height), ypixels)]
+
+    def _binned_scene(self) -> np.ndarray:
+        """Counts/s of every value read out, (rows, width)."""
+        if self.acquisition_mode == 4:
+            return self._fast_kinetics_scene()
+
+        if self.read_mode == 4:
+            hbin, vbin, hstart, hend, vstart, vend = self.image
+            width = (hend - hstart + 1) // hbin
+            height = (vend - vstart + 1) // vbin
+            region = self._scene[
+                vstart - 1 : vstart - 1 + height * vbin,
+                hstart - 1 : hstart - 1 + width * hbin,
+            ]
+            return region.reshape(height, vbin, width, hbin).sum(axis=(1, 3))
+
+        return self._sum_rows(self._scene, self._track_ranges())
+
+    def _fast_kinetics_scene(self) -> np.ndarray:
+        config = self.fast_kinetics
+        n_frames, sub_height, width = fast_kinetics_shape(config, self.config.xpixels)
+        first = config.offset
+        area = self._scene[first : first + config.exposed_rows, : width * config.hbin]
+        if config.read_mode == 0:
+            sub_frame = area.sum(axis=0, keepdims=True)
+        else:
+            area = area[: sub_height * config.vbin]
+            sub_frame = area.reshape(sub_height, config.vbin, width, -1).sum(
+                axis=(1, 3)
+            )
+        # Sub-frames stacked along the rows, like GetAcquiredData returns them
+        return np.tile(sub_frame, (n_frames, 1))
+
+    def _exposure(self) -> float:
+        if self.acquisition_mode == 4:
+            return self._fk_exposure_time()
+        return self.exposure_time
+
+    def _frame_bank(self) -> np.ndarray:
+        """Noisy int32 frames of the current geometry, (noise_frames, rows, width)."""
+        n_accumulations = self.number_accumulations if self.acquisition_mode == 2 else 1
+        key = (
+            self.acquisition_mode,
+            self.read_mode,
+            self.image,
+            self.single_track,
+            self.multi_track,
+            self.random_tracks,
+            self.fast_kinetics,
+            self._exposure(),
+            n_accumulations,
+            self.preamp_gain,
+        )
+        if key == self._bank_key:
+            return self._bank
+
+        config = self.config
+        signal = self._binned_scene() * self._exposure() * n_accumulations
+        noise = np.sqrt(signal + n_accumulations * config.read_noise**2)
+        frames = signal + noise * self._rng.standard_normal(
+            (config.noise_frames, *signal.shape)
+        )
+        gain = config.preamp_gains[self.preamp_gain]
+        frames = frames * gain + n_accumulations * config.bias
+        self._bank = np.clip(np.rint(frames), 0, 2**31 - 1).astype(np.int32)
+        self._bank_key = key
+        return self._bank
+
+    def _write_images(self, first: int, last: int, address: int) -> None:
+        """Copies images first to last (1-based) at ``address``."""
+        bank = self._frame_bank()
+        frame = bank[0]
+        for index in range(first, last + 1):
+            ctypes.memmove(
+                address + (index - first) * frame.nbytes,
+                bank[(self._bank_offset + index) % len(bank)].ctypes.data,
+                frame.nbytes,
+            )
+
+    ## Timing model
+
+    def _readout_time(self) -> float:
+        config = self.config
+        row_shift = config.vs_speeds[self.vs_speed] * 1e-6
+        pixel_time = 1e-6 / config.hs_speeds[self.hs_speed]
+        rows, width = self._binned_scene().shape
+        return config.ypixels * row_shift + rows * width * pixel_time
+
+    def _keep_clean_time(self) -> float:
+        return self.config.ypixels * self.config.vs_speeds[self.vs_speed] * 1e-6
+
+    def _fk_exposure_time(self) -> float:
+        # Rounded up to whole sub-area shifts
+        shift = (
+            self.fast_kinetics.exposed_rows
+            * self.config.vs_speeds[self.vs_speed]
+            * 1e-6
+        )
+        exposure = self.fast_kinetics.exposure_time / 1000
+        return max(math.ceil(exposure / shift - 1e-9), 1) * shift
+
+    def _timings(self) -> tuple[float, float, float]:
+        """Actual exposure, accumulation cycle and kinetic cycle times [s]."""
+        if self.acquisition_mode == 4:
+            exposure = self._fk_exposure_time()
+            cycle = self.fast_kinetics.series_length * exposure + self._readout_time()
+            return exposure, cycle, cycle
+
+        exposure = self.exposure_time
+        scan = exposure + self._readout_time() + self._keep_clean_time()
+        accumulation_cycle = max(self.accumulation_cycle_time, scan)
+        n_accumulations = (
+            self.number_accumulations if self.acquisition_mode in (2, 3) else 1
+        )
+        kinetic_cycle = max(
+            self.kinetic_cycle_time, n_accumulations * accumulation_cycle
+        )
+        return exposure, accumulation_cycle, kinetic_cycle
+
+    def _image_period(self) -> float:
+        _, accumulation_cycle, kinetic_cycle = self._timings()
+        if self.acquisition_mode == 1:
+            return accumulation_cycle
+        if self.acquisition_mode == 2:
+            return self.number_accumulations * accumulation_cycle
+        return kinetic_cycle
+
+    def _images_done(self) -> int:
+        """Images acquired so far, the acquisition ends with its last image."""
+        if self._acquiring:
+            elapsed = self._now() - self._start_time
+            n_done = min(int(elapsed / self._period), self._n_images)
+            self._n_done = n_done
+            if n_done == self._n_images:
+                self._acquiring = False
+                self._condition.notify_all()
+        return self._n_done
+
+    ## Cooling curve
+
+    def _update_temperature(self) -> float:
+        config = self.config
+        now = self._now()
+        equilibrium = (
+            float(self.target_temperature)
+            if self.cooler_on
+            else config.ambient_temperature
+        )
+        decay = math.exp(-(now - self._temperature_time) / config.cooling_time_constant)
+        self._temperature = equilibrium + (self._temperature - equilibrium) * decay
+        self._temperature_time = now
+
+        if self.cooler_on and abs(self._temperature - self.target_temperature) < 1:
+            if self._stable_since is None:
+                self._stable_since = now
+        else:
+            self._stable_since = None
+
+        return self._temperature
+
+    ## Getters
+
+    @_sdk_function
+    def GetAvailableCameras(self, total_cameras):
+        _set(total_cameras, self.config.n_cameras)
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def GetCameraHandle(self, camera_index, handle):
+        camera_index = _value(camera_index)
+        if not 0 <= camera_index < self.config.n_cameras:
+            return P1_INVALID_CODE
+        _set(handle, 100 + camera_index)
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def GetCurrentCamera(self, handle):
+        _set(handle, 100 + self.current_camera)
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def GetCameraSerialNumber(self, serial_number):
+        _set(serial_number, self.config.serial_number + self.current_camera)
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def GetTemperature(self, temperature):
+        with self._condition:
+            value = self._update_temperature()
+            _set(temperature, round(value))
+
+            if not self.cooler_on:
+                return TEMPERATURE_OFF_CODE
+            if self._stable_since is None:
+                return TEMPERATURE_NOT_REACHED_CODE
+            if self._now() - self._stable_since < self.config.stabilization_time:
+                return TEMPERATURE_NOT_STABILIZED_CODE
+            return TEMPERATURE_STABILIZED_CODE
+
+    @_sdk_function
+    def GetNumberHSSpeeds(self, channel, typ, speeds):
+        _set(speeds, len(self.config.hs_speeds))
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def GetNumberVSSpeeds(self, speeds):
+        _set(speeds, len(self.config.vs_speeds))
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def GetHSSpeed(self, channel, typ, index, speed):
+        index = _value(index)
+        if not 0 <= index < len(self.config.hs_speeds):
+            return P3_INVALID_CODE
+        _set(speed, self.config.hs_speeds[index])
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def GetVSSpeed(self, index, speed):
+        index = _value(index)
+        if not 0 <= index < len(self.config.vs_speeds):
+            return P1_INVALID_CODE
+        _set(speed, self.config.vs_speeds[index])
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def GetFastestRecommendedVSSpeed(self, index, speed):
+        _set(index, self.config.recommended_vs_speed)
+        _set(speed, self.config.vs_speeds[self.config.recommended_vs_speed])
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def GetNumberVSAmplitudes(self, number):
+        _set(number, self.config.n_vs_amplitudes)
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def GetAcquisitionTimings(self, exposure, accumulate, kinetic):
+        with self._condition:
+            for pointer, value in zip((exposure, accumulate, kinetic), self._timings()):
+                _set(pointer, value)
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def GetFKExposureTime(self, exposure):
+        with self._condition:
+            _set(exposure, self._fk_exposure_time())
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def GetReadOutTime(self, readout_time):
+        with self._condition:
+            _set(readout_time, self._readout_time())
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def GetKeepCleanTime(self, keep_clean_time):
+        with self._condition:
+            _set(keep_clean_time, self._keep_clean_time())
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def GetDetector(self, xpixels, ypixels):
+        _set(xpixels, self.config.xpixels)
+        _set(ypixels, self.config.ypixels)
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def GetTemperatureRange(self, min_temperature, max_temperature):
+        _set(min_temperature, self.config.min_temperature)
+        _set(max_temperature, self.config.max_temperature)
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def GetStatus(self, status):
+        with self._condition:
+            self._images_done()
+            _set(status, ACQUIRING_CODE if self._acquiring else IDLE_CODE)
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def IsCoolerOn(self, cooler_on):
+        _set(cooler_on, int(self.cooler_on))
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def GetAcquisitionProgress(self, accumulations, series):
+        with self._condition:
+            n_done = self._images_done()
+            n_accumulations = 0
+            if self._acquiring and self.acquisition_mode in (2, 3):
+                _, accumulation_cycle, _ = self._timings()
+                elapsed = self._now() - self._start_time - n_done * self._period
+                n_accumulations = min(
+                    int(elapsed / accumulation_cycle), self.number_accumulations
+                )
+            _set(accumulations, n_accumulations)
+            _set(series, n_done)
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def GetHeadModel(self, name):
+        name.value = self.config.model.encode()
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def GetAcquiredData(self, array, size):
+        with self._condition:
+            self._images_done()
+            if self._acquiring:
+                return ACQUIRING_CODE
+            if self._n_done < self._n_images:
+                return NO_NEW_DATA_CODE
+
+            frame_size = self._frame_bank()[0].size
+            if _value(size) < self._n_images * frame_size:
+                return P2_INVALID_CODE
+
+            address = ctypes.cast(array, ctypes.c_void_p).value
+            self._write_images(1, self._n_images, address)
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def GetTotalNumberImagesAcquired(self, index):
+        with self._condition:
+            _set(index, self._images_done())
+        return SUCCESS_CODE
+
+    def _oldest_image(self) -> int:
+        return max(self._n_done - self.config.circular_buffer_size + 1, 1)
+
+    @_sdk_function
+    def GetNumberNewImages(self, first, last):
+        with self._condition:
+            n_done = self._images_done()
+            oldest = max(self._n_read + 1, self._oldest_image())
+            if n_done < oldest:
+                return NO_NEW_DATA_CODE
+            _set(first, oldest)
+            _set(last, n_done)
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def GetImages(self, first, last, array, size, valid_first, valid_last):
+        first = _value(first)
+        last = _value(last)
+        with self._condition:
+            n_done = self._images_done()
+            if first < 1 or last < first:
+                return P1_INVALID_CODE
+            if last > n_done:
+                return P2_INVALID_CODE
+            if last < self._oldest_image():
+                return NO_NEW_DATA_CODE
+
+            frame_size = self._frame_bank()[0].size
+            if _value(size) < (last - first + 1) * frame_size:
+                return P3_INVALID_CODE
+
+            # Overwritten images are skipped, the valid ones start the array
+            valid = max(first, self._oldest_image())
+            address = ctypes.cast(array, ctypes.c_void_p).value
+            self._write_images(valid, last, address)
+            self._n_read = max(self._n_read, last)
+            _set(valid_first, valid)
+            _set(valid_last, last)
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def GetOldestImage(self, array, size):
+        with self._condition:
+            n_done = self._images_done()
+            index = max(self._n_read + 1, self._oldest_image())
+            if index > n_done:
+                return NO_NEW_DATA_CODE
+            if _value(size) < self._frame_bank()[0].size:
+                return P2_INVALID_CODE
+
+            self._write_images(index, index, ctypes.cast(array, ctypes.c_void_p).value)
+            self._n_read = index
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def GetSizeOfCircularBuffer(self, index):
+        _set(index, self.config.circular_buffer_size)
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def GetNumberPreAmpGains(self, n_gains):
+        _set(n_gains, len(self.config.preamp_gains))
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def GetCurrentPreAmpGain(self, index, name, length):
+        _set(index, self.preamp_gain)
+        gain = self.config.preamp_gains[self.preamp_gain]
+        name.value = f"Gain {gain:g}x".encode()[: _value(length) - 1]
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def GetPreAmpGain(self, index, gain):
+        index = _value(index)
+        if not 0 <= index < len(self.config.preamp_gains):
+            return P1_INVALID_CODE
+        _set(gain, self.config.preamp_gains[index])
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def IsPreAmpGainAvailable(self, channel, amplifier, index, gain_index, status):
+        index, gain_index = _value(index), _value(gain_index)
+        if not 0 <= index < len(self.config.hs_speeds):
+            return P3_INVALID_CODE
+        if not 0 <= gain_index < len(self.config.preamp_gains):
+            return P4_INVALID_CODE
+        _set(status, int((index, gain_index) not in self.config.unavailable_gains))
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def GetSoftwareVersion(self, *versions):
+        for pointer, value in zip(versions, (1, 0, 0, 0, 2, 104)):
+            _set(pointer, value)
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def GetHardwareVersion(self, *versions):
+        for pointer, value in zip(versions, (1, 0, 0, 0, 11, 5)):
+            _set(pointer, value)
+        return SUCCESS_CODE
+
+    ## Setters
+
+    def _set_setting(self, name: str, value, is_valid: bool) -> int:
+        with self._condition:
+            self._images_done()
+            if self._acquiring:
+                return ACQUIRING_CODE
+            if not is_valid:
+                return P1_INVALID_CODE
+            setattr(self, name, value)
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def SetAcquisitionMode(self, mode):
+        mode = _value(mode)
+        return self._set_setting("acquisition_mode", mode, mode in (1, 2, 3, 4, 5))
+
+    @_sdk_function
+    def SetReadMode(self, mode):
+        mode = _value(mode)
+        return self._set_setting("read_mode", mode, mode in (0, 1, 2, 3, 4))
+
+    @_sdk_function
+    def SetShutter(self, ttl_type, mode, closing_time, opening_time):
+        shutter = tuple(map(_value, (ttl_type, mode, closing_time, opening_time)))
+        return self._set_setting("shutter", shutter, shutter[1] in (0, 1, 2))
+
+    @_sdk_function
+    def SetExposureTime(self, time_s):
+        time_s = _value(time_s)
+        return self._set_setting("exposure_time", time_s, time_s >= 0)
+
+    @_sdk_function
+    def SetTriggerMode(self, mode):
+        # Every trigger mode is simulated as internal
+        mode = _value(mode)
+        return self._set_setting("trigger_mode", mode, mode in (0, 1, 6, 7, 9, 10, 12))
+
+    @_sdk_function
+    def SetAccumulationCycleTime(self, time_s):
+        time_s = _value(time_s)
+        return self._set_setting("accumulation_cycle_time", time_s, time_s >= 0)
+
+    @_sdk_function
+    def SetNumberAccumulations(self, number):
+        number = _value(number)
+        return self._set_setting("number_accumulations", number, number >= 1)
+
+    @_sdk_function
+    def SetNumberKinetics(self, number):
+        number = _value(number)
+        return self._set_setting("number_kinetics", number, number >= 1)
+
+    @_sdk_function
+    def SetKineticCycleTime(self, time_s):
+        time_s = _value(time_s)
+        return self._set_setting("kinetic_cycle_time", time_s, time_s >= 0)
+
+    @_sdk_function
+    def SetFastKineticsEx(
+        self, exposed_rows, series_length, time_s, mode, hbin, vbin, offset
+    ):
+        exposed_rows, series_length, mode, hbin, vbin, offset = map(
+            _value, (exposed_rows, series_length, mode, hbin, vbin, offset)
+        )
+        config = FastKineticsConfig(
+            exposed_rows=exposed_rows,
+            series_length=series_length,
+            exposure_time=_value(time_s) * 1000,
+            read_mode=mode,
+            hbin=hbin,
+            vbin=vbin,
+            offset=offset,
+        )
+        is_valid = (
+            1 <= exposed_rows
+            and offset + exposed_rows <= self.config.ypixels
+            and 1 <= series_length
+            and series_length * exposed_rows <= self.config.ypixels
+            and mode in (0, 4)
+            and 1 <= hbin <= self.config.xpixels
+            and 1 <= vbin <= exposed_rows
+        )
+        return self._set_setting("fast_kinetics", config, is_valid)
+
+    @_sdk_function
+    def SetHSSpeed(self, typ, index):
+        index = _value(index)
+        return self._set_setting(
+            "hs_speed", index, 0 <= index < len(self.config.hs_speeds)
+        )
+
+    @_sdk_function
+    def SetVSSpeed(self, index):
+        index = _value(index)
+        return self._set_setting(
+            "vs_speed", index, 0 <= index < len(self.config.vs_speeds)
+        )
+
+    @_sdk_function
+    def SetVSAmplitude(self, index):
+        index = _value(index)
+        return self._set_setting(
+            "vs_amplitude", index, 0 <= index < self.config.n_vs_amplitudes
+        )
+
+    @_sdk_function
+    def SetImage(self, hbin, vbin, hstart, hend, vstart, vend):
+        image = tuple(map(_value, (hbin, vbin, hstart, hend, vstart, vend)))
+        hbin, vbin, hstart, hend, vstart, vend = image
+        is_valid = (
+            1 <= hstart <= hend <= self.config.xpixels
+            and 1 <= vstart <= vend <= self.config.ypixels
+            and 1 <= hbin <= hend - hstart + 1
+            and 1 <= vbin <= vend - vstart + 1
+        )
+        return self._set_setting("image", image, is_valid)
+
+    @_sdk_function
+    def SetTemperature(self, temperature):
+        temperature = _value(temperature)
+        config = self.config
+        is_valid = config.min_temperature <= temperature <= config.max_temperature
+        with self._condition:
+            self._update_temperature()
+        return self._set_setting("target_temperature", temperature, is_valid)
+
+    @_sdk_function
+    def SetMultiTrack(self, number, height, offset, bottom, gap):
+        number, height, offset = map(_value, (number, height, offset))
+        ypixels = self.config.ypixels
+        is_valid = number >= 1 and height >= 1 and number * height <= ypixels
+
+        # Tracks evenly spread over the sensor, shifted by offset
+        first_row, track_gap = multi_track_layout(number, height, offset, ypixels)
+        last_row = first_row + number * height + (number - 1) * track_gap - 1
+        is_valid = is_valid and 1 <= first_row and last_row <= ypixels
+
+        code = self._set_setting(
+            "multi_track", (number, height, offset, first_row, track_gap), is_valid
+        )
+        if code == SUCCESS_CODE:
+            _set(bottom, first_row)
+            _set(gap, track_gap)
+        return code
+
+    @_sdk_function
+    def SetRandomTracks(self, number, areas):
+        number = _value(number)
+        tracks = tuple(areas[: 2 * number]) if number >= 1 else ()
+        is_valid = (
+            number >= 1
+            and all(1 <= row <= self.config.ypixels for row in tracks)
+            and all(tracks[i] <= tracks[i + 1] for i in range(len(tracks) - 1))
+        )
+        return self._set_setting("random_tracks", tracks, is_valid)
+
+    @_sdk_function
+    def SetSingleTrack(self, center, height):
+        center, height = _value(center), _value(height)
+        is_valid = (
+            1 <= center <= self.config.ypixels and 1 <= height <= self.config.ypixels
+        )
+        return self._set_setting("single_track", (center, height), is_valid)
+
+    @_sdk_function
+    def SetPreAmpGain(self, index):
+        index = _value(index)
+        return self._set_setting(
+            "preamp_gain", index, 0 <= index < len(self.config.preamp_gains)
+        )
+
+    @_sdk_function
+    def SetCurrentCamera(self, handle):
+        index = _value(handle) - 100
+        if not 0 <= index < self.config.n_cameras:
+            return P1_INVALID_CODE
+        self.current_camera = index
+        return SUCCESS_CODE
+
+    ## Camera actions
+
+    @_sdk_function
+    def AbortAcquisition(self):
+        with self._condition:
+            self._images_done()
+            if not self._acquiring:
+                return IDLE_CODE
+            self._acquiring = False
+            self._condition.notify_all()
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def CancelWait(self):
+        with self._condition:
+            self._cancel_wait = True
+            self._condition.notify_all()
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def CoolerON(self):
+        with self._condition:
+            self._update_temperature()
+            self.cooler_on = True
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def CoolerOFF(self):
+        with self._condition:
+            self._update_temperature()
+            self.cooler_on = False
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def Initialize(self, directory):
+        with self._condition:
+            self._reset()
+            self._wait(self.config.initialize_time)
+            self.initialized = True
+        logger.info("Simulated Andor camera %s initialized", self.config.model)
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def StartAcquisition(self):
+        with self._condition:
+            self._images_done()
+            if self._acquiring:
+                return ACQUIRING_CODE
+
+            n_images = {3: self.number_kinetics, 5: _UNBOUNDED}.get(
+                self.acquisition_mode, 1
+            )
+
+            # Data of the new geometry generated before the clock starts
+            bank = self._frame_bank()
+            self._bank_offset = (self._bank_offset + self._n_done) % len(bank)
+            self._period = self._image_period()
+            self._n_images = n_images
+            self._n_done = self._n_read = self._n_waited = 0
+            self._cancel_wait = False
+            self._start_time = self._now()
+            self._acquiring = True
+        return SUCCESS_CODE
+
+    @_sdk_function
+    def WaitForAcquisition(self):
+        with self._condition:
+            while True:
+                n_done = self._images_done()
+                if n_done > self._n_waited:
+                    self._n_waited = n_done
+                    return SUCCESS_CODE
+                if self._cancel_wait or not self._acquiring:
+                    self._cancel_wait = False
+                    return NO_NEW_DATA_CODE
+
+                next_image = self._start_time + (n_done + 1) * self._period
+                self._wait(next_image - self._now())
+
+    @_sdk_function
+    def ShutDown(self):
+        with self._condition:
+            self._acquiring = False
+            self._condition.notify_all()
+            self._reset()
+        return SUCCESS_CODE
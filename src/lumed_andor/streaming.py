@@ -0,0 +1,148 @@
+from dataclasses import dataclass
+from enum import Enum
+from threading import Condition
+
+import numpy as np
+
+
+class OverflowPolicy(Enum):
+    BLOCK = "block"  # back-pressure, the producer waits for the consumer
+    DROP_OLDEST = "drop_oldest"  # the oldest unread frame is overwritten
+
+
+@dataclass
+class StreamStats:
+    written: int = 0  # frames read from the SDK into the ring
+    delivered: int = 0  # frames handed to the consumer
+    dropped: int = 0  # unread frames overwritten in the ring (DROP_OLDEST)
+    overrun: int = 0  # frames lost in the SDK circular buffer before being read
+
+
+class FrameRingBuffer:
+    """Bounded ring of preallocated frames between the camera and a consumer.
+
+    The producer reserves a slot, has the SDK write into it and commits it;
+    the consumer copies frames out in acquisition order. Memory use is fixed
+    at ``capacity`` frames whatever the stream duration.
+
+    When the ring is full, ``BLOCK`` makes the producer wait for the consumer
+    (frames then pile up, and are eventually overrun, in the SDK circular
+    buffer) while ``DROP_OLDEST`` overwrites the oldest unread frame.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        frame_shape: tuple[int, ...],
+        policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        dtype=np.int32,
+    ):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+
+        self.capacity: int = capacity
+        self.policy: OverflowPolicy = policy
+        self.stats: StreamStats = StreamStats()
+
+        self._frames: np.ndarray = np.zeros((capacity, *frame_shape), dtype=dtype)
+        self._indices: np.ndarray = np.zeros(capacity, dtype=np.int64)
+        self._condition: Condition = Condition()
+        self._head: int = 0  # committed frames
+        self._tail: int = 0  # consumed (or dropped) frames
+        self._reserved: bool = False
+        self._closed: bool = False
+
+    def __len__(self) -> int:
+        with self._condition:
+            return self._head - self._tail
+
+    @property
+    def frame_shape(self) -> tuple[int, ...]:
+        return self._frames.shape[1:]
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def reserve(self, timeout: float | None = None) -> np.ndarray | None:
+        """Slot for the next frame, None once closed (or on BLOCK timeout)."""
+        with self._condition:
+            if self._reserved:
+                raise RuntimeError("A slot is already reserved")
+
+            if self._head - self._tail == self.capacity:
+                if self.policy == OverflowPolicy.DROP_OLDEST:
+                    self._tail += 1
+                    self.stats.dropped += 1
+                elif not self._condition.wait_for(
+                    lambda: self._closed or self._head - self._tail < self.capacity,
+                    timeout,
+                ):
+                    return None
+
+            if self._closed:
+                return None
+
+            self._reserved = True
+            return self._frames[self._head % self.capacity]
+
+    def commit(self, index: int) -> None:
+        """Publishes the reserved slot as frame ``index`` of the acquisition."""
+        with self._condition:
+            if not self._reserved:
+                raise RuntimeError("No slot reserved")
+
+            self._indices[self._head % self.capacity] = index
+            self._head += 1
+            self._reserved = False
+            self.stats.written += 1
+            self._condition.notify_all()
+
+    def get(
+        self, out: np.ndarray | None = None, timeout: float | None = None
+    ) -> tuple[int, np.ndarray] | None:
+        """Oldest unread frame copied into ``out`` (allocated when not given).
+
+        Waits for a frame, returns None on timeout or once the ring is closed
+        and drained.
+        """
+        with self._condition:
+            if not self._condition.wait_for(
+                lambda: self._closed or self._head > self._tail, timeout
+            ):
+                return None
+            if self._head == self._tail:
+                return None
+
+            slot = self._tail % self.capacity
+            if out is None:
+                out = self._frames[slot].copy()
+            else:
+                np.copyto(out, self._frames[slot])
+            index = int(self._indices[slot])
+
+            self._tail += 1
+            self.stats.delivered += 1
+            self._condition.notify_all()
+
+        return index, out
+
+    def latest(self, out: np.ndarray | None = None) -> tuple[int, np.ndarray] | None:
+        """Copy of the most recent frame, read or not, without consuming it."""
+        with self._condition:
+            if self._head == 0:
+                return None
+
+            slot = (self._head - 1) % self.capacity
+            if out is None:
+                out = self._frames[slot].copy()
+            else:
+                np.copyto(out, self._frames[slot])
+
+            return int(self._indices[slot]), out
+
+    def close(self) -> None:
+        """Stops the producer, the consumer can still drain the unread frames."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
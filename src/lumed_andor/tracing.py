@@ -0,0 +1,144 @@
+import ctypes
+import logging
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+
+import numpy as np
+
+logger = logging.getLogger()
+
+TRACE_DTYPE = np.dtype(
+    [
+        ("function", np.uint16),
+        ("code", np.int64),
+        ("start_ns", np.int64),
+        ("end_ns", np.int64),
+        ("lock_wait_ns", np.int64),
+    ]
+)
+
+DEFAULT_TRACE_DIR = Path.home() / "andor_traces"
+
+
+def _arg_value(arg):
+    """Plain value of a ctypes argument, read after the call (outputs included)."""
+    if hasattr(arg, "_obj"):  # ctypes.byref
+        arg = arg._obj
+    if isinstance(arg, ctypes.Array):
+        return f"{arg._type_.__name__}[{len(arg)}]"
+    if isinstance(arg, ctypes._Pointer):
+        return f"*{arg._type_.__name__}"
+    return getattr(arg, "value", arg)
+
+
+class SDKCallTracer:
+    """Fixed-size ring buffer of the SDK calls made by an AndorCamera.
+
+    Each record holds the function, its arguments, the returned code, the
+    monotonic start and end times of the call and the time spent waiting for
+    the camera lock. Once full, the oldest records are overwritten.
+
+    The buffer is written to a compressed ``.npz`` file on demand with
+    ``dump`` and, when ``dump_on_error`` is set, whenever a call returns a
+    code outside ``ignored_codes`` (at most ``max_dumps`` times).
+    """
+
+    def __init__(
+        self,
+        capacity: int = 65536,
+        dump_dir: Path = DEFAULT_TRACE_DIR,
+        dump_on_error: bool = True,
+        ignored_codes=(),
+        max_dumps: int = 10,
+    ):
+        self.capacity: int = capacity
+        self.dump_dir: Path = Path(dump_dir)
+        self.dump_on_error: bool = dump_on_error
+        self.ignored_codes: frozenset = frozenset(ignored_codes)
+        self.max_dumps: int = max_dumps
+        self.n_dumps: int = 0
+
+        self._mutex: Lock = Lock()
+        self._records: np.ndarray = np.zeros(capacity, dtype=TRACE_DTYPE)
+        self._args: list = [()] * capacity
+        self._n_records: int = 0
+        self._function_ids: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return min(self._n_records, self.capacity)
+
+    def record(self, fn, args, code, start_ns, end_ns, lock_wait_ns) -> None:
+        name = getattr(fn, "__name__", "unknown")
+
+        with self._mutex:
+            function_id = self._function_ids.setdefault(name, len(self._function_ids))
+            i = self._n_records % self.capacity
+            self._records[i] = (function_id, code, start_ns, end_ns, lock_wait_ns)
+            self._args[i] = tuple(_arg_value(arg) for arg in args)
+            self._n_records += 1
+
+            # Counted under the lock so concurrent errors respect max_dumps
+            dump = (
+                self.dump_on_error
+                and code not in self.ignored_codes
+                and self.n_dumps < self.max_dumps
+            )
+            if dump:
+                self.n_dumps += 1
+
+        if dump:
+            path = self.dump()
+            logger.warning(
+                "%s returned %s, SDK call trace dumped to %s", name, code, path
+            )
+
+    def records(self) -> tuple[np.ndarray, list[str], list[tuple]]:
+        """Returns the records, function names and arguments, oldest first."""
+        with self._mutex:
+            n = len(self)
+            first = self._n_records % self.capacity if n == self.capacity else 0
+            order = (np.arange(n) + first) % self.capacity
+            records = self._records[order]
+            args = [self._args[i] for i in order]
+            names = sorted(self._function_ids, key=self._function_ids.get)
+
+        return records, names, args
+
+    def dump(self, path: Path | None = None) -> Path:
+        if path is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+            path = self.dump_dir / f"andor_trace_{timestamp}.npz"
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        records, names, args = self.records()
+        np.savez_compressed(
+            path,
+            records=records,
+            functions=np.array(names, dtype=str),
+            args=np.array([repr(a) for a in args], dtype=str),
+        )
+        return path
+
+    def clear(self) -> None:
+        with self._mutex:
+            self._n_records = 0
+
+
+def load_trace(path: Path) -> list[dict]:
+    """Reads a trace dump back as a list of calls, oldest first."""
+    with np.load(path) as trace:
+        names = trace["functions"]
+        return [
+            {
+                "function": str(names[record["function"]]),
+                "args": str(args),
+                "code": int(record["code"]),
+                "start_ns": int(record["start_ns"]),
+                "duration_ns": int(record["end_ns"] - record["start_ns"]),
+                "lock_wait_ns": int(record["lock_wait_ns"]),
+            }
+            for record, args in zip(trace["records"], trace["args"])
+        ]
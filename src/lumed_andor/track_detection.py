@@ -0,0 +1,224 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from lumed_andor.andor_control import ImageConfig, MultiTrack, RandomTrack, SingleTrack
+from lumed_andor.binning import multi_track_layout
+
+
+@dataclass(kw_only=True)
+class TrackProposal:
+    """Track layout of a read mode and the signal fraction it captures."""
+
+    read_mode: int
+    track: SingleTrack | MultiTrack | RandomTrack
+    rows: list = field(default_factory=list)  # (first, last) sensor rows
+    fraction: float = 0.0
+
+    @property
+    def n_rows(self) -> int:
+        """Number of binned sensor rows."""
+        return sum(last - first + 1 for first, last in self.rows)
+
+
+def row_signal(
+    data: np.ndarray,
+    image_config: ImageConfig,
+    ypixels: int,
+    background_percentile: float = 10.0,
+    n_sigma: float = 3.0,
+) -> np.ndarray:
+    """Background subtracted signal of every sensor row, (ypixels,).
+
+    ``data`` is a (n, rows, columns) or (rows, columns) image mode
+    acquisition with ``image_config``, every frame and column are summed.
+    The background is a low percentile of the row profile. Rows less than
+    ``n_sigma`` times the noise above it have no signal, the noise being
+    estimated from the row to row differences. Binned rows are spread
+    evenly over their sensor rows and rows outside the acquired area have
+    no signal.
+    """
+    data = np.asarray(data)
+    profile = data.sum(axis=(*range(data.ndim - 2), data.ndim - 1), dtype=np.float64)
+    profile -= np.percentile(profile, background_percentile)
+    if len(profile) > 1:
+        noise = 1.4826 * np.median(np.abs(np.diff(profile))) / np.sqrt(2)
+        profile[profile < n_sigma * noise] = 0
+    np.clip(profile, 0, None, out=profile)
+
+    signal = np.zeros(ypixels)
+    rows = np.repeat(profile / image_config.vbin, image_config.vbin)
+    first = image_config.vstart - 1
+    rows = rows[: ypixels - first]
+    signal[first : first + len(rows)] = rows
+    return signal
+
+
+def brightest_rows(signal: np.ndarray, fraction: float) -> np.ndarray:
+    """Mask of the fewest rows holding ``fraction`` of the signal."""
+    order = np.argsort(signal)[::-1]
+    cumulative = np.cumsum(signal[order])
+    total = cumulative[-1]
+    if total <= 0:
+        raise ValueError("No signal above the background")
+
+    n_rows = min(
+        np.searchsorted(cumulative, fraction * total * (1 - 1e-12)) + 1, len(signal)
+    )
+    mask = np.zeros(len(signal), dtype=bool)
+    mask[order[:n_rows]] = True
+    return mask
+
+
+def row_segments(mask: np.ndarray, merge_gap: int = 0) -> list[tuple[int, int]]:
+    """(first, last) sensor rows (1-based) of the runs of True in mask.
+
+    Runs separated by at most ``merge_gap`` rows are merged.
+    """
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1) - 1
+
+    if merge_gap > 0 and len(starts) > 1:
+        keep = starts[1:] - ends[:-1] - 1 > merge_gap
+        starts = np.concatenate((starts[:1], starts[1:][keep]))
+        ends = np.concatenate((ends[:-1][keep], ends[-1:]))
+
+    return [(int(start) + 1, int(end) + 1) for start, end in zip(starts, ends)]
+
+
+def _captured(cumulative: np.ndarray, firsts: np.ndarray, lasts: np.ndarray):
+    """Signal of the rows first to last (1-based), cumulative starts with 0."""
+    return cumulative[lasts] - cumulative[firsts - 1]
+
+
+def single_track_proposal(signal: np.ndarray, fraction: float) -> TrackProposal:
+    """Lowest single track holding ``fraction`` of the signal."""
+    cumulative = np.concatenate(([0.0], np.cumsum(signal)))
+    target = fraction * cumulative[-1] * (1 - 1e-12)
+
+    def best_window(height: int) -> tuple[int, float]:
+        sums = cumulative[height:] - cumulative[:-height]
+        first = int(np.argmax(sums))
+        return first + 1, float(sums[first])
+
+    # The best window sum grows with the height: bisection on the height
+    low, high = 1, len(signal)
+    while low < high:
+        height = (low + high) // 2
+        if best_window(height)[1] >= target:
+            high = height
+        else:
+            low = height + 1
+
+    first, captured = best_window(low)
+    return TrackProposal(
+        read_mode=3,
+        track=SingleTrack(center=first + low // 2, height=low),
+        rows=[(first, first + low - 1)],
+        fraction=captured / cumulative[-1],
+    )
+
+
+def multi_track_proposal(
+    signal: np.ndarray, segments: list[tuple[int, int]], fraction: float
+) -> TrackProposal:
+    """Lowest evenly spread tracks, one per segment, holding ``fraction``.
+
+    The tracks are laid out as SetMultiTrack does, the offset centres them
+    on the signal weighted centres of the segments. When no height reaches
+    the fraction, the height capturing the most signal is proposed.
+    """
+    ypixels = len(signal)
+    cumulative = np.concatenate(([0.0], np.cumsum(signal)))
+    weighted = np.concatenate(([0.0], np.cumsum(signal * np.arange(1, ypixels + 1))))
+
+    firsts, lasts = np.array(segments).T
+    centres = _captured(weighted, firsts, lasts) / np.maximum(
+        _captured(cumulative, firsts, lasts), 1e-300
+    )
+
+    number = len(segments)
+    heights = np.arange(int((lasts - firsts).max()) + 1, ypixels // number + 1)
+    if len(heights) == 0:
+        heights = np.array([ypixels // number])
+    layouts = np.array(
+        [multi_track_layout(number, int(height), 0, ypixels) for height in heights]
+    )
+    bottoms, gaps = layouts[:, 0], layouts[:, 1]
+
+    # (heights, tracks) first rows without offset, then centred on the signal
+    track_firsts = bottoms[:, None] + np.arange(number) * (heights + gaps)[:, None]
+    track_centres = track_firsts + (heights[:, None] - 1) / 2
+    offsets = np.rint((centres - track_centres).mean(axis=1)).astype(int)
+    offsets = np.clip(
+        offsets, 1 - track_firsts[:, 0], ypixels - track_firsts[:, -1] - heights + 1
+    )
+    track_firsts = track_firsts + offsets[:, None]
+    track_lasts = track_firsts + heights[:, None] - 1
+
+    captured = _captured(cumulative, track_firsts, track_lasts).sum(axis=1)
+    meets = captured >= fraction * cumulative[-1] * (1 - 1e-12)
+    i = int(np.argmax(meets)) if meets.any() else int(np.argmax(captured))
+
+    return TrackProposal(
+        read_mode=1,
+        track=MultiTrack(
+            number=number,
+            height=int(heights[i]),
+            offset=int(offsets[i]),
+            bottom=int(track_firsts[i, 0]),
+            gap=int(gaps[i]),
+        ),
+        rows=[(int(f), int(la)) for f, la in zip(track_firsts[i], track_lasts[i])],
+        fraction=float(captured[i] / cumulative[-1]),
+    )
+
+
+def random_track_proposal(
+    signal: np.ndarray, segments: list[tuple[int, int]], hbin: int = 1
+) -> TrackProposal:
+    """One random track per segment."""
+    cumulative = np.concatenate(([0.0], np.cumsum(signal)))
+    firsts, lasts = np.array(segments).T
+    captured = _captured(cumulative, firsts, lasts).sum()
+
+    return TrackProposal(
+        read_mode=2,
+        track=RandomTrack(
+            hbin=hbin, tracks=[row for segment in segments for row in segment]
+        ),
+        rows=list(segments),
+        fraction=float(captured / cumulative[-1]),
+    )
+
+
+def propose_tracks(
+    data: np.ndarray,
+    image_config: ImageConfig,
+    ypixels: int,
+    fraction: float = 0.95,
+    merge_gap: int = 2,
+    background_percentile: float = 10.0,
+    n_sigma: float = 3.0,
+    hbin: int = 1,
+) -> dict[int, TrackProposal]:
+    """Track layouts capturing ``fraction`` of the signal, by read mode.
+
+    The illuminated rows (e.g. the fibers of a bundle) are the fewest rows
+    holding ``fraction`` of the background subtracted signal of a full
+    frame image. Their runs, merged across gaps of at most ``merge_gap``
+    rows, give the random tracks and the number of multi tracks. Fewer
+    binned rows read out faster and with less dark signal.
+    """
+    if not 0 < fraction <= 1:
+        raise ValueError("The signal fraction must be in (0, 1]")
+
+    signal = row_signal(data, image_config, ypixels, background_percentile, n_sigma)
+    segments = row_segments(brightest_rows(signal, fraction), merge_gap)
+
+    return {
+        1: multi_track_proposal(signal, segments, fraction),
+        2: random_track_proposal(signal, segments, hbin),
+        3: single_track_proposal(signal, fraction),
+    }
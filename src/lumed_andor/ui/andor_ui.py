@@ -304,6 +304,29 @@ class Ui_andorCameraWidget(object):
         self.spinBoxkineticTime.setObjectName("spinBoxkineticTime")
         self.gridLayout_5.addWidget(self.spinBoxkineticTime, 1, 1, 1, 1)
         self.verticalLayout_3.addWidget(self.groupBox_6)
+        self.groupBoxAccumulation = QtWidgets.QGroupBox(self.tabAcquisitionMode)
+        self.groupBoxAccumulation.setObjectName("groupBoxAccumulation")
+        self.gridLayoutAccumulation = QtWidgets.QGridLayout(self.groupBoxAccumulation)
+        self.gridLayoutAccumulation.setObjectName("gridLayoutAccumulation")
+        self.labelAccumulationNumber = QtWidgets.QLabel(self.groupBoxAccumulation)
+        self.labelAccumulationNumber.setObjectName("labelAccumulationNumber")
+        self.gridLayoutAccumulation.addWidget(self.labelAccumulationNumber, 0, 0, 1, 1)
+        self.spinBoxAccumulationNumber = QtWidgets.QSpinBox(self.groupBoxAccumulation)
+        self.spinBoxAccumulationNumber.setMinimum(1)
+        self.spinBoxAccumulationNumber.setMaximum(65536)
+        self.spinBoxAccumulationNumber.setObjectName("spinBoxAccumulationNumber")
+        self.gridLayoutAccumulation.addWidget(self.spinBoxAccumulationNumber, 0, 1, 1, 1)
+        self.labelAccumulationTime = QtWidgets.QLabel(self.groupBoxAccumulation)
+        self.labelAccumulationTime.setObjectName("labelAccumulationTime")
+        self.gridLayoutAccumulation.addWidget(self.labelAccumulationTime, 1, 0, 1, 1)
+        self.spinBoxAccumulationTime = QtWidgets.QSpinBox(self.groupBoxAccumulation)
+        self.spinBoxAccumulationTime.setMaximum(65536)
+        self.spinBoxAccumulationTime.setObjectName("spinBoxAccumulationTime")
+        self.gridLayoutAccumulation.addWidget(self.spinBoxAccumulationTime, 1, 1, 1, 1)
+        self.checkBoxHostAccumulation = QtWidgets.QCheckBox(self.groupBoxAccumulation)
+        self.checkBoxHostAccumulation.setObjectName("checkBoxHostAccumulation")
+        self.gridLayoutAccumulation.addWidget(self.checkBoxHostAccumulation, 2, 0, 1, 2)
+        self.verticalLayout_3.addWidget(self.groupBoxAccumulation)
         spacerItem2 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
         self.verticalLayout_3.addItem(spacerItem2)
         self.tabAdvancedControl.addTab(self.tabAcquisitionMode, "")
@@ -377,6 +400,11 @@ class Ui_andorCameraWidget(object):
         self.groupBox_6.setTitle(_translate("andorCameraWidget", "Kinetic Setting"))
         self.label_10.setText(_translate("andorCameraWidget", "Number"))
         self.label_11.setText(_translate("andorCameraWidget", "Cycle Time [ms]"))
+        self.groupBoxAccumulation.setTitle(_translate("andorCameraWidget", "Accumulation Setting"))
+        self.labelAccumulationNumber.setText(_translate("andorCameraWidget", "Number"))
+        self.labelAccumulationTime.setText(_translate("andorCameraWidget", "Cycle Time [ms]"))
+        self.checkBoxHostAccumulation.setToolTip(_translate("andorCameraWidget", "Sum single scans on the computer instead of on the sensor"))
+        self.checkBoxHostAccumulation.setText(_translate("andorCameraWidget", "Host accumulation"))
         self.tabAdvancedControl.setTabText(self.tabAdvancedControl.indexOf(self.tabAcquisitionMode), _translate("andorCameraWidget", "Acquisition Mode"))
         self.tabAdvancedControl.setTabText(self.tabAdvancedControl.indexOf(self.tabInfo), _translate("andorCameraWidget", "Info"))
         self.tabAdvancedControl.setTabText(self.tabAdvancedControl.indexOf(self.tabCurrentSettings), _translate("andorCameraWidget", "Current Settings"))
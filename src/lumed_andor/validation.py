@@ -0,0 +1,356 @@
+from dataclasses import dataclass
+
+from lumed_andor.andor_control import (
+    ACQUISITION_MODES,
+    READ_MODES,
+    AndorInfo,
+    AndorSettings,
+)
+
+TRIGGER_MODES = {
+    0: "Internal",
+    1: "External",
+    6: "External Start",
+    7: "External Exposure (Bulb)",
+    9: "External FVB EM",
+    10: "Software Trigger",
+    12: "External Charge Shifting",
+}
+
+SHUTTER_MODES = {
+    0: "Fully Auto",
+    1: "Permanently Open",
+    2: "Permanently Closed",
+    4: "Open for FVB series",
+    5: "Open for any series",
+}
+
+
+@dataclass(frozen=True)
+class SettingsViolation:
+    field: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.field}: {self.message}"
+
+
+def validate_settings(
+    settings: AndorSettings, info: AndorInfo
+) -> list[SettingsViolation]:
+    """Checks settings against the detector capabilities without any SDK call.
+
+    Every violation is returned at once. ``info`` can be the camera info or
+    any object with the same detector fields (e.g. AndorCapabilities), which
+    allows validating recipes offline. Checks depending on the detector size,
+    the temperature range or the readout speeds are skipped when those are
+    unknown (0 or empty).
+    """
+    violations = []
+    violations += _validate_modes(settings)
+    violations += _validate_timings(settings)
+    violations += _validate_temperature(settings, info)
+    violations += _validate_readout(settings, info)
+
+    if info.xpixels > 0 and info.ypixels > 0:
+        violations += _validate_image(settings, info)
+        violations += _validate_single_track(settings, info)
+        violations += _validate_multi_track(settings, info)
+        violations += _validate_random_track(settings, info)
+        if settings.acquisition_mode == 4:
+            violations += _validate_fast_kinetics(settings, info)
+
+    return violations
+
+
+def _validate_modes(settings: AndorSettings) -> list[SettingsViolation]:
+    violations = []
+
+    if settings.acquisition_mode not in ACQUISITION_MODES:
+        violations.append(
+            SettingsViolation(
+                "acquisition_mode", f"unknown mode {settings.acquisition_mode}"
+            )
+        )
+    if settings.read_mode not in READ_MODES:
+        violations.append(
+            SettingsViolation("read_mode", f"unknown mode {settings.read_mode}")
+        )
+    if settings.trigger_mode not in TRIGGER_MODES:
+        violations.append(
+            SettingsViolation("trigger_mode", f"unknown mode {settings.trigger_mode}")
+        )
+
+    shutter = settings.shutter_profile
+    if shutter.ttl_type not in (0, 1):
+        violations.append(
+            SettingsViolation("shutter_profile.ttl_type", "must be 0 (low) or 1 (high)")
+        )
+    if shutter.mode not in SHUTTER_MODES:
+        violations.append(
+            SettingsViolation("shutter_profile.mode", f"unknown mode {shutter.mode}")
+        )
+    if shutter.closing_time < 0 or shutter.opening_time < 0:
+        violations.append(
+            SettingsViolation("shutter_profile", "opening/closing times must be >= 0")
+        )
+
+    return violations
+
+
+def _validate_timings(settings: AndorSettings) -> list[SettingsViolation]:
+    violations = []
+
+    for name in (
+        "target_exposure_time",
+        "target_accumulation_time",
+        "target_kinetic_time",
+    ):
+        if getattr(settings, name) < 0:
+            violations.append(SettingsViolation(name, "must be >= 0"))
+
+    for name in ("number_kinetic", "number_accumulation"):
+        if getattr(settings, name) < 1:
+            violations.append(SettingsViolation(name, "must be >= 1"))
+
+    return violations
+
+
+def _validate_temperature(
+    settings: AndorSettings, info: AndorInfo
+) -> list[SettingsViolation]:
+    if info.min_temperature >= info.max_temperature:
+        return []
+
+    if not info.min_temperature <= settings.target_temperature <= info.max_temperature:
+        return [
+            SettingsViolation(
+                "target_temperature",
+                f"{settings.target_temperature} outside "
+                f"[{info.min_temperature}, {info.max_temperature}]",
+            )
+        ]
+
+    return []
+
+
+def _validate_readout(
+    settings: AndorSettings, info: AndorInfo
+) -> list[SettingsViolation]:
+    """Speed, VS amplitude and gain indices, checked against the known table."""
+    violations = []
+    speeds = info.readout_speeds
+
+    for name, values in (
+        ("hs_speed_index", speeds.hs_speeds),
+        ("vs_speed_index", speeds.vs_speeds),
+        ("vs_amplitude", range(speeds.n_vs_amplitudes)),
+        ("preamp_gain_index", speeds.preamp_gains),
+    ):
+        index = getattr(settings, name)
+        if index < 0:
+            violations.append(SettingsViolation(name, "must be >= 0"))
+        elif values and index >= len(values):
+            violations.append(
+                SettingsViolation(name, f"{index} outside [0, {len(values) - 1}]")
+            )
+    if violations:
+        return violations
+
+    hs_index, gain_index = settings.hs_speed_index, settings.preamp_gain_index
+    if speeds.hs_speeds and speeds.preamp_gains:
+        if not speeds.is_gain_available(hs_index, gain_index):
+            violations.append(
+                SettingsViolation(
+                    "preamp_gain_index",
+                    f"gain {speeds.preamp_gains[gain_index]}x not available at "
+                    f"{speeds.hs_speeds[hs_index]} MHz",
+                )
+            )
+
+    return violations
+
+
+def _validate_axis(name, start, end, binning, n_pixels) -> list[SettingsViolation]:
+    violations = []
+
+    if binning < 1:
+        violations.append(SettingsViolation(f"image_config.{name}bin", "must be >= 1"))
+    if not 1 <= start <= end <= n_pixels:
+        violations.append(
+            SettingsViolation(
+                f"image_config.{name}start/{name}end",
+                f"[{start}, {end}] must satisfy 1 <= start <= end <= {n_pixels}",
+            )
+        )
+    elif binning >= 1 and (end - start + 1) % binning:
+        violations.append(
+            SettingsViolation(
+                f"image_config.{name}bin",
+                f"{end - start + 1} pixels not divisible by binning {binning}",
+            )
+        )
+
+    return violations
+
+
+def _validate_image(
+    settings: AndorSettings, info: AndorInfo
+) -> list[SettingsViolation]:
+    image = settings.image_config
+    return _validate_axis(
+        "h", image.hstart, image.hend, image.hbin, info.xpixels
+    ) + _validate_axis("v", image.vstart, image.vend, image.vbin, info.ypixels)
+
+
+def _validate_single_track(
+    settings: AndorSettings, info: AndorInfo
+) -> list[SettingsViolation]:
+    track = settings.single_track
+
+    if track.height < 1:
+        return [SettingsViolation("single_track.height", "must be >= 1")]
+
+    first_row = track.center - track.height // 2
+    last_row = track.center + (track.height - 1) // 2
+    if first_row < 1 or last_row > info.ypixels:
+        return [
+            SettingsViolation(
+                "single_track",
+                f"rows [{first_row}, {last_row}] outside sensor [1, {info.ypixels}]",
+            )
+        ]
+
+    return []
+
+
+def _validate_multi_track(
+    settings: AndorSettings, info: AndorInfo
+) -> list[SettingsViolation]:
+    track = settings.multi_track
+    violations = []
+
+    if track.number < 1:
+        violations.append(SettingsViolation("multi_track.number", "must be >= 1"))
+    if track.height < 1:
+        violations.append(SettingsViolation("multi_track.height", "must be >= 1"))
+    if violations:
+        return violations
+
+    if track.number * track.height > info.ypixels:
+        violations.append(
+            SettingsViolation(
+                "multi_track",
+                f"{track.number} tracks of {track.height} rows exceed "
+                f"{info.ypixels} sensor rows",
+            )
+        )
+
+    return violations
+
+
+def _validate_random_track(
+    settings: AndorSettings, info: AndorInfo
+) -> list[SettingsViolation]:
+    tracks = settings.random_track.tracks
+    violations = []
+
+    if settings.random_track.hbin < 1:
+        violations.append(SettingsViolation("random_track.hbin", "must be >= 1"))
+    if len(tracks) < 2 or len(tracks) % 2:
+        violations.append(
+            SettingsViolation(
+                "random_track.tracks", "must hold at least one (start, end) pair"
+            )
+        )
+        return violations
+
+    previous_end = 0
+    for i in range(0, len(tracks), 2):
+        start, end = tracks[i : i + 2]
+        if not 1 <= start <= end <= info.ypixels:
+            violations.append(
+                SettingsViolation(
+                    "random_track.tracks",
+                    f"track {i // 2} [{start}, {end}] must satisfy "
+                    f"1 <= start <= end <= {info.ypixels}",
+                )
+            )
+        elif start <= previous_end:
+            violations.append(
+                SettingsViolation(
+                    "random_track.tracks",
+                    f"track {i // 2} [{start}, {end}] overlaps or precedes "
+                    "the previous track",
+                )
+            )
+        previous_end = max(previous_end, end)
+
+    return violations
+
+
+def _validate_fast_kinetics(
+    settings: AndorSettings, info: AndorInfo
+) -> list[SettingsViolation]:
+    config = settings.fast_kinetics
+    violations = []
+
+    if config.read_mode not in (0, 4):
+        violations.append(
+            SettingsViolation("fast_kinetics.read_mode", "must be 0 (FVB) or 4 (Image)")
+        )
+    if config.exposure_time <= 0:
+        violations.append(
+            SettingsViolation("fast_kinetics.exposure_time", "must be > 0")
+        )
+    for name in ("exposed_rows", "series_length", "hbin", "vbin"):
+        if getattr(config, name) < 1:
+            violations.append(
+                SettingsViolation(f"fast_kinetics.{name}", "must be >= 1")
+            )
+    if config.offset < 0:
+        violations.append(SettingsViolation("fast_kinetics.offset", "must be >= 0"))
+    if violations:
+        return violations
+
+    if info.xpixels % config.hbin:
+        violations.append(
+            SettingsViolation(
+                "fast_kinetics.hbin",
+                f"{info.xpixels} pixels not divisible by binning {config.hbin}",
+            )
+        )
+    if config.read_mode == 4 and config.exposed_rows % config.vbin:
+        violations.append(
+            SettingsViolation(
+                "fast_kinetics.vbin",
+                f"{config.exposed_rows} rows not divisible by binning {config.vbin}",
+            )
+        )
+
+    # The exposed area and every stored sub-frame must fit on the sensor
+    used_rows = config.offset + config.series_length * config.exposed_rows
+    if used_rows > info.ypixels:
+        violations.append(
+            SettingsViolation(
+                "fast_kinetics",
+                f"offset {config.offset} + {config.series_length} frames of "
+                f"{config.exposed_rows} rows exceed {info.ypixels} sensor rows",
+            )
+        )
+
+    # Frames are spaced by the exposure, at least the shift of the sub-area
+    vs_speeds = info.readout_speeds.vs_speeds
+    if 0 <= settings.vs_speed_index < len(vs_speeds):
+        vs_speed = vs_speeds[settings.vs_speed_index]
+        shift_time = config.exposed_rows * vs_speed / 1000  # [ms]
+        if config.exposure_time < shift_time * (1 - 1e-6):
+            violations.append(
+                SettingsViolation(
+                    "fast_kinetics.exposure_time",
+                    f"{config.exposure_time} ms shorter than the {shift_time:.4g} ms "
+                    f"shift of {config.exposed_rows} rows at {vs_speed} us/row",
+                )
+            )
+
+    return violations